@@ -1,5 +1,7 @@
-from flask import Flask, render_template, request, jsonify, flash
+from flask import Flask, render_template, request, jsonify, flash, Response, stream_with_context
 from flask_cors import CORS
+import codecs
+import json
 import os
 import sys
 from datetime import datetime
@@ -9,6 +11,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Import our custom modules
 from utils.simple_corrector import SimpleArabicCorrector
+from utils.model_manager import ModelManager
 from database.operations import DatabaseOperations
 from utils.helpers import validate_word_data, format_date, calculate_text_statistics
 
@@ -18,9 +21,110 @@ app.secret_key = 'enhanced_spell_checker_secret_key_2025'
 # Enable CORS for all routes
 CORS(app)
 
+# Maximum number of texts accepted by /api/correct/batch
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', 1000))
+
+# Size of the request body reads done by /api/correct/stream
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Model-based corrector behind /api/correct/advanced: a Hugging Face Hub model name or a
+# local save_pretrained directory (disabled when empty)
+ADVANCED_MODEL = os.environ.get('ADVANCED_MODEL', '')
+
+# Never contact the Hub; load only from the directory or the local cache
+ADVANCED_MODEL_LOCAL_ONLY = os.environ.get('ADVANCED_MODEL_LOCAL_ONLY', '0') == '1'
+
+# Seconds without requests before the model is unloaded to free memory (0 keeps it loaded)
+ADVANCED_MODEL_IDLE_TIMEOUT = float(os.environ.get('ADVANCED_MODEL_IDLE_TIMEOUT', 1800))
+
+# Micro-batching of concurrent model requests: batch size cap, how long the first text
+# waits for others (ms), and how long a request waits for its result (seconds, 0 = no limit)
+ADVANCED_MAX_BATCH_SIZE = int(os.environ.get('ADVANCED_MAX_BATCH_SIZE', 8))
+ADVANCED_MAX_WAIT_MS = float(os.environ.get('ADVANCED_MAX_WAIT_MS', 10))
+ADVANCED_REQUEST_TIMEOUT = float(os.environ.get('ADVANCED_REQUEST_TIMEOUT', 60))
+
+# SQLite file caching model corrections per sentence across restarts (empty disables it),
+# and the size of stored corrections (MiB) beyond which the least recently used are evicted
+ADVANCED_CACHE_PATH = os.environ.get('ADVANCED_CACHE_PATH', 'database/sentence_cache.db')
+ADVANCED_CACHE_MAX_MB = float(os.environ.get('ADVANCED_CACHE_MAX_MB', 64))
+
 # Initialize components
-corrector = SimpleArabicCorrector()
 db_ops = DatabaseOperations()
+# The priors object is updated in place as frequencies change, and the corrector drops cached results when it does
+corrector = SimpleArabicCorrector(frequency_priors=db_ops.get_frequency_priors())
+
+
+def load_advanced_corrector():
+    """Build the model-based corrector (runs on the model manager's loader thread)"""
+    from utils.advanced_corrector import AdvancedArabicCorrector
+    return AdvancedArabicCorrector(ADVANCED_MODEL, local_files_only=ADVANCED_MODEL_LOCAL_ONLY,
+                                   max_batch_size=ADVANCED_MAX_BATCH_SIZE, max_wait_ms=ADVANCED_MAX_WAIT_MS,
+                                   request_timeout=ADVANCED_REQUEST_TIMEOUT or None,
+                                   cache_path=ADVANCED_CACHE_PATH or None,
+                                   cache_max_bytes=int(ADVANCED_CACHE_MAX_MB * 1024 * 1024))
+
+
+# Loading starts with the first request in each worker, never in a preforking master
+model_manager = (ModelManager(load_advanced_corrector, ADVANCED_MODEL, ADVANCED_MODEL_IDLE_TIMEOUT)
+                 if ADVANCED_MODEL else None)
+
+
+def load_corrector_database():
+    """Load custom words and corrections into the corrector (one read of each table)"""
+    try:
+        words, corrections = db_ops.get_correction_data()
+    except Exception as e:
+        print(f"Error loading custom words into the corrector: {e}")
+        return
+    corrector.load_database(words, corrections)
+
+
+load_corrector_database()
+
+
+def warm_up():
+    """Build every lazily-loaded index now, so preforked workers share it (see gunicorn.conf.py)"""
+    db_ops.fuzzy_search_words('', 0, 1)
+    corrector.correct_text('')
+
+
+def apply_database_changes(changes):
+    """Apply change_log rows written by any worker to the corrector"""
+    for _, table, operation, _, old_value, new_value in changes:
+        if table == 'custom_words':
+            if old_value and old_value != new_value:
+                corrector.remove_known_word(old_value)
+            if new_value:
+                corrector.add_known_word(new_value)
+        elif table == 'word_corrections':
+            # The highest-confidence remaining correction for each affected word is the one applied
+            for original_word in {old_value, new_value} - {None}:
+                best = db_ops.get_custom_correction(original_word)
+                if best.get('success'):
+                    corrector.add_custom_word(original_word, best['correction']['corrected_word'])
+                else:
+                    corrector.remove_custom_word(original_word)
+
+
+@app.before_request
+def start_model_loading():
+    """Start loading the model-based corrector in the background (once per worker)"""
+    if model_manager is not None:
+        model_manager.start()
+
+
+@app.before_request
+def sync_corrector_database():
+    """Pick up edits made through other workers (throttled PRAGMA data_version check)"""
+    try:
+        changes = db_ops.poll_changes()
+    except Exception as e:
+        print(f"Error polling database changes: {e}")
+        return
+    if changes is None:
+        load_corrector_database()
+    elif changes:
+        apply_database_changes(changes)
 
 # Routes for main pages
 @app.route('/')
@@ -99,6 +203,121 @@ def api_correct_text():
             'error': f'حدث خطأ أثناء التدقيق: {str(e)}'
         }), 500
 
+@app.route('/api/correct/advanced', methods=['POST'])
+def api_correct_advanced():
+    """API endpoint for model-based correction, served by the rules until the model is ready"""
+    try:
+        data = request.get_json()
+        text = data.get('text', '')
+        
+        if not text:
+            return jsonify({
+                'success': False,
+                'error': 'النص مطلوب'
+            }), 400
+        
+        if model_manager is not None:
+            with model_manager.borrow() as model:
+                result = model.correct_text(text) if model is not None else None
+            
+            if result is not None and 'error' not in result:
+                return jsonify({
+                    'success': True,
+                    'engine': 'model',
+                    'original_text': result['original_text'],
+                    'corrected_text': result['corrected_text'],
+                    'corrections': result['corrections'],
+                    'statistics': result['stats'],
+                    'cache': result['cache']
+                })
+        
+        # The model is loading, unloaded, failed or disabled: use the rule-based corrector
+        result = corrector.correct_text(text)
+        
+        return jsonify({
+            'success': True,
+            'engine': 'rules',
+            'original_text': result['original_text'],
+            'corrected_text': result['corrected_text'],
+            'corrections': result['corrections'],
+            'statistics': result['statistics']
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'حدث خطأ أثناء التدقيق: {str(e)}'
+        }), 500
+
+@app.route('/api/correct/batch', methods=['POST'])
+def api_correct_batch():
+    """API endpoint for correcting several texts in one request"""
+    try:
+        data = request.get_json()
+        texts = data.get('texts', [])
+        
+        if not isinstance(texts, list) or not texts or not all(isinstance(text, str) for text in texts):
+            return jsonify({
+                'success': False,
+                'error': 'قائمة النصوص مطلوبة'
+            }), 400
+        
+        if len(texts) > MAX_BATCH_SIZE:
+            return jsonify({
+                'success': False,
+                'error': f'الحد الأقصى لعدد النصوص في الطلب الواحد هو {MAX_BATCH_SIZE}'
+            }), 400
+        
+        # Each distinct word is resolved once for the whole batch
+        results = corrector.correct_texts(texts)
+        
+        return jsonify({
+            'success': True,
+            'count': len(results),
+            'results': [{
+                'original_text': result['original_text'],
+                'corrected_text': result['corrected_text'],
+                'corrections': result['corrections'],
+                'statistics': result['statistics']
+            } for result in results]
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'حدث خطأ أثناء التدقيق: {str(e)}'
+        }), 500
+
+@app.route('/api/correct/stream', methods=['POST'])
+def api_correct_stream():
+    """Stream corrections of a plain-text request body as NDJSON"""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    
+    def read_chunks():
+        # Read the body incrementally instead of loading it into memory
+        while True:
+            data = request.stream.read(STREAM_CHUNK_SIZE)
+            if not data:
+                break
+            text = decoder.decode(data)
+            if text:
+                yield text
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+    
+    def generate():
+        try:
+            for record in corrector.correct_stream(read_chunks()):
+                yield json.dumps(record, ensure_ascii=False) + '\n'
+        except Exception as e:
+            yield json.dumps({
+                'type': 'error',
+                'error': f'حدث خطأ أثناء التدقيق: {str(e)}'
+            }, ensure_ascii=False) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/api/suggest-addition', methods=['POST'])
 def api_suggest_addition():
     """API endpoint to suggest adding a word to database"""
@@ -168,6 +387,8 @@ def api_add_word():
             }), 400
         
         result = db_ops.add_custom_word(data)
+        if result.get('success'):
+            corrector.add_known_word(data['word'])
         
         return jsonify(result)
         
@@ -191,7 +412,12 @@ def api_update_word(word_id):
                 'error': ', '.join(validation['errors'])
             }), 400
         
+        old_word = db_ops.custom_word.get_word_by_id(word_id)
         result = db_ops.update_custom_word(word_id, data)
+        if result.get('success') and data.get('word') and data['word'] != old_word:
+            if old_word:
+                corrector.remove_known_word(old_word)
+            corrector.add_known_word(data['word'])
         
         return jsonify(result)
         
@@ -205,7 +431,10 @@ def api_update_word(word_id):
 def api_delete_word(word_id):
     """Delete a word from the database"""
     try:
+        old_word = db_ops.custom_word.get_word_by_id(word_id)
         result = db_ops.delete_custom_word(word_id)
+        if result.get('success') and old_word:
+            corrector.remove_known_word(old_word)
         
         return jsonify(result)
         
@@ -238,6 +467,30 @@ def api_search_words():
             'error': f'حدث خطأ في البحث: {str(e)}'
         }), 500
 
+@app.route('/api/words/fuzzy')
+def api_fuzzy_search_words():
+    """Find database words within an edit distance of a word"""
+    try:
+        word = request.args.get('q', '').strip()
+        max_distance = int(request.args.get('max_distance', 2))
+        k = int(request.args.get('k', 10))
+
+        if not word:
+            return jsonify({
+                'success': False,
+                'error': 'الكلمة مطلوبة'
+            }), 400
+
+        result = db_ops.fuzzy_search_words(word, max_distance, k)
+
+        return jsonify(result)
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'حدث خطأ في البحث التقريبي: {str(e)}'
+        }), 500
+
 @app.route('/api/words/<word>')
 def api_get_word_details(word):
     """Get details for a specific word"""
@@ -268,6 +521,11 @@ def api_add_correction():
             }), 400
         
         result = db_ops.add_word_correction(original_word, corrected_word, confidence)
+        if result.get('success'):
+            # The highest-confidence correction for the word is the one applied
+            best = db_ops.get_custom_correction(original_word)
+            if best.get('success'):
+                corrector.add_custom_word(original_word, best['correction']['corrected_word'])
         
         return jsonify(result)
         
@@ -319,6 +577,8 @@ def api_import_database():
             }), 400
         
         result = db_ops.import_database(import_data)
+        if result.get('success'):
+            load_corrector_database()
         
         return jsonify(result)
         
@@ -328,6 +588,65 @@ def api_import_database():
             'error': f'حدث خطأ في استيراد قاعدة البيانات: {str(e)}'
         }), 500
 
+@app.route('/api/advanced/statistics')
+def api_advanced_statistics():
+    """Model lifecycle, micro-batching (queue depth and batch-size histograms) and sentence cache statistics"""
+    try:
+        if model_manager is None:
+            return jsonify({'success': True, 'enabled': False})
+        
+        model = model_manager.current()
+        batching = model.get_batching_stats() if model is not None else None
+        cache = model.get_cache_stats() if model is not None else None
+        
+        return jsonify({
+            'success': True,
+            'enabled': True,
+            'model': model_manager.get_status(),
+            'batching': batching,
+            'cache': cache
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'حدث خطأ في جلب الإحصائيات: {str(e)}'
+        }), 500
+
+@app.route('/healthz')
+def healthz():
+    """Liveness: the worker is up and answering"""
+    return jsonify({'status': 'ok'})
+
+@app.route('/readyz')
+def readyz():
+    """Readiness: 503 until the model-based corrector (if configured) has loaded"""
+    if model_manager is None:
+        return jsonify({'ready': True, 'model': None})
+    
+    ready = model_manager.serviceable
+    return jsonify({
+        'ready': ready,
+        'model': model_manager.get_status()
+    }), 200 if ready else 503
+
+@app.route('/api/cache/statistics')
+def api_cache_statistics():
+    """Get token cache statistics of the corrector"""
+    try:
+        return jsonify({
+            'success': True,
+            'statistics': corrector.get_cache_stats(),
+            'tiers': corrector.get_tier_stats(),
+            'snapshot': corrector.snapshots.get_statistics()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'حدث خطأ في جلب إحصائيات الذاكرة المؤقتة: {str(e)}'
+        }), 500
+
 @app.route('/api/text/statistics', methods=['POST'])
 def api_text_statistics():
     """Get comprehensive text statistics"""
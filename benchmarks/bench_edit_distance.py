@@ -0,0 +1,96 @@
+"""
+Microbenchmark the scoring kernels: SequenceMatcher.ratio (the original
+ranking), the row-by-row OSA dynamic program, the bit-parallel OSA kernel
+and the Arabic-weighted distance.
+
+    python benchmarks/bench_edit_distance.py --pairs 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.edit_distance import arabic_weighted_distance, damerau_levenshtein
+
+ARABIC_LETTERS = 'ابتثجحخدذرزسشصضطظعغفقكلمنهويةىأإآءئؤ'
+
+
+def osa_dynamic_program(a, b):
+    """Row-by-row OSA distance, the previous damerau_levenshtein implementation"""
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a)
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous_previous is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+        previous_previous, previous = previous, current
+    return previous[len(b)]
+
+
+def make_pairs(count, seed):
+    """(misspelling, candidate) pairs of realistic word lengths, about two edits apart"""
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        word = [rng.choice(ARABIC_LETTERS) for _ in range(rng.randint(3, 10))]
+        candidate = list(word)
+        for _ in range(rng.randint(1, 3)):
+            position = rng.randrange(len(candidate))
+            candidate[position] = rng.choice(ARABIC_LETTERS)
+        pairs.append((''.join(word), ''.join(candidate)))
+    return pairs
+
+
+def timed(function, pairs):
+    start = time.perf_counter()
+    for a, b in pairs:
+        function(a, b)
+    elapsed = time.perf_counter() - start
+    return len(pairs) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pairs', type=int, default=20000, help='number of string pairs')
+    parser.add_argument('--max-distance', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=13)
+    args = parser.parse_args()
+
+    pairs = make_pairs(args.pairs, args.seed)
+    for a, b in pairs[:1000]:
+        assert osa_dynamic_program(a, b) == damerau_levenshtein(a, b)
+
+    max_cost = float(args.max_distance)
+    kernels = [
+        ('sequence matcher ratio', lambda a, b: SequenceMatcher(None, a, b).ratio()),
+        ('osa dynamic program', osa_dynamic_program),
+        ('bit-parallel osa', damerau_levenshtein),
+        (f'bit-parallel osa (<= {args.max_distance})', lambda a, b: damerau_levenshtein(a, b, args.max_distance)),
+        ('arabic weighted', arabic_weighted_distance),
+        (f'arabic weighted (<= {max_cost:g})', lambda a, b: arabic_weighted_distance(a, b, max_cost)),
+    ]
+
+    print(f'{len(pairs)} pairs')
+    print(f'{"kernel":<32}{"candidates/s":>14}')
+    baseline = None
+    for name, function in kernels:
+        rate = timed(function, pairs)
+        baseline = baseline or rate
+        print(f'{name:<32}{rate:>14.0f}{rate / baseline:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark suggestion lookup: the previous SequenceMatcher vocabulary scan
+against the SymSpell delete index, the character-trigram index and the
+NumPy vocabulary matrix that EnhancedCorrector can use.
+
+    python benchmarks/bench_suggestions.py --vocab 20000 --queries 200
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ngram_index import NgramIndex
+from utils.symspell import SymSpellIndex
+from utils.vocabulary_matrix import VocabularyMatrix
+
+ARABIC_LETTERS = 'ابتثجحخدذرزسشصضطظعغفقكلمنهويةىأإآءئؤ'
+
+
+def make_vocabulary(size, seed):
+    """Random Arabic-letter words of realistic lengths"""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        length = rng.randint(3, 9)
+        words.add(''.join(rng.choice(ARABIC_LETTERS) for _ in range(length)))
+    return sorted(words)
+
+
+def make_queries(vocabulary, count, seed):
+    """Vocabulary words with one or two random edits"""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        word = list(rng.choice(vocabulary))
+        for _ in range(rng.randint(1, 2)):
+            position = rng.randrange(len(word))
+            operation = rng.choice(('substitute', 'delete', 'insert'))
+            if operation == 'substitute':
+                word[position] = rng.choice(ARABIC_LETTERS)
+            elif operation == 'delete' and len(word) > 2:
+                del word[position]
+            else:
+                word.insert(position, rng.choice(ARABIC_LETTERS))
+        queries.append(''.join(word))
+    return queries
+
+
+def sequence_matcher_scan(word, vocabulary):
+    """The original EnhancedCorrector._find_similar_words scan"""
+    suggestions = []
+    for correct_word in vocabulary:
+        similarity = SequenceMatcher(None, word, correct_word).ratio()
+        if similarity > 0.6:
+            suggestions.append((correct_word, similarity))
+    suggestions.sort(key=lambda x: x[1], reverse=True)
+    return suggestions[:3]
+
+
+def timed(function, queries):
+    start = time.perf_counter()
+    for query in queries:
+        function(query)
+    elapsed = time.perf_counter() - start
+    return elapsed / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--vocab', type=int, default=20000, help='vocabulary size')
+    parser.add_argument('--queries', type=int, default=200, help='number of misspelled queries')
+    parser.add_argument('--scan-queries', type=int, default=20, help='queries for the (slow) scan')
+    parser.add_argument('--max-distance', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=13)
+    args = parser.parse_args()
+
+    vocabulary = make_vocabulary(args.vocab, args.seed)
+    queries = make_queries(vocabulary, args.queries, args.seed + 1)
+
+    start = time.perf_counter()
+    index = SymSpellIndex(vocabulary, max_distance=args.max_distance)
+    build_seconds = time.perf_counter() - start
+    stats = index.get_statistics()
+
+    start = time.perf_counter()
+    ngram_index = NgramIndex(vocabulary)
+    ngram_build_seconds = time.perf_counter() - start
+    ngram_stats = ngram_index.get_statistics()
+
+    start = time.perf_counter()
+    matrix = VocabularyMatrix(vocabulary)
+    matrix_build_seconds = time.perf_counter() - start
+    matrix_stats = matrix.get_statistics()
+
+    scan_ms = timed(lambda query: sequence_matcher_scan(query, vocabulary), queries[:args.scan_queries])
+    index_ms = timed(lambda query: index.lookup(query, k=3), queries)
+    ngram_ms = timed(lambda query: ngram_index.lookup(query, args.max_distance, k=3), queries)
+    filter_ms = timed(lambda query: matrix.candidates(query, args.max_distance), queries)
+    matrix_ms = timed(lambda query: matrix.lookup(query, args.max_distance, k=3), queries)
+
+    print(f'vocabulary: {len(vocabulary)} words, {len(queries)} queries')
+    print(f'symspell build: {build_seconds:.2f}s, {stats["delete_keys"]} delete keys, {stats["postings"]} postings')
+    print(f'trigram build: {ngram_build_seconds:.2f}s, {ngram_stats["grams"]} grams, '
+          f'{ngram_stats["posting_bytes"]} posting bytes')
+    print(f'matrix build: {matrix_build_seconds:.2f}s, {matrix_stats["bytes"]} bytes')
+    print(f'{"method":<24}{"ms/query":>12}{"queries/s":>12}')
+    print(f'{"sequence matcher scan":<24}{scan_ms:>12.3f}{1000 / scan_ms:>12.1f}')
+    print(f'{"symspell lookup":<24}{index_ms:>12.3f}{1000 / index_ms:>12.1f}')
+    print(f'{"trigram lookup":<24}{ngram_ms:>12.3f}{1000 / ngram_ms:>12.1f}')
+    print(f'{"matrix filter only":<24}{filter_ms:>12.3f}{1000 / filter_ms:>12.1f}')
+    print(f'{"matrix lookup":<24}{matrix_ms:>12.3f}{1000 / matrix_ms:>12.1f}')
+    print(f'speedup: symspell {scan_ms / index_ms:.1f}x, trigram {scan_ms / ngram_ms:.1f}x, '
+          f'matrix {scan_ms / matrix_ms:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Compare per-worker unique memory (USS) with and without preloading.
+
+Forks worker processes the way gunicorn does: without preload each worker
+imports the app itself; with preload the parent imports the app, builds its
+lazy indexes, runs gc.freeze() and then forks (gunicorn.conf.py). Every
+worker corrects the same texts, then the parent reads each worker's
+Private_Clean + Private_Dirty from /proc/<pid>/smaps_rollup while all
+workers are still alive. Linux only.
+
+    python benchmarks/memory_report.py --workers 4 --requests 200
+"""
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+
+# Add the project root to Python path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+SAMPLE_TEXT = 'هاذا نص تجريبي يحتوي على اخطاء املائيه مثل هاذه الكلمات الخاطئه وانشاء الله يكون مفيد'
+
+
+def unique_kb(pid):
+    """Private (unshared) resident memory of a process in kB"""
+    total = 0
+    path = f'/proc/{pid}/smaps_rollup'
+    if not os.path.exists(path):
+        path = f'/proc/{pid}/smaps'
+    with open(path) as f:
+        for line in f:
+            if line.startswith(('Private_Clean:', 'Private_Dirty:')):
+                total += int(line.split()[1])
+    return total
+
+
+def run_workload(requests):
+    """Serve `requests` correction calls through the app's corrector"""
+    import app
+    texts = [f'{SAMPLE_TEXT} {index}' for index in range(requests)]
+    for text in texts:
+        app.corrector.correct_text(text)
+    app.corrector.correct_texts(texts[:50])
+    app.db_ops.fuzzy_search_words('كتاب', 2, 5)
+
+
+def measure(mode, workers, requests):
+    """Fork workers in one mode and return their USS in kB (runs in a fresh interpreter)"""
+    os.chdir(ROOT)
+    if mode == 'preload':
+        gc.disable()
+        import app
+        app.warm_up()
+        gc.collect()
+        gc.freeze()
+        gc.enable()
+
+    children = []
+    for _ in range(workers):
+        ready_read, ready_write = os.pipe()
+        exit_read, exit_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_read)
+            os.close(exit_write)
+            run_workload(requests)
+            os.write(ready_write, b'1')
+            os.read(exit_read, 1)
+            os._exit(0)
+        os.close(ready_write)
+        os.close(exit_read)
+        children.append((pid, ready_read, exit_write))
+
+    for _, ready_read, _ in children:
+        os.read(ready_read, 1)
+    sizes = [unique_kb(pid) for pid, _, _ in children]
+    parent = unique_kb(os.getpid())
+
+    # Later workers inherited earlier workers' pipes, so release them all before waiting
+    for _, ready_read, exit_write in children:
+        os.close(ready_read)
+        os.close(exit_write)
+    for pid, _, _ in children:
+        os.waitpid(pid, 0)
+    return {'mode': mode, 'workers': sizes, 'parent': parent}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=200, help='texts corrected by each worker')
+    parser.add_argument('--mode', choices=['no-preload', 'preload'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(measure(args.mode, args.workers, args.requests)))
+        return
+
+    results = []
+    for mode in ('no-preload', 'preload'):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--mode', mode,
+             '--workers', str(args.workers), '--requests', str(args.requests)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f'{args.workers} workers, {args.requests} texts each; unique memory (USS) in MiB')
+    print(f'{"mode":<12} {"per worker":>11} {"all workers":>12} {"parent":>8}')
+    for result in results:
+        sizes = result['workers']
+        print(f'{result["mode"]:<12} {sum(sizes) / len(sizes) / 1024:>11.1f} '
+              f'{sum(sizes) / 1024:>12.1f} {result["parent"] / 1024:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,23 @@
 import sqlite3
 import os
+import threading
 from datetime import datetime
 
+# Tables whose edits are recorded in change_log: table -> column holding the word
+LOGGED_TABLES = {
+    'custom_words': 'word',
+    'word_corrections': 'original_word'
+}
+
 class DatabaseManager:
     def __init__(self, db_path='database/custom_words.db'):
         self.db_path = db_path
         self.init_database()
+        
+        # Long-lived connection for PRAGMA data_version, reopened after a fork
+        self._watch_connection = None
+        self._watch_pid = None
+        self._watch_lock = threading.Lock()
     
     def init_database(self):
         """Initialize the database and create tables if they don't exist"""
@@ -51,6 +63,42 @@ class DatabaseManager:
             )
         ''')
         
+        # Create change_log table, filled by triggers so every process sees every edit
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS change_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                table_name TEXT NOT NULL,
+                operation TEXT NOT NULL,
+                row_id INTEGER NOT NULL,
+                old_value TEXT,
+                new_value TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        for table, column in LOGGED_TABLES.items():
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_log_insert AFTER INSERT ON {table}
+                BEGIN
+                    INSERT INTO change_log (table_name, operation, row_id, new_value)
+                    VALUES ('{table}', 'insert', NEW.id, NEW.{column});
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_log_update AFTER UPDATE ON {table}
+                BEGIN
+                    INSERT INTO change_log (table_name, operation, row_id, old_value, new_value)
+                    VALUES ('{table}', 'update', NEW.id, OLD.{column}, NEW.{column});
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_log_delete AFTER DELETE ON {table}
+                BEGIN
+                    INSERT INTO change_log (table_name, operation, row_id, old_value)
+                    VALUES ('{table}', 'delete', OLD.id, OLD.{column});
+                END
+            ''')
+        
         conn.commit()
         conn.close()
     
@@ -58,6 +106,18 @@ class DatabaseManager:
         """Get database connection"""
         return sqlite3.connect(self.db_path)
     
+    def get_data_version(self):
+        """PRAGMA data_version on this process's watch connection.
+        
+        The value changes whenever another connection (in any process)
+        commits to the database, so comparing it costs no table read.
+        """
+        with self._watch_lock:
+            if self._watch_connection is None or self._watch_pid != os.getpid():
+                self._watch_connection = sqlite3.connect(self.db_path, check_same_thread=False)
+                self._watch_pid = os.getpid()
+            return self._watch_connection.execute('PRAGMA data_version').fetchone()[0]
+    
     def execute_query(self, query, params=None):
         """Execute a query and return results"""
         conn = self.get_connection()
@@ -124,6 +184,31 @@ class CustomWord:
             }
         return None
     
+    def get_word_by_id(self, word_id):
+        """Get the text of a word by its id"""
+        results = self.db.execute_query('SELECT word FROM custom_words WHERE id = ?', (word_id,))
+        
+        if results:
+            return results[0][0]
+        return None
+    
+    def get_all_word_texts(self):
+        """Get the text of every custom word"""
+        results = self.db.execute_query('SELECT word FROM custom_words')
+        return [row[0] for row in results]
+    
+    def get_word_frequencies(self):
+        """Get (id, word, frequency) for every custom word"""
+        return self.db.execute_query('SELECT id, word, frequency FROM custom_words')
+    
+    def get_word_frequency_by_id(self, word_id):
+        """Get (id, word, frequency) for one custom word"""
+        results = self.db.execute_query('SELECT id, word, frequency FROM custom_words WHERE id = ?', (word_id,))
+        
+        if results:
+            return results[0]
+        return None
+    
     def search_words(self, search_term, limit=50):
         """Search for words containing the search term"""
         query = '''
@@ -268,6 +353,15 @@ class WordCorrection:
             }
         return None
     
+    def get_best_corrections(self):
+        """Map each original word to its highest-confidence correction"""
+        query = '''
+            SELECT original_word, corrected_word FROM word_corrections 
+            ORDER BY confidence ASC, created_at ASC, id ASC
+        '''
+        # Later rows win, so the best correction for each word is kept
+        return {original: corrected for original, corrected in self.db.execute_query(query)}
+    
     def get_all_corrections(self):
         """Get all custom corrections"""
         query = '''
@@ -288,3 +382,32 @@ class WordCorrection:
         
         return corrections
 
+class ChangeLog:
+    def __init__(self, db_manager):
+        self.db = db_manager
+    
+    def get_latest_id(self):
+        """Id of the newest change (0 when the log is empty)"""
+        results = self.db.execute_query('SELECT COALESCE(MAX(id), 0) FROM change_log')
+        return results[0][0]
+    
+    def get_oldest_id(self):
+        """Id of the oldest change still kept (0 when the log is empty)"""
+        results = self.db.execute_query('SELECT COALESCE(MIN(id), 0) FROM change_log')
+        return results[0][0]
+    
+    def get_changes_since(self, change_id, limit=1000):
+        """Get (id, table_name, operation, row_id, old_value, new_value) for changes after an id"""
+        query = '''
+            SELECT id, table_name, operation, row_id, old_value, new_value 
+            FROM change_log 
+            WHERE id > ? 
+            ORDER BY id 
+            LIMIT ?
+        '''
+        return self.db.execute_query(query, (change_id, limit))
+    
+    def prune(self, max_rows):
+        """Keep only the newest max_rows changes"""
+        query = 'DELETE FROM change_log WHERE id <= (SELECT MAX(id) FROM change_log) - ?'
+        self.db.execute_query(query, (max_rows,))
@@ -1,12 +1,77 @@
-from .models import DatabaseManager, CustomWord, WordCorrection
+from .models import DatabaseManager, CustomWord, WordCorrection, ChangeLog
 import json
 import os
+import threading
+import time
+from datetime import datetime
+
+from utils.bktree import BKTree
+from utils.frequency_priors import FrequencyPriors
+
+# Seconds between PRAGMA data_version checks for edits made by other processes
+CHANGE_POLL_INTERVAL = float(os.environ.get('CHANGE_POLL_INTERVAL', 1.0))
+
+# Changes kept in change_log; a process that falls further behind reloads everything
+CHANGE_LOG_MAX_ROWS = 10000
 
 class DatabaseOperations:
-    def __init__(self):
+    def __init__(self, poll_interval=CHANGE_POLL_INTERVAL):
         self.db_manager = DatabaseManager()
         self.custom_word = CustomWord(self.db_manager)
         self.word_correction = WordCorrection(self.db_manager)
+        self.change_log = ChangeLog(self.db_manager)
+        
+        # Position in change_log up to which this process is in sync
+        self.poll_interval = poll_interval
+        self._change_position = self.change_log.get_latest_id()
+        self._data_version = self.db_manager.get_data_version()
+        self._next_poll = 0.0
+        self._poll_lock = threading.Lock()
+        
+        # BK-tree over custom words for fuzzy search, built on first use
+        self._word_tree = None
+        self._word_tree_lock = threading.Lock()
+        
+        # Word frequencies for ranking suggestions, loaded on first use
+        self._frequency_priors = None
+    
+    def get_frequency_priors(self):
+        """Frequency priors of the custom words, kept in sync with edits"""
+        if self._frequency_priors is None:
+            self._frequency_priors = FrequencyPriors(self.custom_word.get_word_frequencies())
+        return self._frequency_priors
+    
+    def refresh_frequency_priors(self):
+        """Reload every frequency with a single query"""
+        self.get_frequency_priors().refresh(self.custom_word.get_word_frequencies())
+    
+    def _update_frequency_priors(self, word_id, old_word=None):
+        """Apply a database edit to the frequency priors, if they were loaded"""
+        if self._frequency_priors is None:
+            return
+        if old_word:
+            self._frequency_priors.discard(old_word)
+        row = self.custom_word.get_word_frequency_by_id(word_id)
+        if row:
+            self._frequency_priors.set(*row)
+    
+    def _get_word_tree(self):
+        """Build the fuzzy-search tree from the database once"""
+        if self._word_tree is None:
+            with self._word_tree_lock:
+                if self._word_tree is None:
+                    self._word_tree = BKTree(self.custom_word.get_all_word_texts())
+        return self._word_tree
+    
+    def _update_word_tree(self, added=None, removed=None):
+        """Apply a database edit to the fuzzy-search tree, if it was built"""
+        if self._word_tree is None:
+            return
+        with self._word_tree_lock:
+            if removed:
+                self._word_tree.remove(removed)
+            if added:
+                self._word_tree.add(added)
     
     def add_custom_word(self, word_data):
         """Add a new custom word with validation"""
@@ -30,33 +95,107 @@ class DatabaseOperations:
         )
         
         if word_id:
+            self._update_word_tree(added=word)
+            self._update_frequency_priors(word_id)
             return {'success': True, 'word_id': word_id, 'message': 'تم إضافة الكلمة بنجاح'}
         else:
             return {'success': False, 'error': 'فشل في إضافة الكلمة'}
     
     def update_custom_word(self, word_id, word_data):
         """Update an existing custom word"""
+        old_word = self.custom_word.get_word_by_id(word_id)
         success = self.custom_word.update_word(word_id, **word_data)
         
         if success:
+            new_word = word_data.get('word')
+            if old_word and new_word and new_word != old_word:
+                self._update_word_tree(added=new_word, removed=old_word)
+                self._update_frequency_priors(word_id, old_word)
+            else:
+                self._update_frequency_priors(word_id)
             return {'success': True, 'message': 'تم تحديث الكلمة بنجاح'}
         else:
             return {'success': False, 'error': 'فشل في تحديث الكلمة'}
     
     def delete_custom_word(self, word_id):
         """Delete a custom word"""
+        old_word = self.custom_word.get_word_by_id(word_id)
         success = self.custom_word.delete_word(word_id)
         
         if success:
+            if old_word:
+                self._update_word_tree(removed=old_word)
+                self._update_frequency_priors(word_id, old_word)
             return {'success': True, 'message': 'تم حذف الكلمة بنجاح'}
         else:
             return {'success': False, 'error': 'فشل في حذف الكلمة'}
     
+    def poll_changes(self):
+        """Edits committed by any process since the last poll, oldest first.
+        
+        Returns a list of (id, table_name, operation, row_id, old_value,
+        new_value) rows, empty when nothing changed or when called again
+        within `poll_interval`; the check itself is one PRAGMA data_version.
+        Returns None when changes were pruned before this process read
+        them; callers must then reload everything. The fuzzy-search tree
+        and frequency priors are brought up to date here. Never blocks: if
+        another thread is polling, this one returns immediately.
+        """
+        now = time.monotonic()
+        if now < self._next_poll or not self._poll_lock.acquire(blocking=False):
+            return []
+        try:
+            self._next_poll = now + self.poll_interval
+            data_version = self.db_manager.get_data_version()
+            if data_version == self._data_version:
+                return []
+            self._data_version = data_version
+            
+            changes = []
+            while True:
+                rows = self.change_log.get_changes_since(self._change_position)
+                if not rows:
+                    break
+                if rows[0][0] > self._change_position + 1 and self.change_log.get_oldest_id() > self._change_position + 1:
+                    # Rows this process never saw were pruned
+                    self._change_position = self.change_log.get_latest_id()
+                    self._word_tree = None
+                    # In place, so correctors holding the priors see the reloaded counts
+                    if self._frequency_priors is not None:
+                        self.refresh_frequency_priors()
+                    return None
+                changes.extend(rows)
+                self._change_position = rows[-1][0]
+            
+            for _, table, operation, row_id, old_value, new_value in changes:
+                if table == 'custom_words':
+                    removed = old_value if old_value != new_value else None
+                    self._update_word_tree(added=new_value, removed=removed)
+                    if operation == 'delete' and self._frequency_priors is not None:
+                        self._frequency_priors.discard(old_value)
+                    else:
+                        self._update_frequency_priors(row_id, removed)
+            
+            if changes:
+                self.change_log.prune(CHANGE_LOG_MAX_ROWS)
+            return changes
+        finally:
+            self._poll_lock.release()
+    
     def search_custom_words(self, search_term, limit=50):
         """Search for custom words"""
         words = self.custom_word.search_words(search_term, limit)
         return {'success': True, 'words': words, 'count': len(words)}
     
+    def fuzzy_search_words(self, word, max_distance=2, k=10):
+        """Find custom words within an edit distance of a word"""
+        tree = self._get_word_tree()
+        with self._word_tree_lock:
+            matches = tree.search(word, max_distance, k)
+        
+        words = [{'word': match, 'distance': distance} for match, distance in matches]
+        return {'success': True, 'words': words, 'count': len(words)}
+    
     def get_custom_words(self, page=1, per_page=20):
         """Get custom words with pagination"""
         offset = (page - 1) * per_page
@@ -99,6 +238,10 @@ class DatabaseOperations:
         else:
             return {'success': False, 'error': 'لا يوجد تصحيح مخصص لهذه الكلمة'}
     
+    def get_correction_data(self):
+        """Custom words and best corrections, for loading into the corrector"""
+        return self.custom_word.get_all_word_texts(), self.word_correction.get_best_corrections()
+    
     def get_database_statistics(self):
         """Get comprehensive database statistics"""
         stats = self.custom_word.get_statistics()
@@ -180,6 +323,8 @@ class DatabaseOperations:
         if word_data:
             new_frequency = word_data['frequency'] + 1
             self.custom_word.update_word(word_data['id'], frequency=new_frequency)
+            if self._frequency_priors is not None:
+                self._frequency_priors.set(word_data['id'], word, new_frequency)
             return True
         return False
 
@@ -0,0 +1,39 @@
+"""
+Gunicorn settings: load the app once in the master and fork workers from it.
+
+With preload_app the correction dictionaries, lexicon mappings and indexes
+are built a single time before forking, and every worker shares those pages
+copy-on-write. The garbage collector is paused while the app loads and the
+resulting objects are then moved to the permanent generation with
+gc.freeze(), so collections in the workers never write to (and unshare)
+the pages holding them. See benchmarks/memory_report.py for the effect.
+
+    gunicorn -c gunicorn.conf.py app:app
+"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+
+# Objects allocated while the app is imported are frozen before the fork
+gc.disable()
+
+
+def when_ready(server):
+    """Runs in the master once the app is loaded, before any worker is forked"""
+    if preload_app:
+        import app
+        app.warm_up()
+    gc.collect()
+    gc.freeze()
+    gc.enable()
+    server.log.info('Froze %d objects before forking workers', gc.get_freeze_count())
+
+
+def post_fork(server, worker):
+    """Runs in each worker after the fork"""
+    # Each worker opens its own SQLite connections (DatabaseManager reopens per PID)
+    gc.enable()
@@ -0,0 +1,40 @@
+import pytest
+
+from utils.corrector import EnhancedCorrector
+from utils.rasm import RasmIndex
+
+
+@pytest.fixture(scope='module')
+def corrector():
+    return EnhancedCorrector()
+
+
+@pytest.mark.parametrize('typed, intended', [
+    ('جمبل', 'جميل'),
+    ('ضغير', 'صغير'),
+    ('صغبر', 'صغير'),
+    ('سربع', 'سريع'),
+    ('كبيز', 'كبير'),
+])
+def test_dot_errors_are_corrected_by_the_rasm_tier(typed, intended):
+    corrector = EnhancedCorrector()
+    result = corrector.correct_text(typed)
+    assert result['corrected_text'] == intended
+    stats = corrector.get_tier_stats()
+    assert stats['resolved_by'] == {'rasm': 1}
+    assert stats['rasm_rate'] > 0
+
+
+def test_seat_variants_are_never_rasm_corrections():
+    index = RasmIndex(['أنه', 'إن', 'على', 'لأنه'])
+    for token in ('إنه', 'أن', 'علي', 'لإنه'):
+        assert index.correction(token) is None
+
+
+def test_ambiguous_dot_changes_are_left_alone():
+    assert RasmIndex(['بيت', 'نيت']).correction('ثيت') is None
+
+
+def test_seat_variants_in_text_are_kept(corrector):
+    text = 'أنه إن لأنه علي'
+    assert corrector.correct_text(text)['corrected_text'] == text
@@ -0,0 +1,52 @@
+import pytest
+
+from utils.simple_corrector import SimpleArabicCorrector
+
+
+@pytest.fixture(scope='module')
+def corrector():
+    return SimpleArabicCorrector()
+
+
+def test_prefixed_stems_use_variant_rules(corrector):
+    result = corrector.correct_text('الكتابو مدرسه والكتابو بالمدرسه فالكتابو')
+    assert result['corrected_text'] == 'الكتاب مدرسة والكتاب بالمدرسة فالكتاب'
+    prefixed = [correction for correction in result['corrections'] if 'prefix' in correction]
+    assert [(c['prefix'], c['stem'], c['rule']) for c in prefixed] == [
+        ('و', 'الكتابو', 'trailing_waw'),
+        ('بال', 'مدرسه', 'taa_marbuta'),
+        ('ف', 'الكتابو', 'trailing_waw'),
+    ]
+
+
+def test_valid_words_are_not_split_into_prefix_and_stem(corrector):
+    text = 'كانت كانه الكلمات بانه'
+    assert corrector.correct_text(text)['corrected_text'] == text
+
+
+def _streamed(corrector, chunks, **kwargs):
+    records = list(corrector.correct_stream(chunks, **kwargs))
+    segments = [record for record in records if record['type'] == 'segment']
+    return ''.join(segment['corrected_text'] for segment in segments), \
+        [correction for segment in segments for correction in segment['corrections']]
+
+
+def test_stream_keeps_the_boundary_word_of_a_long_chunk(corrector):
+    # قطعة أطول من max_pending من كلمات قصيرة، تنتهي في منتصف "هاذه"
+    first = ('word ' * 13200)[:66002 - len('نص هاذ')] + 'نص هاذ'
+    second = 'ه الكلمات مدرسه'
+    assert len(first) == 66002
+
+    expected = corrector.correct_text(first + second)
+    text, corrections = _streamed(corrector, [first, second])
+    assert text == expected['corrected_text']
+    assert [(c['start'], c['corrected']) for c in corrections] == \
+        [(c['start'], c['corrected']) for c in expected['corrections']]
+    assert 'هذه' in [c['corrected'] for c in corrections]
+
+
+def test_stream_flushes_an_overlong_word(corrector):
+    records = list(corrector.correct_stream(['ا' * 400] * 5, max_pending=1000))
+    sizes = [record['end'] - record['start'] for record in records if record['type'] == 'segment']
+    assert sum(sizes) == 2000
+    assert max(sizes) <= 1000 + 400
@@ -1,19 +1,47 @@
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, pipeline
 import torch
+import gc
 import re
 
+from .micro_batcher import MicroBatcher
+from .sentence_cache import SentenceCache
+
+# النموذج الافتراضي على Hugging Face Hub
+DEFAULT_MODEL_NAME = "alnnahwi/gemma-3-1b-arabic-gec-v1"
+
+# معاملات التوليد المشتركة بين كل استدعاءات النموذج
+GENERATION_KWARGS = {
+    "max_length": 512,
+    "num_beams": 5,
+    "do_sample": False,
+    "early_stopping": True
+}
+
+# نهاية الجملة: علامة وقف يليها فراغ
+SENTENCE_BREAK = re.compile(r'(?<=[.!?؟؛…])\s+')
+WORD_BREAK = re.compile(r'\s+')
+
 class AdvancedArabicCorrector:
-    def __init__(self):
-        # تحديد اسم النموذج من Hugging Face Hub
-        self.model_name = "alnnahwi/gemma-3-1b-arabic-gec-v1"
+    def __init__(self, model_name=DEFAULT_MODEL_NAME, local_files_only=False,
+                 max_batch_size=8, max_wait_ms=10.0, request_timeout=None,
+                 cache_path=None, cache_max_bytes=64 * 1024 * 1024):
+        # اسم النموذج على Hugging Face Hub أو مسار مجلد محفوظ محلياً (save_pretrained)
+        self.model_name = model_name
+        # عند التفعيل لا يُتصل بالـ Hub إطلاقاً، ويُحمّل النموذج من المجلد أو من ذاكرة التخزين المحلية فقط
+        self.local_files_only = local_files_only
         
         print(f"Loading model: {self.model_name}")
         print("This may take a few minutes on first run...")
         
         try:
             # تحميل التوكينايزر والنموذج
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            self.model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name)
+            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name, local_files_only=local_files_only)
+            self.model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name, local_files_only=local_files_only)
+            # النصوص في الدفعة الواحدة تُحشى إلى طول أطولها
+            if self.tokenizer.pad_token is None:
+                self.tokenizer.pad_token = self.tokenizer.eos_token
+            # أقصى طول لنافذة الإدخال بالرموز: النصوص الأطول تُقسم على حدود الجمل بدلاً من أن تُقتطع
+            self.max_window_tokens = min(GENERATION_KWARGS["max_length"], self.tokenizer.model_max_length)
             
             # تحديد الجهاز (GPU إذا كان متاحًا، وإلا CPU)
             self.device = "cuda" if torch.cuda.is_available() else "cpu"
@@ -29,6 +57,16 @@ class AdvancedArabicCorrector:
                 device=0 if self.device == "cuda" else -1  # -1 for CPU
             )
             
+            # جدولة الدفعات: النصوص الواردة من طلبات متزامنة تُجمع خلال max_wait_ms (أو حتى max_batch_size نصاً)
+            # وتمر على النموذج في دفعة توليد واحدة، وكل طلب ينتظر نتيجته حتى request_timeout ثانية على الأكثر
+            self.request_timeout = request_timeout
+            self.batcher = MicroBatcher(self._generate, max_batch_size=max_batch_size,
+                                        max_wait_ms=max_wait_ms, name="advanced-corrector")
+            
+            # ذاكرة تصحيحات الجمل على القرص: لا يمر على النموذج إلا ما لم يُصحح من قبل
+            self.cache = (SentenceCache(cache_path, self.model_name, GENERATION_KWARGS, max_bytes=cache_max_bytes)
+                          if cache_path else None)
+            
             print("Model loaded successfully!")
             
         except Exception as e:
@@ -44,45 +82,225 @@ class AdvancedArabicCorrector:
                 "original_text": text,
                 "corrected_text": text,
                 "corrections": [],
-                "stats": {"words": 0, "errors": 0, "accuracy": 100.0}
+                "stats": {"words": 0, "errors": 0, "accuracy": 100.0},
+                "cache": None
             }
 
         try:
             # تنظيف النص قبل المعالجة
             cleaned_text = self._clean_text(text)
             
-            # استخدام الـ pipeline للتصحيح
-            corrected_output = self.corrector_pipeline(
-                cleaned_text, 
-                max_length=512, 
-                num_beams=5, 
-                do_sample=False,
-                early_stopping=True
-            )
-            
-        
-            corrected_text = corrected_output[0]['generated_text']
+            # التصحيح نافذةً نافذة عبر جدولة الدفعات مع نصوص الطلبات المتزامنة الأخرى
+            corrected_text, cache_stats = self._correct_cleaned([cleaned_text])[0]
             
-            # تحليل الأخطاء والإحصائيات
-            corrections, stats = self._analyze_corrections(text, corrected_text)
-            
-            return {
-                "original_text": text,
-                "corrected_text": corrected_text,
-                "corrections": corrections,
-                "stats": stats
-            }
+            return self._build_result(text, corrected_text, cache_stats)
             
         except Exception as e:
             print(f"Error during correction: {e}")
             # في حالة الخطأ، إرجاع النص الأصلي
-            return {
-                "original_text": text,
-                "corrected_text": text,
-                "corrections": [],
-                "stats": {"words": len(text.split()), "errors": 0, "accuracy": 100.0},
-                "error": str(e)
+            return self._error_result(text, e)
+
+    def correct_texts(self, texts):
+        """
+        تصحيح مجموعة نصوص بتمرير واحد على النموذج، مع تصحيح النصوص المكررة مرة واحدة
+        """
+        cleaned_texts = [self._clean_text(text) if text and text.strip() else '' for text in texts]
+        unique_texts = [text for text in dict.fromkeys(cleaned_texts) if text]
+        
+        try:
+            corrected = dict(zip(unique_texts, self._correct_cleaned(unique_texts)))
+            
+            results = []
+            for text, cleaned_text in zip(texts, cleaned_texts):
+                if cleaned_text:
+                    results.append(self._build_result(text, *corrected[cleaned_text]))
+                else:
+                    results.append(self.correct_text(text))
+            return results
+            
+        except Exception as e:
+            print(f"Error during batch correction: {e}")
+            return [self._error_result(text, e) for text in texts]
+
+    def _correct_cleaned(self, texts):
+        """
+        تصحيح نصوص منظفة: كل نص يُقسم إلى جمل، وما وُجد منها في الذاكرة يؤخذ منها، والباقي يُجمع
+        في نوافذ تمر كلها على النموذج معاً، ثم تُعاد المخرجات إلى مواضعها مع الفواصل الأصلية.
+        تعيد لكل نص (النص المصحح، إحصائيات الذاكرة)
+        """
+        units = [self._units(text) for text in texts]
+        keys = [[self.cache.key(text[start:end]) for start, end, _, _ in text_units] if self.cache else []
+                for text, text_units in zip(texts, units)]
+        cached = self.cache.get_many(key for text_keys in keys for key in text_keys) if self.cache else {}
+
+        windows = []
+        for text, text_units, text_keys in zip(texts, units, keys):
+            misses = [index for index in range(len(text_units))
+                      if not self.cache or text_keys[index] not in cached]
+            windows.append(self._pack(text_units, misses))
+        pieces = [text[text_units[window[0]][0]:text_units[window[-1]][1]]
+                  for text, text_units, text_windows in zip(texts, units, windows) for window in text_windows]
+        outputs = iter(self.batcher.run_many(pieces, timeout=self.request_timeout))
+
+        results = []
+        stored = []
+        for text, text_units, text_keys, text_windows in zip(texts, units, keys, windows):
+            # مقاطع (بداية، نهاية، نص مصحح) مرتبة حسب موضعها في النص
+            segments = [(text_units[index][0], text_units[index][1], cached[key])
+                        for index, key in enumerate(text_keys) if key in cached]
+            for window in text_windows:
+                output = next(outputs)
+                sentences = [output] if len(window) == 1 else SENTENCE_BREAK.split(output)
+                if len(sentences) == len(window):
+                    for index, sentence in zip(window, sentences):
+                        segments.append((text_units[index][0], text_units[index][1], sentence))
+                        if self.cache:
+                            stored.append((text_keys[index], sentence))
+                else:
+                    # غيّر النموذج عدد الجمل في النافذة: تُستعمل مخرجاتها كاملة دون تخزين
+                    segments.append((text_units[window[0]][0], text_units[window[-1]][1], output))
+            segments.sort()
+
+            parts = []
+            position = 0
+            for start, end, corrected in segments:
+                parts.append(text[position:start])
+                parts.append(corrected)
+                position = end
+            parts.append(text[position:])
+
+            hits = len(text_units) - sum(len(window) for window in text_windows)
+            cache_stats = {
+                "sentences": len(text_units),
+                "hits": hits,
+                "hit_rate": round(hits / len(text_units), 4) if text_units else 0.0
             }
+            results.append((''.join(parts), cache_stats))
+
+        if stored:
+            self.cache.put_many(stored)
+        return results
+
+    def _units(self, text):
+        """
+        وحدات النص (بداية، نهاية، عدد الرموز، جملة كاملة؟): جمله، والجملة الأطول من حد النموذج
+        تُقسم على حدود الكلمات إلى أجزاء لا يتجاوز كل منها الحد
+        """
+        limit = self.max_window_tokens - self.tokenizer.num_special_tokens_to_add()
+        units = []
+        sentences = self._spans(text, SENTENCE_BREAK, 0, len(text))
+        for (start, end), tokens in zip(sentences, self._token_counts([text[s:e] for s, e in sentences])):
+            if tokens <= limit:
+                units.append((start, end, tokens, True))
+                continue
+            words = self._spans(text, WORD_BREAK, start, end)
+            counts = self._token_counts([text[s:e] for s, e in words])
+            piece_start, piece_tokens = None, 0
+            for (word_start, word_end), count in zip(words, counts):
+                if piece_start is not None and piece_tokens + count > limit:
+                    units.append((piece_start, piece_end, piece_tokens, False))
+                    piece_start = None
+                if piece_start is None:
+                    piece_start, piece_tokens = word_start, 0
+                piece_end = word_end
+                piece_tokens += count
+            units.append((piece_start, piece_end, piece_tokens, False))
+        return units
+
+    def _pack(self, units, indexes):
+        """
+        جمع الوحدات المطلوبة المتتالية في نوافذ (قوائم فهارس) لا يتجاوز طول كل منها حد النموذج؛
+        أجزاء الجمل الطويلة تبقى كل منها في نافذة وحدها
+        """
+        limit = self.max_window_tokens - self.tokenizer.num_special_tokens_to_add()
+        windows = []
+        window = []
+        window_tokens = 0
+        for index in indexes:
+            tokens, sentence = units[index][2], units[index][3]
+            if window and (not sentence or not units[window[-1]][3] or window[-1] != index - 1
+                           or window_tokens + tokens > limit):
+                windows.append(window)
+                window = []
+                window_tokens = 0
+            window.append(index)
+            window_tokens += tokens
+        if window:
+            windows.append(window)
+        return windows
+
+    def _spans(self, text, separator, start, end):
+        """
+        مواضع الأجزاء غير الفارغة من text[start:end] بين الفواصل
+        """
+        spans = []
+        position = start
+        for match in separator.finditer(text, start, end):
+            if match.start() > position:
+                spans.append((position, match.start()))
+            position = match.end()
+        if end > position:
+            spans.append((position, end))
+        return spans
+
+    def _token_counts(self, texts):
+        """
+        عدد رموز كل نص (دون الرموز الخاصة) باستدعاء واحد للتوكينايزر السريع
+        """
+        encoded = self.tokenizer(texts, add_special_tokens=False)["input_ids"]
+        return [len(ids) for ids in encoded]
+
+    def _generate(self, texts):
+        """
+        تمرير دفعة نصوص على النموذج دفعة واحدة (يستدعيها عامل جدولة الدفعات وحده)
+        """
+        outputs = self.corrector_pipeline(texts, batch_size=len(texts), **GENERATION_KWARGS)
+        results = []
+        for output in outputs:
+            # الـ pipeline قد يعيد قائمة لكل نص عند تمرير قائمة
+            if isinstance(output, list):
+                output = output[0]
+            results.append(output['generated_text'])
+        return results
+
+    def get_batching_stats(self):
+        """
+        إحصائيات جدولة الدفعات: عمق الطابور وأحجام الدفعات
+        """
+        return self.batcher.get_statistics()
+
+    def get_cache_stats(self):
+        """
+        إحصائيات ذاكرة الجمل (None إذا كانت معطلة)
+        """
+        return self.cache.get_statistics() if self.cache else None
+
+    def _build_result(self, text, corrected_text, cache_stats=None):
+        """
+        بناء نتيجة التصحيح مع تحليل الأخطاء والإحصائيات
+        """
+        corrections, stats = self._analyze_corrections(text, corrected_text)
+        
+        return {
+            "original_text": text,
+            "corrected_text": corrected_text,
+            "corrections": corrections,
+            "stats": stats,
+            "cache": cache_stats
+        }
+
+    def _error_result(self, text, error):
+        """
+        نتيجة تعيد النص الأصلي عند فشل التصحيح
+        """
+        return {
+            "original_text": text,
+            "corrected_text": text,
+            "corrections": [],
+            "stats": {"words": len(text.split()) if text else 0, "errors": 0, "accuracy": 100.0},
+            "cache": None,
+            "error": str(error)
+        }
 
     def _clean_text(self, text):
         """
@@ -145,6 +363,20 @@ class AdvancedArabicCorrector:
         
         return corrections, stats
 
+    def close(self):
+        """
+        تحرير النموذج وذاكرة الجهاز (يستدعيه ModelManager عند إزالة النموذج الخامل)
+        """
+        self.batcher.close()
+        if self.cache:
+            self.cache.close()
+        self.corrector_pipeline = None
+        self.model = None
+        self.tokenizer = None
+        gc.collect()
+        if self.device == "cuda":
+            torch.cuda.empty_cache()
+
     def get_model_info(self):
         """
         إرجاع معلومات عن النموذج المستخدم
@@ -0,0 +1,149 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# السوابق: حرف عطف (و/ف) ثم حرف جر (ب/ل/ك) ثم أداة التعريف، وكل منها اختياري
+_CONJUNCTIONS = ('', 'و', 'ف')
+_PREPOSITIONS = ('', 'ب', 'ل', 'ك')
+_ARTICLE = 'ال'
+
+# بعد حرف الجر يتغير كرسي همزة أول الجذع (إنه ← بأنه) أو يكون الحرف جزءاً من الكلمة (كانت)
+_SEAT_SENSITIVE = frozenset('بلك')
+_ALEF_SEATS = frozenset('اأإآ')
+
+# اللواحق: الضمائر المتصلة
+ENCLITICS = ('ه', 'ها', 'هم', 'هما', 'هن', 'ك', 'كم', 'كما', 'كن', 'ي', 'ني', 'نا')
+
+# (السابقة المكتوبة، السابقة المعادة إلى اللب، جزء اللب المستعاد)
+Proclitic = Tuple[str, str, str]
+
+
+def _build_proclitics() -> List[Proclitic]:
+    proclitics = []
+    for conjunction in _CONJUNCTIONS:
+        for preposition in _PREPOSITIONS:
+            prefix = conjunction + preposition
+            if prefix:
+                proclitics.append((prefix, prefix, ''))
+            if preposition == 'ل':
+                # ل + ال تُكتب "لل": نجرب اللب مع أداة التعريف ومن دونها
+                proclitics.append((prefix + 'ل', prefix + 'ل', ''))
+                proclitics.append((prefix + 'ل', prefix, _ARTICLE))
+            else:
+                proclitics.append((prefix + _ARTICLE, prefix + _ARTICLE, ''))
+                if prefix:
+                    proclitics.append((prefix + _ARTICLE, prefix, _ARTICLE))
+    return proclitics
+
+
+class _AffixTrie:
+    """Character trie of affixes; walking it lists every affix a token starts with"""
+
+    def __init__(self):
+        self.root: Dict[str, Any] = {}
+
+    def insert(self, key: str, value: Any) -> None:
+        node = self.root
+        for char in key:
+            node = node.setdefault(char, {})
+        node.setdefault(None, []).append(value)
+
+    def walk(self, chars) -> Iterator[Tuple[int, Any]]:
+        """Yield (affix length, value) for every affix that prefixes `chars`"""
+        node = self.root
+        for length, char in enumerate(chars, 1):
+            node = node.get(char)
+            if node is None:
+                return
+            for value in node.get(None, ()):
+                yield length, value
+
+
+class AffixSegmenter:
+    """Split clitics off a token so the bare stem can be looked up.
+
+    Both affix tables are precomputed into tries, so a token only costs
+    one short walk from each end plus one lookup per candidate split.
+    """
+
+    def __init__(self, min_stem_length: int = 3):
+        self.min_stem_length = min_stem_length
+
+        self._proclitics = _AffixTrie()
+        for surface, kept, restored in _build_proclitics():
+            self._proclitics.insert(surface, (kept, restored))
+
+        # اللواحق تُخزن مقلوبة ويُمشى فيها من آخر الكلمة
+        self._enclitics = _AffixTrie()
+        for enclitic in ENCLITICS:
+            self._enclitics.insert(enclitic[::-1], enclitic)
+
+    def splits(self, token: str) -> Iterator[Tuple[str, str, str]]:
+        """Yield (prefix, stem, suffix) splits, longest stem first"""
+        prefixes = [(0, ('', ''))] + list(self._proclitics.walk(token))
+        suffixes = [(0, '')] + list(self._enclitics.walk(reversed(token)))
+
+        candidates = []
+        for prefix_length, (kept, restored) in prefixes:
+            for suffix_length, suffix in suffixes:
+                if not prefix_length and not suffix_length:
+                    continue
+                stem = token[prefix_length:len(token) - suffix_length]
+                if len(stem) < self.min_stem_length:
+                    continue
+                candidates.append((prefix_length + suffix_length, kept, restored + stem, suffix))
+
+        candidates.sort(key=lambda candidate: candidate[0])
+        for _, prefix, stem, suffix in candidates:
+            yield prefix, stem, suffix
+
+    def find_stem(self, token: str, lookup: Callable[[str], Optional[str]]) -> Optional[Tuple[str, str, str, str]]:
+        """Return (prefix, stem, suffix, lookup result) for the first split that resolves"""
+        for prefix, stem, suffix in self.splits(token):
+            result = lookup(stem)
+            if result is not None:
+                return prefix, stem, suffix, result
+        return None
+
+    def find_correction(self, token: str,
+                        lookup: Callable[[str], Optional[str]]) -> Optional[Tuple[str, str, str, str]]:
+        """Return (prefix, stem, suffix, corrected stem) for the first split whose stem `lookup` corrects.
+
+        `lookup` should be an exact table lookup. Corrections that leave the
+        stem unchanged are ignored, as are corrections that move the hamza
+        seat of a stem's first alef behind ب/ل/ك: the seat depends on the
+        preposition (بأنه, not بإنه), and the letter may be part of the word
+        itself (كانت is not ك + انت).
+        """
+        for prefix, stem, suffix in self.splits(token):
+            corrected = lookup(stem)
+            if corrected is None or corrected == stem:
+                continue
+            if (prefix and prefix[-1] in _SEAT_SENSITIVE and not prefix.endswith(_ARTICLE)
+                    and stem[0] in _ALEF_SEATS and corrected[:1] != stem[0]):
+                continue
+            return prefix, stem, suffix, corrected
+        return None
+
+    def correct(self, token: str, lookup: Callable[[str], Optional[str]]) -> Optional[Tuple[str, str]]:
+        """Correct the stem of `token` and reattach its clitics.
+
+        Returns (corrected token, corrected stem) or None.
+        """
+        found = self.find_correction(token, lookup)
+        if found is None:
+            return None
+        prefix, _, suffix, corrected_stem = found
+        return reattach(prefix, corrected_stem, suffix), corrected_stem
+
+
+def reattach(prefix: str, stem: str, suffix: str) -> str:
+    """Join clitics to a stem, applying the spelling changes at the seams"""
+    # ل + ال → لل
+    if prefix.endswith('ل') and stem.startswith(_ARTICLE) and not prefix.endswith(_ARTICLE):
+        stem = stem[1:]
+    # التاء المربوطة تُفتح قبل الضمير المتصل: مدرسة + ها → مدرستها
+    if suffix and stem.endswith('ة'):
+        stem = stem[:-1] + 'ت'
+    # والألف المقصورة تُكتب ياءً: إلى + ه → إليه
+    if suffix and stem.endswith('ى'):
+        stem = stem[:-1] + 'ي'
+    return prefix + stem + suffix
@@ -0,0 +1,197 @@
+import heapq
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .edit_distance import unrestricted_damerau_levenshtein
+
+
+class _Node:
+    __slots__ = ('word', 'children', 'deleted')
+
+    def __init__(self, word: str):
+        self.word = word
+        self.children: Dict[int, '_Node'] = {}
+        self.deleted = False
+
+
+class BKTree:
+    """Burkhard-Keller metric tree over Damerau-Levenshtein distance.
+
+    Queries take a maximum distance and k, so callers can trade recall for
+    latency per request. Deletions leave tombstones that are compacted by
+    a rebuild once they outnumber the live words.
+    """
+
+    def __init__(self, words: Iterable[str] = (),
+                 distance: Callable[[str, str], int] = unrestricted_damerau_levenshtein):
+        self.distance = distance
+        self._root: Optional[_Node] = None
+        self._size = 0
+        self._tombstones = 0
+
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str) -> bool:
+        """Insert a word; returns False if it is already present"""
+        if not word:
+            return False
+        if self._root is None:
+            self._root = _Node(word)
+            self._size += 1
+            return True
+
+        node = self._root
+        while True:
+            distance = self.distance(word, node.word)
+            if distance == 0:
+                if node.deleted:
+                    node.deleted = False
+                    self._tombstones -= 1
+                    self._size += 1
+                    return True
+                return False
+
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = _Node(word)
+                self._size += 1
+                return True
+            node = child
+
+    def _find(self, word: str) -> Optional[_Node]:
+        node = self._root
+        while node is not None:
+            distance = self.distance(word, node.word)
+            if distance == 0:
+                return node
+            node = node.children.get(distance)
+        return None
+
+    def remove(self, word: str) -> bool:
+        """Delete a word (tombstone); compacts the tree when tombstones dominate"""
+        node = self._find(word)
+        if node is None or node.deleted:
+            return False
+
+        node.deleted = True
+        self._size -= 1
+        self._tombstones += 1
+        if self._tombstones > self._size:
+            self.rebuild()
+        return True
+
+    def updated(self, added: Iterable[str] = (), removed: Iterable[str] = ()) -> 'BKTree':
+        """A new tree with words added and removed, leaving this one untouched.
+
+        Only the nodes on the path to each changed word are copied; every
+        other subtree is shared with this tree.
+        """
+        tree = BKTree(distance=self.distance)
+        tree._root, tree._size, tree._tombstones = self._root, self._size, self._tombstones
+        copied = set()
+
+        def writable(node: _Node) -> _Node:
+            if id(node) in copied:
+                return node
+            clone = _Node(node.word)
+            clone.children = dict(node.children)
+            clone.deleted = node.deleted
+            copied.add(id(clone))
+            return clone
+
+        def walk(word: str) -> _Node:
+            """Copy the path to `word` and return its node, inserting one if it is missing"""
+            if tree._root is None:
+                tree._root = _Node(word)
+                copied.add(id(tree._root))
+                return tree._root
+            node = tree._root = writable(tree._root)
+            while True:
+                distance = tree.distance(word, node.word)
+                if distance == 0:
+                    return node
+                child = node.children.get(distance)
+                if child is None:
+                    child = _Node(word)
+                    copied.add(id(child))
+                else:
+                    child = writable(child)
+                node.children[distance] = child
+                node = child
+
+        for word in removed:
+            if word in tree:
+                walk(word).deleted = True
+                tree._size -= 1
+                tree._tombstones += 1
+        for word in added:
+            if word and word not in tree:
+                node = walk(word)
+                if node.deleted:
+                    node.deleted = False
+                    tree._tombstones -= 1
+                tree._size += 1
+
+        if tree._tombstones > tree._size:
+            tree.rebuild()
+        return tree
+
+    def rebuild(self) -> None:
+        """Rebuild the tree from its live words, dropping tombstones"""
+        words = list(self)
+        self._root = None
+        self._size = 0
+        self._tombstones = 0
+        for word in words:
+            self.add(word)
+
+    def __iter__(self):
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            if not node.deleted:
+                yield node.word
+            stack.extend(node.children.values())
+
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str):
+            return False
+        node = self._find(word)
+        return node is not None and not node.deleted
+
+    def __len__(self) -> int:
+        return self._size
+
+    def search(self, word: str, max_distance: int = 2, k: int = 3) -> List[Tuple[str, int]]:
+        """Return up to k (word, distance) pairs within max_distance, closest first"""
+        if self._root is None or k <= 0:
+            return []
+
+        # أفضل k نتيجة حتى الآن في كومة عظمى (المسافة سالبة)؛ يضيق نصف القطر كلما امتلأت
+        best: List[Tuple[int, str]] = []
+        radius = max_distance
+        stack = [self._root]
+
+        while stack:
+            node = stack.pop()
+            distance = self.distance(word, node.word)
+
+            if distance <= radius and not node.deleted:
+                heapq.heappush(best, (-distance, node.word))
+                if len(best) > k:
+                    heapq.heappop(best)
+                if len(best) == k:
+                    radius = min(radius, -best[0][0])
+
+            # عدم مساواة المثلث: الأبناء المفيدون فقط على مسافات [d - r, d + r]
+            for edge in range(max(1, distance - radius), distance + radius + 1):
+                child = node.children.get(edge)
+                if child is not None:
+                    stack.append(child)
+
+        return sorted(((candidate, -negative) for negative, candidate in best),
+                      key=lambda result: (result[1], result[0]))
+
+    def lookup(self, word: str, max_distance: int = 2, k: int = 3) -> List[Tuple[str, int]]:
+        """Same interface as SymSpellIndex.lookup"""
+        return self.search(word, 2 if max_distance is None else max_distance, k)
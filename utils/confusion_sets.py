@@ -0,0 +1,111 @@
+import itertools
+from typing import Callable, Container, Dict, List, Optional, Sequence, Tuple
+
+from .edit_distance import arabic_weighted_distance
+from .frequency_priors import best_candidate
+
+# (الحرف المكتوب، الحروف التي ربما قصدها الكاتب، موضعه: any أو initial أو final)
+Confusion = Tuple[str, str, str]
+
+# مجموعات الخلط الإملائي الكاملة: الهمزات والتاء المربوطة والألف المقصورة
+CONFUSION_SETS: Tuple[Confusion, ...] = (
+    ('ا', 'أإآ', 'any'),
+    ('أ', 'اإآ', 'any'),
+    ('إ', 'اأ', 'any'),
+    ('آ', 'اأ', 'any'),
+    ('ه', 'ة', 'final'),
+    ('ة', 'ه', 'final'),
+    ('ى', 'ي', 'final'),
+    ('ي', 'ى', 'final'),
+    ('ء', 'ئؤ', 'any'),
+    ('ئ', 'ءؤ', 'any'),
+    ('ؤ', 'ءئ', 'any'),
+)
+
+# الاتجاهات الشائعة وحدها، حين لا تكفي المفردات للتمييز بين كلمتين صحيحتين
+# (الياء الأخيرة مستبعدة: علي/على وأمثالها كلتاهما صحيحة)
+CONSERVATIVE_CONFUSION_SETS: Tuple[Confusion, ...] = (
+    ('ا', 'أإآ', 'initial'),
+    ('ه', 'ة', 'final'),
+    ('ء', 'ئؤ', 'any'),
+)
+
+
+class ConfusionGenerator:
+    """Expand a token through Arabic confusion sets and probe a word set.
+
+    Every confusable position may keep its letter or take one of its
+    alternatives; only the `max_positions` positions closest to the ends of
+    the word are expanded (hamza and taa marbuta errors sit there), so a
+    token yields at most a few dozen variants. Each variant costs one
+    membership test in `valid_words`, with no vocabulary scan.
+    """
+
+    def __init__(self, valid_words: Container[str],
+                 confusion_sets: Sequence[Confusion] = CONFUSION_SETS,
+                 max_positions: int = 3, max_changes: int = 2):
+        self.valid_words = valid_words
+        self.max_positions = max_positions
+        self.max_changes = max_changes
+
+        self._alternatives: Dict[Tuple[str, str], str] = {}
+        for char, alternatives, where in confusion_sets:
+            self._alternatives[(char, where)] = self._alternatives.get((char, where), '') + alternatives
+
+    def _position_alternatives(self, token: str) -> List[Tuple[int, str]]:
+        """(index, alternatives) for confusable positions, nearest the edges first"""
+        last = len(token) - 1
+        positions = []
+        for index, char in enumerate(token):
+            alternatives = self._alternatives.get((char, 'any'), '')
+            if index == 0:
+                alternatives += self._alternatives.get((char, 'initial'), '')
+            if index == last:
+                alternatives += self._alternatives.get((char, 'final'), '')
+            if alternatives:
+                positions.append((min(index, last - index), index, alternatives))
+
+        positions.sort()
+        return [(index, alternatives) for _, index, alternatives in positions[:self.max_positions]]
+
+    def variants(self, token: str) -> List[Tuple[str, int]]:
+        """Every (variant, letters changed) the confusion sets allow"""
+        positions = self._position_alternatives(token)
+        if not positions:
+            return []
+
+        chars = list(token)
+        variants = []
+        for choice in itertools.product(*[(token[index],) + tuple(alternatives)
+                                          for index, alternatives in positions]):
+            changes = sum(1 for (index, _), char in zip(positions, choice) if char != token[index])
+            if not changes or changes > self.max_changes:
+                continue
+            for (index, _), char in zip(positions, choice):
+                chars[index] = char
+            variants.append((''.join(chars), changes))
+        return variants
+
+    def _valid_variants(self, token: str) -> Dict[str, Tuple[int, float]]:
+        """Valid variants mapped to (letters changed, weighted distance)"""
+        found: Dict[str, Tuple[int, float]] = {}
+        for variant, changes in self.variants(token):
+            if variant not in found and variant in self.valid_words:
+                found[variant] = (changes, arabic_weighted_distance(token, variant))
+        return found
+
+    def candidates(self, token: str) -> List[Tuple[str, float]]:
+        """Valid variants as (word, weighted distance), best first"""
+        ranked = sorted(self._valid_variants(token).items(), key=lambda item: (item[1], item[0]))
+        return [(word, cost) for word, (_, cost) in ranked]
+
+    def correct(self, token: str, log_prior: Optional[Callable[[str], float]] = None) -> Optional[str]:
+        """The single best valid variant, or None if there is none or it is ambiguous.
+
+        With `log_prior`, variants are ranked by noisy-channel score instead of cost alone.
+        """
+        if token in self.valid_words:
+            return None
+
+        found = best_candidate([(word, cost) for word, (_, cost) in self._valid_variants(token).items()], log_prior)
+        return found[0] if found is not None else None
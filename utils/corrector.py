@@ -1,14 +1,43 @@
-import re
-import json
-from typing import List, Dict, Any, Tuple
-from difflib import SequenceMatcher
-import os
+from collections import Counter
+from types import MappingProxyType
+from typing import List, Dict, Any, Callable, FrozenSet, Iterable, Mapping, Optional, Tuple
+
+from .affixes import AffixSegmenter
+from .arabic_common_errors import common_errors as arabic_common_errors
+from .bktree import BKTree
+from .confusion_sets import ConfusionGenerator
+from .edit_distance import arabic_weighted_distance
+from .frequency_priors import FrequencyPriors, noisy_channel_score
+from .ngram_index import NgramIndex
+from .phrase_matcher import PhraseMatcher
+from .rasm import RasmIndex, moves_written_seat
+from .snapshot import SnapshotHolder
+from .symspell import SymSpellIndex
+from .token_cache import MISSING, TokenCache
+from .tokenizer import ARABIC, splice, tokenize
+from . import vocabulary_matrix
+
+class CorrectorSnapshot:
+    """حالة القاموس عند إصدار واحد: الجداول والفهارس المبنية فوقها، ولا تُعدل بعد نشرها"""
+    
+    def __init__(self, version: int, correct_words: FrozenSet[str], common_errors: Mapping[str, str],
+                 suggestion_index, rasm_index: RasmIndex, phrase_matcher: PhraseMatcher):
+        self.version = version
+        self.correct_words = correct_words
+        self.common_errors = common_errors
+        self.suggestion_index = suggestion_index
+        self.rasm_index = rasm_index
+        self.phrase_matcher = phrase_matcher
+        # صيغ الخلط الإملائي (الهمزات والتاء المربوطة والألف المقصورة) تُجرَّب على الكلمات الصحيحة مباشرة
+        self.confusion_generator = ConfusionGenerator(correct_words)
 
 class EnhancedCorrector:
     """Enhanced Arabic text corrector with custom database support"""
     
-    def __init__(self):
-        self.common_errors = {
+    def __init__(self, cache_entries: int = 100000, cache_bytes: int = 32 * 1024 * 1024,
+                 max_edit_distance: int = 2, suggestion_backend: str = None,
+                 frequency_priors: FrequencyPriors = None, max_suggestions: int = 3):
+        common_errors = {
             # همزة الوصل والقطع
             'اذا': 'إذا',
             'الى': 'إلى',
@@ -62,7 +91,7 @@ class EnhancedCorrector:
         }
         
         # قاعدة بيانات الكلمات الصحيحة
-        self.correct_words = set([
+        correct_words = set([
             'هذا', 'هذه', 'ذلك', 'تلك', 'أولئك', 'إذا', 'إلى', 'إنه', 'إنها',
             'أنت', 'أنا', 'أين', 'أيضاً', 'أكثر', 'أفضل', 'أول', 'آخر', 'أخرى',
             'مدرسة', 'جامعة', 'حكومة', 'شركة', 'مؤسسة', 'خطة', 'فكرة', 'طريقة',
@@ -79,6 +108,35 @@ class EnhancedCorrector:
             'طبيعي', 'غير', 'طبيعي', 'منطقي', 'غير', 'منطقي', 'معقول', 'غير', 'معقول'
         ])
         
+        # فهرس اقتراح الكلمات المشابهة: الحذف المتماثل (SymSpell) أسرع، وشجرة BK أقل استهلاكاً للذاكرة،
+        # والفهرس المقطعي (ngram) يناسب المفردات الكبيرة جداً إذ يحد عدد المرشحين قبل حساب المسافة،
+        # ومصفوفة المفردات (matrix) تصفي المفردات كلها بحدود دنيا متجهة، وهي الافتراضية إذا توفرت numpy
+        self.max_edit_distance = max_edit_distance
+        if suggestion_backend is None:
+            suggestion_backend = 'matrix' if vocabulary_matrix.np is not None else 'symspell'
+        if suggestion_backend not in ('matrix', 'symspell', 'bktree', 'ngram'):
+            raise ValueError(f'Unknown suggestion backend: {suggestion_backend}')
+        self.suggestion_backend = suggestion_backend
+        
+        # الجداول والفهارس في لقطات ثابتة ذات إصدار: كل تحديث يبني لقطة جديدة جانباً وينشرها
+        # بتبديل مرجع واحد، وكل طلب يثبّت لقطة واحدة دون أقفال
+        self.snapshots = SnapshotHolder(self._build_snapshot(0, correct_words, common_errors))
+        
+        # عدد الكلمات التي حسمتها كل طبقة (تُحسب عند غياب الكلمة من الذاكرة المؤقتة فقط)
+        self.tier_counts = Counter()
+        
+        # تكرارات الكلمات (من custom_words) كاحتمالات مسبقة لترتيب الاقتراحات، وعدد الاقتراحات المعادة
+        self.frequency_priors = frequency_priors if frequency_priors is not None else FrequencyPriors()
+        self._priors_version = self.frequency_priors.version
+        self.max_suggestions = max_suggestions
+        
+        # تجزئة السوابق واللواحق للبحث عن جذع الكلمة
+        self.segmenter = AffixSegmenter()
+        
+        # ذاكرة مؤقتة لنتائج الكلمات، أهمها نتائج البحث عن كلمات مشابهة المكلف،
+        # مفاتيحها (إصدار اللقطة، الكلمة)
+        self.cache = TokenCache(cache_entries, cache_bytes)
+        
         # إحصائيات
         self.stats = {
             'total_words': 0,
@@ -87,8 +145,109 @@ class EnhancedCorrector:
             'accuracy': 0.0
         }
     
+    def _build_snapshot(self, version: int, correct_words: Iterable[str],
+                        common_errors: Dict[str, str]) -> CorrectorSnapshot:
+        """بناء لقطة كاملة (الجداول وكل الفهارس) جانباً دون المساس باللقطة المنشورة"""
+        correct_words = frozenset(correct_words)
+        common_errors = MappingProxyType(dict(common_errors))
+        
+        if self.suggestion_backend == 'matrix':
+            suggestion_index = vocabulary_matrix.VocabularyMatrix(correct_words)
+        elif self.suggestion_backend == 'symspell':
+            suggestion_index = SymSpellIndex(correct_words, max_distance=self.max_edit_distance)
+        elif self.suggestion_backend == 'bktree':
+            suggestion_index = BKTree(correct_words)
+        else:
+            suggestion_index = NgramIndex(correct_words)
+        
+        return CorrectorSnapshot(
+            version, correct_words, common_errors, suggestion_index,
+            # فهرس الهيكل غير المنقوط (الرسم): أرخص طبقة للمرشحين قبل أي بحث بمسافة التحرير
+            RasmIndex(correct_words),
+            # مطابق العبارات فوق جداول الأخطاء (جدول المدقق أولاً ثم الجدول المشترك)
+            PhraseMatcher([common_errors, arabic_common_errors])
+        )
+    
+    def _update_snapshot(self, current: CorrectorSnapshot, version: int, added: Iterable[str] = (),
+                         removed: Iterable[str] = ()) -> CorrectorSnapshot:
+        """لقطة تزيد كلمات على اللقطة الحالية أو تحذفها، تتشارك معها الفهارس إلا المسارات التي تتغير"""
+        added = [word for word in added if word not in current.correct_words]
+        removed = [word for word in removed if word in current.correct_words]
+        return CorrectorSnapshot(
+            version, current.correct_words.union(added).difference(removed), current.common_errors,
+            current.suggestion_index.updated(added, removed),
+            current.rasm_index.updated(added, removed),
+            current.phrase_matcher
+        )
+    
+    def _publish(self, change: Callable[[CorrectorSnapshot], Optional[Tuple[Iterable[str], Dict[str, str]]]]) -> bool:
+        """نشر لقطة جديدة من (الكلمات الصحيحة، جدول الأخطاء) التي تعيدها change للقطة الحالية.
+        
+        change تعيد None إذا لم يتغير شيء، فلا تُنشر لقطة. تعيد بناء كل الفهارس، فهي للتحديثات الكبيرة
+        (الاستيراد)؛ الكلمات المفردة تمر عبر _publish_words
+        """
+        def derive(current: CorrectorSnapshot, version: int) -> Optional[CorrectorSnapshot]:
+            tables = change(current)
+            return self._build_snapshot(version, *tables) if tables is not None else None
+        
+        return self._publish_derived(derive)
+    
+    def _publish_words(self, added: Iterable[str] = (), removed: Iterable[str] = ()) -> bool:
+        """نشر لقطة تضيف كلمات صحيحة أو تحذفها بتحديث الفهارس تدريجياً دون إعادة بنائها"""
+        added, removed = set(added), set(removed)
+        
+        def derive(current: CorrectorSnapshot, version: int) -> Optional[CorrectorSnapshot]:
+            if not (added - current.correct_words) and not (removed & current.correct_words):
+                return None
+            return self._update_snapshot(current, version, added, removed)
+        
+        return self._publish_derived(derive)
+    
+    def _publish_derived(self, derive: Callable[[CorrectorSnapshot, int], Optional[CorrectorSnapshot]]) -> bool:
+        if self.snapshots.update(derive) is None:
+            return False
+        self.cache.clear()
+        return True
+    
+    @property
+    def correct_words(self) -> FrozenSet[str]:
+        """الكلمات الصحيحة في اللقطة الحالية"""
+        return self.snapshots.current().correct_words
+    
+    @property
+    def common_errors(self) -> Mapping[str, str]:
+        """جدول الأخطاء الشائعة في اللقطة الحالية (للقراءة فقط)"""
+        return self.snapshots.current().common_errors
+    
+    @property
+    def suggestion_index(self):
+        return self.snapshots.current().suggestion_index
+    
+    @property
+    def rasm_index(self) -> RasmIndex:
+        return self.snapshots.current().rasm_index
+    
+    @property
+    def confusion_generator(self) -> ConfusionGenerator:
+        return self.snapshots.current().confusion_generator
+    
+    @property
+    def phrase_matcher(self) -> PhraseMatcher:
+        return self.snapshots.current().phrase_matcher
+    
     def correct_text(self, text: str) -> Dict[str, Any]:
         """تدقيق النص وإرجاع النتائج"""
+        return self._correct(text, {}, self.snapshots.current())
+    
+    def correct_texts(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """تدقيق مجموعة نصوص مع تدقيق كل كلمة مميزة مرة واحدة للمجموعة كلها"""
+        word_results = {}
+        snapshot = self.snapshots.current()
+        return [self._correct(text, word_results, snapshot) for text in texts]
+    
+    def _correct(self, text: str, word_results: Dict[str, Dict[str, Any]],
+                 snapshot: CorrectorSnapshot) -> Dict[str, Any]:
+        """تدقيق نص واحد على لقطة واحدة؛ word_results يحفظ نتائج الكلمات بين الاستدعاءات"""
         if not text or not text.strip():
             return {
                 'original_text': text,
@@ -98,33 +257,51 @@ class EnhancedCorrector:
                 'suggestions': []
             }
         
-        # تنظيف النص
-        cleaned_text = self._clean_text(text)
+        # تقسيم النص إلى مقاطع مع الاحتفاظ بمواضعها في النص الأصلي
+        spans = tokenize(text)
         
-        # تقسيم النص إلى كلمات
-        words = self._tokenize(cleaned_text)
+        # البحث عن العبارات الخاطئة (بما فيها متعددة الكلمات) في مرور واحد
+        phrases = snapshot.phrase_matcher.match_spans(text, spans, self._remove_diacritics)
         
         # تدقيق كل كلمة
-        corrected_words = []
+        replacements = []
         errors = []
         suggestions = []
+        arabic_words = 0
+        skip_until = 0
         
-        for i, word in enumerate(words):
-            if self._is_arabic_word(word):
-                correction_result = self._correct_word(word, i)
-                corrected_words.append(correction_result['corrected'])
-                
-                if correction_result['has_error']:
-                    errors.append(correction_result['error'])
-                    suggestions.extend(correction_result['suggestions'])
+        for i, (start, end, core_start, core_end, kind) in enumerate(spans):
+            # المقاطع غير العربية لا تمر بالتدقيق
+            if kind != ARABIC:
+                continue
+            
+            arabic_words += 1
+            if i < skip_until:
+                continue
+            
+            phrase = phrases.get(i)
+            if phrase is not None:
+                # خطأ معروف من الجداول، وقد يمتد على أكثر من كلمة
+                core_end = spans[phrase[1] - 1][3]
+                skip_until = phrase[1]
+                correction_result = self._known_error_result(text[core_start:core_end], phrase[2], i, core_start, core_end)
             else:
-                corrected_words.append(word)
+                word = text[core_start:core_end]
+                if word not in word_results:
+                    word_results[word] = self._cached_correct_word(word, i, core_start, core_end, snapshot)
+                correction_result = self._at_position(word_results[word], i, core_start, core_end)
+            
+            if correction_result['has_error']:
+                errors.append(correction_result['error'])
+                suggestions.extend(correction_result['suggestions'])
+                if correction_result['corrected'] != text[core_start:core_end]:
+                    replacements.append((core_start, core_end, correction_result['corrected']))
         
-        # إعادة تجميع النص
-        corrected_text = ' '.join(corrected_words)
+        # إعادة بناء النص مع الحفاظ على المسافات الأصلية
+        corrected_text = splice(text, replacements)
         
         # حساب الإحصائيات
-        self._update_stats(words, errors)
+        self._update_stats(arabic_words, errors)
         
         return {
             'original_text': text,
@@ -134,32 +311,12 @@ class EnhancedCorrector:
             'suggestions': suggestions
         }
     
-    def _clean_text(self, text: str) -> str:
-        """تنظيف النص من الرموز غير المرغوبة"""
-        # إزالة الرموز الزائدة
-        text = re.sub(r'[^\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF\s\d\.,!?;:()\[\]{}"\'-]', '', text)
-        
-        # تنظيف المسافات
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
-    
-    def _tokenize(self, text: str) -> List[str]:
-        """تقسيم النص إلى كلمات"""
-        # تقسيم بناءً على المسافات والعلامات
-        tokens = re.findall(r'[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]+|[^\s]', text)
-        return tokens
-    
-    def _is_arabic_word(self, word: str) -> bool:
-        """التحقق من كون الكلمة عربية"""
-        if not word:
-            return False
-        
-        arabic_chars = re.findall(r'[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]', word)
-        return len(arabic_chars) > 0
-    
-    def _correct_word(self, word: str, position: int) -> Dict[str, Any]:
+    def _correct_word(self, word: str, position: int, start: int = 0, end: int = 0,
+                      snapshot: CorrectorSnapshot = None) -> Dict[str, Any]:
         """تدقيق كلمة واحدة"""
+        if snapshot is None:
+            snapshot = self.snapshots.current()
+        
         original_word = word
         has_error = False
         error_info = None
@@ -170,42 +327,57 @@ class EnhancedCorrector:
         clean_word = self._remove_diacritics(word)
         
         # البحث في قاموس الأخطاء الشائعة
-        if clean_word in self.common_errors:
-            corrected_word = self.common_errors[clean_word]
-            has_error = True
-            error_info = {
-                'type': 'spelling',
-                'position': position,
-                'original': word,
-                'corrected': corrected_word,
-                'message': f'خطأ إملائي: "{word}" يجب أن تكون "{corrected_word}"'
-            }
-            suggestions.append({
-                'word': corrected_word,
-                'confidence': 0.95,
-                'type': 'correction'
-            })
-            return {
-                'corrected': corrected_word,
-                'has_error': has_error,
-                'error': error_info,
-                'suggestions': suggestions
-            }
+        if clean_word in snapshot.common_errors:
+            self.tier_counts['tables'] += 1
+            return self._known_error_result(word, snapshot.common_errors[clean_word], position, start, end)
+        
+        # كلمة صحيحة معروفة لا تُجزأ
+        if clean_word in snapshot.correct_words:
+            self.tier_counts['known'] += 1
+            return self._no_error_result(word)
         
-        # التحقق من وجود الكلمة في قاعدة البيانات
-        if clean_word not in self.correct_words:
+        # تجريد السوابق واللواحق والبحث عن الجذع في قاموس الأخطاء
+        segmented = self.segmenter.correct(clean_word, snapshot.common_errors.get)
+        if segmented is not None:
+            self.tier_counts['tables'] += 1
+            return self._known_error_result(word, segmented[0], position, start, end)
+        
+        # التحقق من وجود جذع الكلمة بعد تجريد السوابق واللواحق في قاعدة البيانات
+        if self._has_known_stem(clean_word, snapshot.correct_words):
+            self.tier_counts['known'] += 1
+        else:
+            # كلمة صحيحة لها الهيكل غير المنقوط نفسه: مسبار واحد في الفهرس
+            same_rasm = snapshot.rasm_index.correction(clean_word, log_prior=self.frequency_priors.log_prior)
+            if same_rasm is not None:
+                self.tier_counts['rasm'] += 1
+                return self._known_error_result(word, same_rasm, position, start, end)
+            
+            # صيغة خلط إملائي واحدة صحيحة: تصحيح دون البحث في المفردات كلها
+            # الهمزة المكتوبة والياء الأخيرة صيغ محتملة: لا تُنقل إلى كرسي آخر (أنه/إنه، علي/على)
+            confused = snapshot.confusion_generator.correct(clean_word, self.frequency_priors.log_prior)
+            if confused is not None and moves_written_seat(clean_word, confused):
+                confused = None
+            if confused is not None:
+                self.tier_counts['confusion'] += 1
+                return self._known_error_result(word, confused, position, start, end)
+            
             # البحث عن كلمات مشابهة
-            similar_words = self._find_similar_words(clean_word)
+            self.tier_counts['fuzzy'] += 1
+            similar_words = self._find_similar_words(clean_word, snapshot=snapshot)
             
             if similar_words:
                 # استخدام أفضل اقتراح كتصحيح
                 best_suggestion = similar_words[0]
-                if best_suggestion['confidence'] > 0.8:  # عتبة عالية للتصحيح التلقائي
+                # عتبة عالية للتصحيح التلقائي: الثقة 1 - الكلفة / الطول، فتعديل كامل واحد في كلمة من خمسة أحرف
+                # يساوي 0.8 ويُقبل (كما كانت نسبة SequenceMatcher تقبله)، ولا يُنقل كرسي همزة أو ياء أخيرة مكتوبة تلقائياً
+                if best_suggestion['confidence'] >= 0.8 and not moves_written_seat(clean_word, best_suggestion['word']):
                     corrected_word = best_suggestion['word']
                     has_error = True
                     error_info = {
                         'type': 'spelling',
                         'position': position,
+                        'start': start,
+                        'end': end,
                         'original': word,
                         'corrected': corrected_word,
                         'message': f'تصحيح مقترح: "{word}" → "{corrected_word}"'
@@ -215,6 +387,8 @@ class EnhancedCorrector:
                     error_info = {
                         'type': 'unknown',
                         'position': position,
+                        'start': start,
+                        'end': end,
                         'original': word,
                         'corrected': word,
                         'message': f'كلمة غير معروفة: "{word}"'
@@ -228,35 +402,119 @@ class EnhancedCorrector:
             'suggestions': suggestions
         }
     
+    def _cached_correct_word(self, word: str, position: int, start: int, end: int,
+                             snapshot: CorrectorSnapshot) -> Dict[str, Any]:
+        """تدقيق كلمة عبر الذاكرة المؤقتة"""
+        # نتيجة محسوبة على لقطة لا تُقدم لطلب يقرأ لقطة أخرى، ولا بعد تغير تكرارات الكلمات
+        self._sync_frequency_priors()
+        key = (snapshot.version, word)
+        result = self.cache.get(key)
+        if result is MISSING:
+            generation = self.cache.generation
+            result = self._correct_word(word, position, start, end, snapshot)
+            self.cache.put(key, result, generation)
+        return result
+    
+    def _at_position(self, result: Dict[str, Any], position: int, start: int, end: int) -> Dict[str, Any]:
+        """نسخة من نتيجة تدقيق كلمة بموضع جديد في النص"""
+        error = result['error']
+        if error is None:
+            return result
+        
+        # النتيجة قد تكون مشتركة عبر الذاكرة المؤقتة، فلا تُعدل في مكانها
+        error = dict(error)
+        error.update({'position': position, 'start': start, 'end': end})
+        return dict(result, error=error)
+    
+    def _no_error_result(self, word: str) -> Dict[str, Any]:
+        """نتيجة كلمة صحيحة"""
+        return {
+            'corrected': word,
+            'has_error': False,
+            'error': None,
+            'suggestions': []
+        }
+    
+    def _known_error_result(self, word: str, corrected_word: str, position: int,
+                            start: int, end: int) -> Dict[str, Any]:
+        """نتيجة تصحيح خطأ معروف من جداول الأخطاء"""
+        return {
+            'corrected': corrected_word,
+            'has_error': True,
+            'error': {
+                'type': 'spelling',
+                'position': position,
+                'start': start,
+                'end': end,
+                'original': word,
+                'corrected': corrected_word,
+                'message': f'خطأ إملائي: "{word}" يجب أن تكون "{corrected_word}"'
+            },
+            'suggestions': [{
+                'word': corrected_word,
+                'confidence': 0.95,
+                'type': 'correction'
+            }]
+        }
+    
+    def _has_known_stem(self, word: str, correct_words: FrozenSet[str]) -> bool:
+        """التحقق من كون جذع الكلمة بعد تجريد السوابق واللواحق كلمة صحيحة"""
+        found = self.segmenter.find_stem(word, lambda stem: stem if stem in correct_words else None)
+        return found is not None
+    
     def _remove_diacritics(self, text: str) -> str:
         """إزالة التشكيل من النص"""
         diacritics = '\u064B\u064C\u064D\u064E\u064F\u0650\u0651\u0652\u0653\u0654\u0655\u0656\u0657\u0658\u0659\u065A\u065B\u065C\u065D\u065E\u065F\u0670'
         return ''.join(char for char in text if char not in diacritics)
     
-    def _find_similar_words(self, word: str) -> List[Dict[str, Any]]:
-        """البحث عن كلمات مشابهة"""
+    def _find_similar_words(self, word: str, max_distance: int = None, k: int = None,
+                            snapshot: CorrectorSnapshot = None) -> List[Dict[str, Any]]:
+        """البحث عن كلمات مشابهة ضمن مسافة تحرير قصوى، مرتبة بنموذج القناة الصاخبة"""
+        if snapshot is None:
+            snapshot = self.snapshots.current()
+        if max_distance is None:
+            max_distance = self.max_edit_distance
+        if k is None:
+            k = self.max_suggestions
+        
         suggestions = []
         
-        # البحث في الكلمات الصحيحة
-        for correct_word in self.correct_words:
-            similarity = SequenceMatcher(None, word, correct_word).ratio()
+        # البحث في الفهرس بدلاً من مسح جميع الكلمات الصحيحة، ثم الترتيب بالمسافة الموزونة وتكرار الكلمة
+        for correct_word, distance in snapshot.suggestion_index.lookup(word, max_distance, k=max(k, 25)):
+            longest = max(len(word), len(correct_word))
+            cost = arabic_weighted_distance(word, correct_word, max_cost=0.4 * longest)
+            similarity = 1 - cost / longest
             if similarity > 0.6:  # عتبة التشابه
                 suggestions.append({
                     'word': correct_word,
-                    'confidence': similarity,
+                    'confidence': round(similarity, 3),
+                    'distance': distance,
+                    'weighted_distance': cost,
+                    'score': round(noisy_channel_score(cost, self.frequency_priors.log_prior(correct_word)), 3),
                     'type': 'suggestion'
                 })
         
-        # ترتيب حسب درجة التشابه
-        suggestions.sort(key=lambda x: x['confidence'], reverse=True)
+        # ترتيب حسب احتمال الكلمة بعد الخطأ: كلفة التحرير مع تكرار الكلمة
+        suggestions.sort(key=lambda x: x['score'], reverse=True)
         
-        return suggestions[:3]  # أفضل 3 اقتراحات
+        return suggestions[:k]  # أفضل k اقتراحات
+    
+    def set_frequency_priors(self, frequency_priors: FrequencyPriors) -> None:
+        """استبدال جدول التكرارات المستخدم في ترتيب الاقتراحات"""
+        self.frequency_priors = frequency_priors
+        self._priors_version = frequency_priors.version
+        self.cache.clear()
     
-    def _update_stats(self, words: List[str], errors: List[Dict]) -> None:
+    def _sync_frequency_priors(self) -> None:
+        """إفراغ الذاكرة المؤقتة إذا تغيرت التكرارات منذ حساب النتائج المخزنة"""
+        version = self.frequency_priors.version
+        if version != self._priors_version:
+            self._priors_version = version
+            self.cache.clear()
+    
+    def _update_stats(self, arabic_words: int, errors: List[Dict]) -> None:
         """تحديث الإحصائيات"""
-        arabic_words = [w for w in words if self._is_arabic_word(w)]
-        
-        self.stats['total_words'] = len(arabic_words)
+        self.stats['total_words'] = arabic_words
         self.stats['errors_found'] = len(errors)
         self.stats['corrections_made'] = len([e for e in errors if e['type'] == 'spelling'])
         
@@ -271,7 +529,7 @@ class EnhancedCorrector:
             clean_word = self._remove_diacritics(word.strip())
             
             if is_correct and clean_word:
-                self.correct_words.add(clean_word)
+                self._publish_words(added=[clean_word])
                 return True
             
             return False
@@ -283,11 +541,7 @@ class EnhancedCorrector:
         try:
             clean_word = self._remove_diacritics(word.strip())
             
-            if clean_word in self.correct_words:
-                self.correct_words.remove(clean_word)
-                return True
-            
-            return False
+            return self._publish_words(removed=[clean_word])
         except Exception:
             return False
     
@@ -298,22 +552,42 @@ class EnhancedCorrector:
             'common_errors_count': len(self.common_errors)
         }
     
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """إحصائيات الذاكرة المؤقتة (الإصابات والإخفاقات والإزاحات)"""
+        return self.cache.get_statistics()
+    
+    def get_tier_stats(self) -> Dict[str, Any]:
+        """عدد الكلمات التي حسمتها كل طبقة، ونسبة ما وفرته طبقة الرسم من البحث التقريبي"""
+        counts = dict(self.tier_counts)
+        total = sum(counts.values())
+        return {
+            'lookups': total,
+            'resolved_by': counts,
+            'rasm_rate': round(counts.get('rasm', 0) / total * 100, 2) if total else 0.0
+        }
+    
     def export_database(self) -> Dict[str, Any]:
         """تصدير قاعدة البيانات"""
         return {
             'correct_words': list(self.correct_words),
-            'common_errors': self.common_errors
+            'common_errors': dict(self.common_errors)
         }
     
     def import_database(self, data: Dict[str, Any]) -> bool:
         """استيراد قاعدة البيانات"""
         try:
-            if 'correct_words' in data:
-                self.correct_words.update(data['correct_words'])
-            
-            if 'common_errors' in data:
-                self.common_errors.update(data['common_errors'])
+            # الكلمات والجداول والفهارس كلها تُبنى في لقطة جديدة ثم تُنشر مرة واحدة
+            def change(current: CorrectorSnapshot) -> Tuple[FrozenSet[str], Dict[str, str]]:
+                correct_words = current.correct_words
+                if 'correct_words' in data:
+                    correct_words = correct_words.union(data['correct_words'])
+                
+                common_errors = dict(current.common_errors)
+                if 'common_errors' in data:
+                    common_errors.update(data['common_errors'])
+                return correct_words, common_errors
             
+            self._publish(change)
             return True
         except Exception:
             return False
@@ -0,0 +1,234 @@
+from typing import Dict, Optional, Tuple
+
+
+def damerau_levenshtein(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """Optimal-string-alignment distance (adjacent transpositions cost 1).
+
+    Bit-parallel (Myers/Hyyro): each column of the DP matrix is held in two
+    integers, so the cost is one handful of word operations per character
+    of `b` instead of a full row of Python arithmetic. When `max_distance`
+    is given, returns max_distance + 1 as soon as the distance is known to
+    exceed it.
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+    if not b:
+        return len(a)
+
+    # النمط هو الكلمة الأقصر: بت لكل حرف منها
+    pattern, text = b, a
+    length = len(pattern)
+    mask = (1 << length) - 1
+    last_bit = 1 << (length - 1)
+
+    match_masks: Dict[str, int] = {}
+    for index, char in enumerate(pattern):
+        match_masks[char] = match_masks.get(char, 0) | (1 << index)
+
+    positive = mask
+    negative = 0
+    diagonal = 0
+    previous_match = 0
+    distance = length
+    remaining = len(text)
+
+    for char in text:
+        match = match_masks.get(char, 0)
+        # تبديل حرفين متجاورين (Hyyro 2003)
+        transposed = (((~diagonal) & match) << 1) & previous_match
+        diagonal = (((match & positive) + positive) ^ positive) | match | negative | transposed
+        horizontal_positive = negative | ~(diagonal | positive)
+        horizontal_negative = diagonal & positive
+
+        if horizontal_positive & last_bit:
+            distance += 1
+        elif horizontal_negative & last_bit:
+            distance -= 1
+
+        horizontal_positive = ((horizontal_positive << 1) | 1) & mask
+        horizontal_negative = (horizontal_negative << 1) & mask
+        positive = (horizontal_negative | ~(diagonal | horizontal_positive)) & mask
+        negative = horizontal_positive & diagonal & mask
+        previous_match = match
+
+        # المسافة النهائية لا تقل عن الحالية ناقص الحروف المتبقية
+        remaining -= 1
+        if max_distance is not None and distance - remaining > max_distance:
+            return max_distance + 1
+
+    if max_distance is not None and distance > max_distance:
+        return max_distance + 1
+    return distance
+
+
+def unrestricted_damerau_levenshtein(a: str, b: str) -> int:
+    """True Damerau-Levenshtein distance (Lowrance-Wagner).
+
+    Unlike the optimal-string-alignment variant it satisfies the triangle
+    inequality, which metric trees such as the BK-tree rely on.
+    """
+    if a == b:
+        return 0
+    if not a or not b:
+        return len(a) + len(b)
+
+    maximum = len(a) + len(b)
+    last_row = {}
+    # مصفوفة بهامشين: الصف والعمود الأولان للقيمة القصوى
+    matrix = [[maximum] * (len(b) + 2)]
+    matrix += [[maximum] + list(range(len(b) + 1))]
+    matrix += [[maximum, i] + [0] * len(b) for i in range(1, len(a) + 1)]
+
+    for i in range(1, len(a) + 1):
+        last_match_column = 0
+        for j in range(1, len(b) + 1):
+            last_match_row = last_row.get(b[j - 1], 0)
+            if a[i - 1] == b[j - 1]:
+                cost = 0
+                previous_match_column = last_match_column
+                last_match_column = j
+            else:
+                cost = 1
+                previous_match_column = last_match_column
+
+            matrix[i + 1][j + 1] = min(
+                matrix[i][j] + cost,
+                matrix[i + 1][j] + 1,
+                matrix[i][j + 1] + 1,
+                matrix[last_match_row][previous_match_column]
+                + (i - last_match_row - 1) + 1 + (j - previous_match_column - 1),
+            )
+        last_row[a[i - 1]] = i
+
+    return matrix[len(a) + 1][len(b) + 1]
+
+
+# مجموعات الحروف التي يكثر الخلط بينها في الكتابة العربية، وكلفة استبدال بعضها ببعض
+CONFUSION_GROUPS = (
+    ('اأإآ', 0.2),   # همزات الألف
+    ('هة', 0.2),     # الهاء والتاء المربوطة
+    ('يى', 0.2),     # الياء والألف المقصورة
+    ('ئؤء', 0.3),    # الهمزة على الياء والواو والسطر
+    ('اى', 0.4),     # الألف والألف المقصورة في آخر الكلمة
+    ('تة', 0.4),     # التاء المفتوحة والمربوطة
+    ('ذز', 0.5),
+    ('ضظ', 0.5),
+    ('سص', 0.6),
+    ('تط', 0.6),
+)
+
+# صفوف لوحة المفاتيح العربية القياسية (المسافة مكان مفتاح "لا")
+KEYBOARD_ROWS = (
+    'ضصثقفغعهخحجد',
+    'شسيبلاتنمكط',
+    'ئءؤر ىةوزظ',
+)
+KEYBOARD_COST = 0.6
+
+MIN_SUBSTITUTION_COST = min(cost for _, cost in CONFUSION_GROUPS)
+
+
+def _build_substitution_costs() -> Dict[Tuple[str, str], float]:
+    costs: Dict[Tuple[str, str], float] = {}
+
+    def offer(first: str, second: str, cost: float) -> None:
+        if first == second or ' ' in (first, second):
+            return
+        for pair in ((first, second), (second, first)):
+            costs[pair] = min(cost, costs.get(pair, 1.0))
+
+    # المفاتيح المتجاورة أفقياً، ومع الصف التالي (الصفوف مزاحة بنصف مفتاح)
+    for row_index, row in enumerate(KEYBOARD_ROWS):
+        for column, char in enumerate(row):
+            if column + 1 < len(row):
+                offer(char, row[column + 1], KEYBOARD_COST)
+            if row_index + 1 < len(KEYBOARD_ROWS):
+                below = KEYBOARD_ROWS[row_index + 1]
+                for neighbour in (column - 1, column):
+                    if 0 <= neighbour < len(below):
+                        offer(char, below[neighbour], KEYBOARD_COST)
+
+    for group, cost in CONFUSION_GROUPS:
+        for first in group:
+            for second in group:
+                offer(first, second, cost)
+    return costs
+
+
+SUBSTITUTION_COSTS = _build_substitution_costs()
+
+
+def arabic_weighted_distance(a: str, b: str, max_cost: Optional[float] = None) -> float:
+    """Edit distance where common Arabic confusions cost less than 1.
+
+    Insertions, deletions and adjacent transpositions cost 1; substitutions
+    cost SUBSTITUTION_COSTS (hamza forms, taa marbuta, alef maqsura,
+    neighbouring keys) or 1. The bit-parallel unit distance is computed
+    first: it bounds the weighted cost from above and, scaled by the
+    cheapest substitution, from below. Pure insertions and deletions, and
+    equal-length pairs whose differing positions are all substitutions that
+    no shifted alignment can beat, are then scored directly, so most
+    candidates are settled or rejected without running the weighted DP. Returns a value greater than
+    `max_cost` (not necessarily exact) once the cost is known to exceed it.
+    """
+    if a == b:
+        return 0.0
+
+    limit = None if max_cost is None else int(max_cost / MIN_SUBSTITUTION_COST)
+    unit_distance = damerau_levenshtein(a, b, limit)
+    if limit is not None and unit_distance > limit:
+        return float(unit_distance)
+    if max_cost is not None and unit_distance * MIN_SUBSTITUTION_COST > max_cost:
+        return unit_distance * MIN_SUBSTITUTION_COST
+    if abs(len(a) - len(b)) == unit_distance:
+        # الفرق كله إضافات أو حذوفات: لا يوجد استبدال أرخص
+        return float(unit_distance)
+    if len(a) == len(b):
+        # الحروف المختلفة في مواضعها بعدد المسافة: المحاذاة حرفاً بحرف مثلى إلا إذا فاقت كلفتها
+        # أرخص محاذاة بديلة، وهي إضافة وحذف على الأقل (2) وبقية التعديلات بأرخص استبدال
+        differences = [(char_a, char_b) for char_a, char_b in zip(a, b) if char_a != char_b]
+        cost = sum(SUBSTITUTION_COSTS.get(pair, 1.0) for pair in differences)
+        if len(differences) == unit_distance:
+            shifted_bound = 2 + MIN_SUBSTITUTION_COST * (unit_distance - 2)
+            if cost <= shifted_bound:
+                return round(cost, 6)
+            if max_cost is not None and shifted_bound > max_cost:
+                return shifted_bound
+        elif unit_distance == 1:
+            # تبديل حرفين متجاورين، أو استبدالان أرخص منه (ةه/هة)
+            return round(min(cost, 1.0), 6)
+
+    # الإضافة والحذف يكلفان 1، فالخلايا البعيدة عن القطر بأكثر من الحد لا تفيد
+    band = unit_distance if max_cost is None else min(unit_distance, int(max_cost))
+    infinity = float('inf')
+    costs = SUBSTITUTION_COSTS
+    previous_previous = None
+    previous = [float(j) if j <= band else infinity for j in range(len(b) + 1)]
+
+    for i in range(1, len(a) + 1):
+        current = [infinity] * (len(b) + 1)
+        if i <= band:
+            current[0] = float(i)
+        char_a = a[i - 1]
+        row_minimum = current[0]
+
+        for j in range(max(1, i - band), min(len(b), i + band) + 1):
+            char_b = b[j - 1]
+            cost = 0.0 if char_a == char_b else costs.get((char_a, char_b), 1.0)
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and j > 1 and char_a == b[j - 2]
+                    and a[i - 2] == char_b):
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            if value < row_minimum:
+                row_minimum = value
+
+        if max_cost is not None and row_minimum > max_cost:
+            return row_minimum
+        previous_previous, previous = previous, current
+
+    return round(previous[len(b)], 6)
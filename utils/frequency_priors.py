@@ -0,0 +1,113 @@
+import math
+import threading
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# (معرف الكلمة في custom_words، الكلمة، تكرارها)
+FrequencyRow = Tuple[int, str, int]
+
+
+class FrequencyPriors:
+    """Log-frequency priors for ranking, keyed by custom_words.id.
+
+    Frequencies live in an `array('I')` indexed by word id, with a dict from
+    word to id beside it, so ranking a candidate is two lookups and never
+    touches SQLite. Priors use add-one smoothing, so words without a stored
+    frequency still get a (low) prior. `version` is bumped whenever a count
+    changes, so callers caching ranked results know when to drop them.
+    """
+
+    def __init__(self, rows: Iterable[FrequencyRow] = ()):
+        self._lock = threading.Lock()
+        self._frequencies = array('I')
+        self._ids: Dict[str, int] = {}
+        self._total = 0
+        self.version = 0
+        self.refresh(rows)
+
+    def refresh(self, rows: Iterable[FrequencyRow]) -> None:
+        """Replace every frequency (one pass over a SELECT of id, word, frequency)"""
+        frequencies = array('I')
+        ids: Dict[str, int] = {}
+        total = 0
+        for word_id, word, frequency in rows:
+            if word_id >= len(frequencies):
+                frequencies.extend([0] * (word_id + 1 - len(frequencies)))
+            frequency = max(0, int(frequency or 0))
+            frequencies[word_id] = frequency
+            ids[word] = word_id
+            total += frequency
+
+        with self._lock:
+            if (frequencies, ids) != (self._frequencies, self._ids):
+                self.version += 1
+            self._frequencies, self._ids, self._total = frequencies, ids, total
+
+    def set(self, word_id: int, word: str, frequency: int) -> None:
+        """Add or change one word's frequency in place"""
+        frequency = max(0, int(frequency or 0))
+        with self._lock:
+            previous_id = self._ids.get(word)
+            if previous_id == word_id and self._frequencies[word_id] == frequency:
+                return
+            if previous_id is not None and previous_id != word_id:
+                self._total -= self._frequencies[previous_id]
+                self._frequencies[previous_id] = 0
+            if word_id >= len(self._frequencies):
+                self._frequencies.extend([0] * (word_id + 1 - len(self._frequencies)))
+            self._total += frequency - self._frequencies[word_id]
+            self._frequencies[word_id] = frequency
+            self._ids[word] = word_id
+            self.version += 1
+
+    def discard(self, word: str) -> None:
+        """Forget a word's frequency"""
+        with self._lock:
+            word_id = self._ids.pop(word, None)
+            if word_id is not None:
+                self._total -= self._frequencies[word_id]
+                self._frequencies[word_id] = 0
+                self.version += 1
+
+    def frequency(self, word: str) -> int:
+        word_id = self._ids.get(word)
+        return self._frequencies[word_id] if word_id is not None else 0
+
+    def log_prior(self, word: str) -> float:
+        """log P(word) with add-one smoothing over the known words"""
+        return math.log((self.frequency(word) + 1) / (self._total + len(self._ids) + 1))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Size of the table"""
+        return {
+            'words': len(self._ids),
+            'total_frequency': self._total,
+            'bytes': self._frequencies.itemsize * len(self._frequencies)
+        }
+
+
+def noisy_channel_score(cost: float, log_prior: float, channel_weight: float = 4.0) -> float:
+    """log P(typed | word) + log P(word), with the channel modelled as exp(-weight * edit cost)"""
+    return log_prior - channel_weight * cost
+
+
+def best_candidate(candidates: List[Tuple[str, float]],
+                   log_prior: Optional[Callable[[str], float]] = None) -> Optional[Tuple[str, float]]:
+    """The single most probable (word, cost) pair, or None if there is none or the top two tie.
+
+    Without priors the candidates are ranked by cost alone; with uniform
+    priors the ranking and the ties are the same.
+    """
+    if log_prior is None:
+        scored = [(-cost, word, cost) for word, cost in candidates]
+    else:
+        scored = [(noisy_channel_score(cost, log_prior(word)), word, cost) for word, cost in candidates]
+    if not scored:
+        return None
+    scored.sort(key=lambda item: item[0], reverse=True)
+    if len(scored) > 1 and scored[0][0] == scored[1][0]:
+        return None
+    return scored[0][1], scored[0][2]
@@ -0,0 +1,185 @@
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+# صيغة المعجم المترجم:
+#   ترويسة: MAGIC (4 بايت) | الإصدار (uint16) | محجوز (uint16) | عدد المدخلات (uint32)
+#   جدول الإزاحات: (العدد + 1) × uint32، إزاحة كل سجل من بداية منطقة البيانات
+#   البيانات: سجلات "المفتاح\0القيمة" بترميز UTF-8 مرتبة تصاعدياً حسب بايتات المفتاح
+LEXICON_MAGIC = b'ARLX'
+LEXICON_VERSION = 1
+
+_HEADER = struct.Struct('<4sHHI')
+_OFFSET = struct.Struct('<I')
+# إزاحتا بداية السجل ونهايته متجاورتان في الجدول فتُقرآن معاً
+_OFFSET_PAIR = struct.Struct('<II')
+_SEPARATOR = b'\x00'
+
+# المعاجم المفتوحة في هذه العملية، حتى تتشارك كل النسخ نفس الـ mmap
+_open_lexicons: Dict[str, 'Lexicon'] = {}
+
+# أقصى عدد للمفاتيح المحفوظة نتائج بحثها في كل معجم (تُفرغ عند الامتلاء)
+MEMO_SIZE = 65536
+
+
+def compile_lexicon(entries: Dict[str, str], path: str) -> int:
+    """Compile a word -> correction mapping into a sorted, offset-indexed file.
+
+    The file is written to a temporary name and atomically renamed, so
+    concurrent workers never observe a half-written lexicon.
+    """
+    records = []
+    for key, value in entries.items():
+        key_bytes = key.encode('utf-8')
+        value_bytes = value.encode('utf-8')
+        if _SEPARATOR in key_bytes or _SEPARATOR in value_bytes:
+            raise ValueError(f'Lexicon entries must not contain NUL: {key!r}')
+        records.append((key_bytes, value_bytes))
+    records.sort()
+
+    offsets = [0]
+    for key_bytes, value_bytes in records:
+        offsets.append(offsets[-1] + len(key_bytes) + 1 + len(value_bytes))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(LEXICON_MAGIC, LEXICON_VERSION, 0, len(records)))
+        f.write(b''.join(_OFFSET.pack(offset) for offset in offsets))
+        for key_bytes, value_bytes in records:
+            f.write(key_bytes + _SEPARATOR + value_bytes)
+
+    os.replace(tmp_path, path)
+    return len(records)
+
+
+class Lexicon(Mapping):
+    """Read-only mapping backed by a memory-mapped compiled lexicon file.
+
+    Lookups binary-search the file in place, so opening a lexicon costs
+    almost nothing and its pages are shared between processes through the
+    OS page cache. The record index found for each distinct key is
+    memoized, so a key repeated across tokens and tiers is searched once.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != LEXICON_MAGIC or version != LEXICON_VERSION:
+            self._mm.close()
+            raise ValueError(f'Unsupported lexicon file: {path}')
+
+        self._count = count
+        self._offsets_start = _HEADER.size
+        self._data_start = self._offsets_start + (count + 1) * _OFFSET.size
+        self._memo: Dict[str, int] = {}
+
+    def _bounds(self, index: int) -> Tuple[int, int]:
+        """Absolute start/end of record `index` inside the mapping"""
+        start, end = _OFFSET_PAIR.unpack_from(self._mm, self._offsets_start + index * _OFFSET.size)
+        return self._data_start + start, self._data_start + end
+
+    def _split(self, index: int) -> Tuple[bytes, int, int]:
+        """Return the key bytes of record `index` and the span of its value"""
+        start, end = self._bounds(index)
+        separator = self._mm.find(_SEPARATOR, start, end)
+        return self._mm[start:separator], separator + 1, end
+
+    def _find(self, key: str) -> int:
+        """Record index of `key`, or -1 (memoized)"""
+        index = self._memo.get(key)
+        if index is None:
+            index = self._search(key)
+            if len(self._memo) >= MEMO_SIZE:
+                self._memo.clear()
+            self._memo[key] = index
+        return index
+
+    def _search(self, key: str) -> int:
+        """Binary search for `key`; returns the record index or -1"""
+        target = key.encode('utf-8')
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            candidate = self._split(middle)[0]
+            if candidate < target:
+                low = middle + 1
+            elif candidate > target:
+                high = middle
+            else:
+                return middle
+        return -1
+
+    def __getitem__(self, key: str) -> str:
+        if not isinstance(key, str):
+            raise KeyError(key)
+        index = self._find(key)
+        if index < 0:
+            raise KeyError(key)
+        _, value_start, value_end = self._split(index)
+        return self._mm[value_start:value_end].decode('utf-8')
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._find(key) >= 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield self._split(index)[0].decode('utf-8')
+
+    def close(self) -> None:
+        """Release the memory mapping"""
+        self._mm.close()
+
+
+def load_lexicon(path: str, source_path: Optional[Union[str, Sequence[str]]] = None,
+                 build_entries: Optional[Callable[[], Dict[str, str]]] = None) -> Lexicon:
+    """Open a compiled lexicon, (re)building it from its source when needed.
+
+    The lexicon is rebuilt when the file is missing or older than
+    `source_path` (or any of several source paths). Lexicons are opened
+    once per process and shared.
+    """
+    path = os.path.abspath(path)
+
+    if build_entries is not None:
+        source_paths = [source_path] if isinstance(source_path, str) else list(source_path or ())
+        stale = not os.path.exists(path)
+        for source in source_paths:
+            if not stale and os.path.exists(source):
+                stale = os.path.getmtime(source) > os.path.getmtime(path)
+        if stale:
+            compile_lexicon(build_entries(), path)
+            # النسخ القديمة تبقى صالحة لمن يستخدمها، وتُغلق عند تحريرها
+            _open_lexicons.pop(path, None)
+
+    lexicon = _open_lexicons.get(path)
+    if lexicon is None:
+        lexicon = Lexicon(path)
+        _open_lexicons[path] = lexicon
+    return lexicon
+
+
+# Build a lexicon from a JSON file of {"wrong": "correct"} pairs
+if __name__ == '__main__':
+    import json
+    import sys
+
+    if len(sys.argv) != 3:
+        print('Usage: python -m utils.lexicon <entries.json> <output.lex>')
+        sys.exit(1)
+
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        source_entries = json.load(f)
+
+    total = compile_lexicon(source_entries, sys.argv[2])
+    print(f'Compiled {total} entries into {sys.argv[2]}')
@@ -0,0 +1,194 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+
+class DeadlineExceeded(TimeoutError):
+    """A queued item's deadline passed before its batch ran"""
+
+
+class Histogram:
+    """Counts of observed values in power-of-two buckets (1, 2, 3-4, 5-8, ...)"""
+
+    def __init__(self):
+        self._counts: Dict[int, int] = {}
+        self.total = 0
+        self.count = 0
+
+    def observe(self, value: int) -> None:
+        bucket = 1
+        while bucket < value:
+            bucket *= 2
+        self._counts[bucket] = self._counts.get(bucket, 0) + 1
+        self.total += value
+        self.count += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        buckets = {}
+        for bucket in sorted(self._counts):
+            low = bucket // 2 + 1
+            label = str(bucket) if low >= bucket else f'{low}-{bucket}'
+            buckets[label] = self._counts[bucket]
+        return {
+            'count': self.count,
+            'mean': round(self.total / self.count, 2) if self.count else 0.0,
+            'buckets': buckets
+        }
+
+
+class MicroBatcher:
+    """Collect concurrent single items into batches for one batched call.
+
+    `submit()` queues an item and returns a Future. A worker thread takes
+    the oldest item, keeps collecting until `max_batch_size` items are
+    queued or `max_wait_ms` has passed since that item arrived, then calls
+    `process_batch(items)` once and resolves each future with its result
+    (or with the exception the call raised). Items whose deadline passed
+    while queued fail with DeadlineExceeded instead of running. The worker
+    starts on first use in each process, so a batcher survives a fork.
+    """
+
+    def __init__(self, process_batch: Callable[[List[Any]], Sequence[Any]], max_batch_size: int = 8,
+                 max_wait_ms: float = 10.0, name: str = 'batcher'):
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.name = name
+
+        self._condition = threading.Condition()
+        self._queue: Deque[Tuple[Any, Future, float, Optional[float]]] = deque()
+        self._start_lock = threading.Lock()
+        self._pid = None
+        self._closed = False
+
+        self.queue_depth = Histogram()
+        self.batch_sizes = Histogram()
+        self.batches = 0
+        self.items = 0
+        self.expired = 0
+        self.failed_batches = 0
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread in this process (again, after a fork)"""
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._condition = threading.Condition()
+            self._queue = deque()
+            threading.Thread(target=self._run, name=f'{self.name}-worker', daemon=True).start()
+            self._pid = os.getpid()
+
+    def submit(self, item: Any, deadline: Optional[float] = None) -> Future:
+        """Queue an item; `deadline` is a time.monotonic() value after which it is dropped"""
+        future = Future()
+        self._ensure_worker()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError(f'{self.name} is closed')
+            self._queue.append((item, future, time.monotonic(), deadline))
+            self.queue_depth.observe(len(self._queue))
+            self._condition.notify()
+        return future
+
+    def run(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """Submit one item and wait for its result, for at most `timeout` seconds"""
+        return self.run_many([item], timeout)[0]
+
+    def run_many(self, items: Sequence[Any], timeout: Optional[float] = None) -> List[Any]:
+        """Submit several items (they may share batches with other callers) and wait for all"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        futures = [self.submit(item, deadline) for item in items]
+        results = []
+        for future in futures:
+            remaining = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+            try:
+                results.append(future.result(remaining))
+            except TimeoutError as e:
+                for pending in futures:
+                    pending.cancel()
+                if isinstance(e, DeadlineExceeded):
+                    raise
+                raise DeadlineExceeded(f'{self.name}: no result within {timeout}s') from e
+        return results
+
+    def _next_batch(self) -> List[Tuple[Any, Future, float, Optional[float]]]:
+        """Block until a batch is due, then take it off the queue"""
+        with self._condition:
+            while not self._queue and not self._closed:
+                self._condition.wait()
+            if not self._queue:
+                return []
+            due = self._queue[0][2] + self.max_wait
+            while len(self._queue) < self.max_batch_size and not self._closed:
+                remaining = due - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            count = min(len(self._queue), self.max_batch_size)
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _run(self) -> None:
+        pid = os.getpid()
+        while pid == os.getpid():
+            batch = self._next_batch()
+            if not batch:
+                if self._closed:
+                    return
+                continue
+
+            now = time.monotonic()
+            live = []
+            for item, future, _, deadline in batch:
+                if not future.set_running_or_notify_cancel():
+                    # المستدعي ألغى الطلب (تجاوز مهلته) قبل أن يحين دوره
+                    if deadline is not None and now > deadline:
+                        self.expired += 1
+                elif deadline is not None and now > deadline:
+                    self.expired += 1
+                    future.set_exception(DeadlineExceeded(f'{self.name}: deadline passed while queued'))
+                else:
+                    live.append((item, future))
+            if not live:
+                continue
+
+            self.batches += 1
+            self.items += len(live)
+            self.batch_sizes.observe(len(live))
+            try:
+                results = self.process_batch([item for item, _ in live])
+                if len(results) != len(live):
+                    raise RuntimeError(f'{self.name}: {len(results)} results for {len(live)} items')
+            except Exception as e:
+                self.failed_batches += 1
+                for _, future in live:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(live, results):
+                future.set_result(result)
+
+    def close(self) -> None:
+        """Stop accepting items; queued items still run"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Current queue depth, throughput counters and histograms"""
+        with self._condition:
+            depth = len(self._queue)
+        return {
+            'queue_depth': depth,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'batches': self.batches,
+            'items': self.items,
+            'expired': self.expired,
+            'failed_batches': self.failed_batches,
+            'queue_depth_histogram': self.queue_depth.to_dict(),
+            'batch_size_histogram': self.batch_sizes.to_dict()
+        }
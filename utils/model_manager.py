@@ -0,0 +1,171 @@
+import gc
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# حالات دورة حياة النموذج
+UNLOADED = 'unloaded'
+LOADING = 'loading'
+READY = 'ready'
+FAILED = 'failed'
+
+
+class ModelManager:
+    """Load a heavy model in the background, and unload it when idle.
+
+    `factory` builds the model (e.g. an AdvancedArabicCorrector) and may
+    take minutes; it always runs on a background thread, so starting the
+    manager never blocks a worker. `borrow()` yields the model, or None
+    while it is not loaded, in which case callers serve the request some
+    other way; borrowing an unloaded model also starts loading it again.
+    A watcher thread unloads the model once nobody has borrowed it for
+    `idle_timeout` seconds (0 keeps it loaded). Threads do not survive a
+    fork, so a manager used in a new process starts over there.
+    """
+
+    def __init__(self, factory: Callable[[], Any], name: str = 'model', idle_timeout: float = 0):
+        self.factory = factory
+        self.name = name
+        self.idle_timeout = idle_timeout
+
+        self._lock = threading.Lock()
+        self._pid = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._model = None
+        self._state = UNLOADED
+        self._error = None
+        self._in_use = 0
+        self._last_used = time.monotonic()
+        self._started = False
+        self._ever_ready = False
+        self._load_seconds = None
+        self.loads = 0
+        self.unloads = 0
+        self._pid = os.getpid()
+
+    def _check_fork(self) -> None:
+        """Forget state inherited from the parent process (its threads are gone)"""
+        if self._pid != os.getpid():
+            self._lock = threading.Lock()
+            self._reset()
+
+    def start(self) -> None:
+        """Begin loading in the background (once per process)"""
+        self._check_fork()
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            self._start_loading_locked()
+        if self.idle_timeout > 0:
+            threading.Thread(target=self._watch_idle, name=f'{self.name}-idle', daemon=True).start()
+
+    def _start_loading_locked(self) -> None:
+        if self._state in (LOADING, READY):
+            return
+        self._state = LOADING
+        self._error = None
+        threading.Thread(target=self._load, name=f'{self.name}-loader', daemon=True).start()
+
+    def _load(self) -> None:
+        started = time.monotonic()
+        try:
+            model = self.factory()
+        except Exception as e:
+            with self._lock:
+                self._state = FAILED
+                self._error = str(e)
+            return
+        with self._lock:
+            self._model = model
+            self._state = READY
+            self._ever_ready = True
+            self._load_seconds = round(time.monotonic() - started, 2)
+            self._last_used = time.monotonic()
+            self.loads += 1
+
+    def _watch_idle(self) -> None:
+        interval = max(min(self.idle_timeout / 4, 30.0), 0.05)
+        pid = os.getpid()
+        while pid == os.getpid():
+            time.sleep(interval)
+            self.unload_if_idle()
+
+    def unload_if_idle(self) -> bool:
+        """Unload the model if it has been idle for idle_timeout seconds"""
+        with self._lock:
+            if (self._state != READY or self._in_use or self.idle_timeout <= 0
+                    or time.monotonic() - self._last_used < self.idle_timeout):
+                return False
+            model = self._model
+            self._model = None
+            self._state = UNLOADED
+            self.unloads += 1
+
+        close = getattr(model, 'close', None)
+        if close is not None:
+            close()
+        del model
+        gc.collect()
+        return True
+
+    @contextmanager
+    def borrow(self) -> Iterator[Optional[Any]]:
+        """Yield the loaded model (kept loaded while borrowed), or None"""
+        self._check_fork()
+        with self._lock:
+            model = self._model
+            if model is None:
+                if self._started and self._state == UNLOADED:
+                    # أُزيل النموذج لخموله: يُعاد تحميله في الخلفية
+                    self._start_loading_locked()
+            else:
+                self._in_use += 1
+        try:
+            yield model
+        finally:
+            if model is not None:
+                with self._lock:
+                    self._in_use -= 1
+                    self._last_used = time.monotonic()
+
+    def current(self) -> Optional[Any]:
+        """The loaded model or None, without counting as a use or starting a load"""
+        self._check_fork()
+        return self._model
+
+    @property
+    def state(self) -> str:
+        self._check_fork()
+        return self._state
+
+    @property
+    def ready(self) -> bool:
+        """Whether the model is loaded and can serve now"""
+        return self.state == READY
+
+    @property
+    def serviceable(self) -> bool:
+        """Whether the model has loaded at least once and has not failed since"""
+        self._check_fork()
+        return self._ever_ready and self._state != FAILED
+
+    def get_status(self) -> Dict[str, Any]:
+        """Lifecycle state for health and readiness reporting"""
+        self._check_fork()
+        with self._lock:
+            return {
+                'name': self.name,
+                'state': self._state,
+                'error': self._error,
+                'load_seconds': self._load_seconds,
+                'idle_seconds': round(time.monotonic() - self._last_used, 1),
+                'idle_timeout': self.idle_timeout,
+                'in_use': self._in_use,
+                'loads': self.loads,
+                'unloads': self.unloads
+            }
@@ -0,0 +1,150 @@
+import heapq
+from array import array
+from collections import Counter
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .edit_distance import damerau_levenshtein
+
+# علامتا بداية الكلمة ونهايتها، حتى تكون للكلمات القصيرة مقاطع ويُميَّز أولها وآخرها
+_START = '\x02'
+_END = '\x03'
+
+
+class NgramIndex:
+    """Character n-gram inverted index for candidate retrieval.
+
+    Each padded word is split into overlapping n-grams; every n-gram maps to
+    a posting list of word ids kept in a compact `array('I')`. A query
+    counts shared n-grams across its posting lists and keeps the
+    `max_candidates` best-overlapping words with a heap, so only those
+    reach the distance computation.
+    """
+
+    def __init__(self, words: Iterable[str] = (), n: int = 3, max_candidates: int = 300):
+        self.n = n
+        self.max_candidates = max_candidates
+
+        self._words: List[Optional[str]] = []
+        self._ids: Dict[str, int] = {}
+        self._postings: Dict[str, array] = {}
+
+        for word in words:
+            self.add(word)
+
+    def grams(self, word: str) -> Set[str]:
+        """Distinct n-grams of the padded word"""
+        padded = _START * (self.n - 1) + word + _END * (self.n - 1)
+        return {padded[index:index + self.n] for index in range(len(padded) - self.n + 1)}
+
+    def add(self, word: str) -> bool:
+        """Index a word; returns False if it is already present"""
+        if not word or word in self._ids:
+            return False
+
+        word_id = len(self._words)
+        self._words.append(word)
+        self._ids[word] = word_id
+        for gram in self.grams(word):
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array('I')
+            postings.append(word_id)
+        return True
+
+    def remove(self, word: str) -> bool:
+        """Drop a word; its postings are skipped until the next rebuild"""
+        word_id = self._ids.pop(word, None)
+        if word_id is None:
+            return False
+        self._words[word_id] = None
+        return True
+
+    def updated(self, added: Iterable[str] = (), removed: Iterable[str] = ()) -> 'NgramIndex':
+        """A new index with words added and removed, leaving this one untouched.
+
+        Posting arrays are shared, except those of the added words' n-grams,
+        which are copied before being extended. Once the slots of removed
+        words outnumber the live ones, the index is rebuilt.
+        """
+        index = NgramIndex(n=self.n, max_candidates=self.max_candidates)
+        index._words = list(self._words)
+        index._ids = dict(self._ids)
+        index._postings = dict(self._postings)
+        copied = set()
+
+        for word in removed:
+            word_id = index._ids.pop(word, None)
+            if word_id is not None:
+                index._words[word_id] = None
+        for word in added:
+            if not word or word in index._ids:
+                continue
+            word_id = len(index._words)
+            index._words.append(word)
+            index._ids[word] = word_id
+            for gram in self.grams(word):
+                if gram not in copied:
+                    index._postings[gram] = array('I', index._postings.get(gram, ()))
+                    copied.add(gram)
+                index._postings[gram].append(word_id)
+
+        if len(index._words) > 2 * len(index._ids) + 1024:
+            return NgramIndex(index._ids, n=self.n, max_candidates=self.max_candidates)
+        return index
+
+    def __contains__(self, word: object) -> bool:
+        return word in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def candidates(self, word: str, max_distance: int = 2, limit: int = None) -> List[Tuple[str, int]]:
+        """Return up to `limit` (candidate, shared n-grams) pairs, most overlap first"""
+        if limit is None:
+            limit = self.max_candidates
+
+        grams = self.grams(word)
+        postings = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not postings:
+            return []
+
+        # كل تعديل يُفسد n مقطعاً على الأكثر (n + 1 مع تبديل حرفين)، فما دون ذلك لا يمكن أن يكون ضمن المسافة
+        minimum_shared = max(1, len(grams) - (self.n + 1) * max_distance)
+        counts = Counter(chain.from_iterable(postings))
+
+        best = heapq.nlargest(
+            limit,
+            ((shared, word_id) for word_id, shared in counts.items() if shared >= minimum_shared),
+        )
+        results = []
+        for shared, word_id in best:
+            candidate = self._words[word_id]
+            if candidate is not None:
+                results.append((candidate, shared))
+        return results
+
+    def lookup(self, word: str, max_distance: Optional[int] = 2, k: int = 3) -> List[Tuple[str, int]]:
+        """Return up to k (candidate, distance) pairs, closest first"""
+        if max_distance is None:
+            max_distance = 2
+
+        results = []
+        for candidate, _ in self.candidates(word, max_distance):
+            if abs(len(candidate) - len(word)) > max_distance:
+                continue
+            distance = damerau_levenshtein(word, candidate, max_distance)
+            if distance <= max_distance:
+                results.append((candidate, distance))
+
+        results.sort(key=lambda result: (result[1], result[0]))
+        return results[:k]
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Size of the index"""
+        return {
+            'words': len(self._ids),
+            'grams': len(self._postings),
+            'postings': sum(len(ids) for ids in self._postings.values()),
+            'posting_bytes': sum(ids.itemsize * len(ids) for ids in self._postings.values())
+        }
@@ -0,0 +1,162 @@
+import math
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from typing import Iterable, List, Optional, Sequence
+
+from .tokenizer import ARABIC, iter_spans
+
+_MAGIC = b'ARLM'
+_VERSION = 1
+# magic، الإصدار، الرتبة، عدد الخانات لكل رتبة، عدد الكلمات الكلي
+_HEADER = struct.Struct('<4sHHIQ')
+
+SENTENCE_START = '<s>'
+SENTENCE_END = '</s>'
+
+# عامل التراجع إلى الرتبة الأدنى (Stupid Backoff)
+BACKOFF = 0.4
+
+_MAX_COUNT = 0xFFFFFFFF
+
+
+class HashedNgramModel:
+    """Word n-gram counts (unigram up to `order`) in a hashed count array.
+
+    Each order has `buckets` uint32 counters in one flat `array('I')`; an
+    n-gram is counted in the slot given by its crc32 (stable across
+    processes and Python versions), so collisions only ever inflate
+    counts. Scores use stupid backoff. Every counter read goes through
+    `count`, which charges one unit to an optional probe budget.
+    A loaded model maps its file read-only: the counters are shared
+    between processes through the page cache and cannot be added to.
+    """
+
+    def __init__(self, order: int = 3, buckets: int = 1 << 20):
+        self.order = order
+        self.buckets = buckets
+        self.total = 0
+        self.counts = array('I', bytes(4 * order * buckets))
+
+    def _slot(self, gram: Sequence[str]) -> int:
+        key = '\x1f'.join(gram).encode('utf-8')
+        return (len(gram) - 1) * self.buckets + zlib.crc32(key) % self.buckets
+
+    def add_sentence(self, words: Sequence[str]) -> None:
+        """Count every n-gram of a sentence, padded with sentence markers"""
+        padded = [SENTENCE_START] * (self.order - 1) + list(words) + [SENTENCE_END]
+        counts = self.counts
+        for end in range(len(padded)):
+            for n in range(1, min(self.order, end + 1) + 1):
+                slot = self._slot(padded[end - n + 1:end + 1])
+                if counts[slot] < _MAX_COUNT:
+                    counts[slot] += 1
+        self.total += len(words) + 1
+
+    def count(self, gram: Sequence[str], budget: Optional[List[int]] = None) -> int:
+        """Count of an n-gram; decrements budget[0] by one probe"""
+        if budget is not None:
+            budget[0] -= 1
+        return self.counts[self._slot(gram)]
+
+    def log_prob(self, word: str, context: Sequence[str], budget: Optional[List[int]] = None) -> float:
+        """Stupid-backoff log score of `word` after `context`"""
+        context = list(context[-(self.order - 1):]) if self.order > 1 else []
+        penalty = 0.0
+        while context:
+            numerator = self.count(context + [word], budget)
+            if numerator:
+                denominator = self.count(context, budget)
+                if denominator:
+                    return penalty + math.log(numerator / denominator)
+            penalty += math.log(BACKOFF)
+            context = context[1:]
+        return penalty + math.log((self.count([word], budget) + 1) / (self.total + self.buckets))
+
+    def save(self, path: str) -> None:
+        """Write the model atomically"""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, self.order, self.buckets, self.total))
+            f.write(self.counts)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'HashedNgramModel':
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, order, buckets, total = _HEADER.unpack_from(mapping, 0)
+        if magic != _MAGIC or version != _VERSION:
+            mapping.close()
+            raise ValueError(f'Not a language model file: {path}')
+        model = cls.__new__(cls)
+        model.order = order
+        model.buckets = buckets
+        model.total = total
+        # عرض uint32 مباشرة فوق الملف المربوط بالذاكرة، دون نسخ العدادات إلى ذاكرة العملية
+        model.counts = memoryview(mapping)[_HEADER.size:_HEADER.size + 4 * order * buckets].cast('I')
+        return model
+
+
+def choose_in_context(model: HashedNgramModel, candidates: Sequence[str], before: Sequence[str],
+                      after: Sequence[str], budget: int, margin: float = 0.0) -> Optional[int]:
+    """Index of the candidate the model prefers in context, or None.
+
+    candidates[0] is the word as written; another candidate only wins by
+    more than `margin` (log units). Each candidate is scored over the
+    n-grams it takes part in; if the `budget` of counter probes runs out
+    before every candidate is scored, the decision is abandoned (None),
+    which callers treat as "keep the word as written".
+    """
+    remaining = [budget]
+    before = list(before[-(model.order - 1):])
+    after = list(after[:model.order - 1])
+    scores = []
+
+    for candidate in candidates:
+        words = before + [candidate] + after
+        score = 0.0
+        for index in range(len(before), len(words)):
+            score += model.log_prob(words[index], words[:index], remaining)
+            if remaining[0] < 0:
+                return None
+        scores.append(score)
+
+    best = max(range(len(scores)), key=lambda index: scores[index])
+    if best != 0 and scores[best] - scores[0] <= margin:
+        return 0
+    return best
+
+
+def sentence_words(text: str) -> Iterable[List[str]]:
+    """Arabic word sequences of a text, one per line"""
+    for line in text.splitlines():
+        words = [line[core_start:core_end] for _, _, core_start, core_end, kind in iter_spans(line)
+                 if kind == ARABIC]
+        if words:
+            yield words
+
+
+# Build a model from a local corpus: python -m utils.ngram_lm corpus.txt database/language_model.lm
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build a hashed n-gram language model from a text corpus')
+    parser.add_argument('corpus', nargs='+', help='UTF-8 text files, one sentence or paragraph per line')
+    parser.add_argument('output', help='model file to write')
+    parser.add_argument('--order', type=int, default=3)
+    parser.add_argument('--buckets', type=int, default=1 << 20, help='counters per order')
+    args = parser.parse_args()
+
+    lm = HashedNgramModel(args.order, args.buckets)
+    for corpus_path in args.corpus:
+        with open(corpus_path, 'r', encoding='utf-8') as corpus:
+            for corpus_line in corpus:
+                for sentence in sentence_words(corpus_line):
+                    lm.add_sentence(sentence)
+
+    lm.save(args.output)
+    print(f'Counted {lm.total} tokens into {args.output} '
+          f'({args.order} orders x {args.buckets} buckets, {len(lm.counts) * 4} bytes)')
@@ -0,0 +1,152 @@
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .tokenizer import ARABIC
+
+# (أول مقطع، المقطع بعد الأخير، التصحيح)
+PhraseMatch = Tuple[int, int, str]
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton over word sequences.
+
+    Patterns are error keys split on whitespace, so single-word and
+    multi-word entries ("انشاء الله") are found together in one linear pass
+    over the tokens, whatever the number of patterns.
+    """
+
+    def __init__(self, tables: Iterable[Dict[str, str]] = ()):
+        # لكل حالة: انتقالاتها، رابط الفشل، والنمط المنتهي عندها (عدد الكلمات، التصحيح)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Optional[Tuple[int, str]]] = [None]
+        # أقرب حالة نهائية عبر روابط الفشل
+        self._output_link: List[int] = [0]
+        self.max_words = 0
+        self.pattern_count = 0
+
+        for table in tables:
+            for pattern, replacement in table.items():
+                self.add(pattern, replacement)
+        self.build()
+
+    def add(self, pattern: str, replacement: str) -> bool:
+        """Add a pattern; the first table that defines a key wins"""
+        words = pattern.split()
+        if not words:
+            return False
+
+        state = 0
+        for word in words:
+            next_state = self._goto[state].get(word)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+                self._output_link.append(0)
+                self._goto[state][word] = next_state
+            state = next_state
+
+        if self._output[state] is not None:
+            return False
+
+        self._output[state] = (len(words), replacement)
+        self.max_words = max(self.max_words, len(words))
+        self.pattern_count += 1
+        return True
+
+    def lookup(self, word: str) -> Optional[str]:
+        """Return the replacement of a single-word pattern, if any"""
+        state = self._goto[0].get(word)
+        if state is None or self._output[state] is None:
+            return None
+        return self._output[state][1]
+
+    def build(self) -> None:
+        """Compute failure and output links (breadth-first)"""
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            self._output_link[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for word, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(word, 0)
+
+                failed = self._fail[next_state]
+                self._output_link[next_state] = failed if self._output[failed] is not None else self._output_link[failed]
+
+    def find_all(self, words: Sequence[Optional[str]], breaks: Iterable[int] = ()) -> List[PhraseMatch]:
+        """Return every match; None words and indices in `breaks` end a phrase"""
+        breaks = set(breaks)
+        matches = []
+        state = 0
+
+        for index, word in enumerate(words):
+            if word is None:
+                state = 0
+                continue
+
+            while state and word not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(word, 0)
+
+            emit = state if self._output[state] is not None else self._output_link[state]
+            while emit:
+                length, replacement = self._output[emit]
+                matches.append((index - length + 1, index + 1, replacement))
+                emit = self._output_link[emit]
+
+            if index in breaks:
+                state = 0
+
+        return matches
+
+    def find(self, words: Sequence[Optional[str]], breaks: Iterable[int] = ()) -> List[PhraseMatch]:
+        """Return non-overlapping matches, preferring leftmost then longest"""
+        matches = self.find_all(words, breaks)
+        matches.sort(key=lambda match: (match[0], match[0] - match[1]))
+
+        selected = []
+        covered_until = 0
+        for match in matches:
+            if match[0] >= covered_until:
+                selected.append(match)
+                covered_until = match[1]
+        return selected
+
+    def match_spans(self, text: str, spans: Sequence[Tuple[int, int, int, int, int]],
+                    normalize: Optional[Callable[[str], str]] = None) -> Dict[int, PhraseMatch]:
+        """Match over tokenizer spans; returns matches keyed by first span index.
+
+        Only Arabic cores take part, and a phrase never continues across
+        punctuation attached to either of the neighbouring tokens.
+        """
+        words = []
+        breaks = []
+        for index, (start, end, core_start, core_end, kind) in enumerate(spans):
+            if kind != ARABIC:
+                words.append(None)
+                continue
+            word = text[core_start:core_end]
+            words.append(normalize(word) if normalize else word)
+            if core_end != end or (index + 1 < len(spans) and spans[index + 1][2] != spans[index + 1][0]):
+                breaks.append(index)
+
+        return {match[0]: match for match in self.find(words, breaks)}
+
+
+@lru_cache(maxsize=1)
+def default_phrase_matcher() -> PhraseMatcher:
+    """Matcher over the shared error tables, built once per process"""
+    from .arabic_common_errors import common_errors
+    return PhraseMatcher([common_errors])
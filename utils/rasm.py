@@ -0,0 +1,264 @@
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .edit_distance import arabic_weighted_distance
+from .frequency_priors import best_candidate
+
+# الهيكل غير المنقوط لكل حرف: الحروف التي لا يفرق بينها إلا النقط أو كرسي الهمزة تتحد
+_RASM = {
+    'ا': 'ا', 'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ب': 'ٮ', 'ت': 'ٮ', 'ث': 'ٮ', 'ن': 'ٮ', 'ي': 'ٮ', 'ئ': 'ٮ', 'ى': 'ٮ',
+    'ج': 'ح', 'ح': 'ح', 'خ': 'ح',
+    'د': 'د', 'ذ': 'د',
+    'ر': 'ر', 'ز': 'ر',
+    'س': 'س', 'ش': 'س',
+    'ص': 'ص', 'ض': 'ص',
+    'ط': 'ط', 'ظ': 'ط',
+    'ع': 'ع', 'غ': 'ع',
+    'ف': 'ڡ', 'ق': 'ڡ',
+    'ك': 'ك', 'ل': 'ل', 'م': 'م',
+    'ه': 'ه', 'ة': 'ه',
+    'و': 'و', 'ؤ': 'و',
+    'ء': '',
+}
+
+# في آخر الكلمة تختلف أشكال بعض الحروف: النون والقاف والياء
+_FINAL_RASM = {
+    'ن': 'ں',
+    'ي': 'ى', 'ى': 'ى', 'ئ': 'ى',
+    'ق': 'ٯ',
+}
+
+# التشكيل والتطويل لا يغيران الهيكل
+_IGNORED = set('\u0640' + ''.join(chr(code) for code in range(0x064B, 0x0660)) + '\u0670')
+
+# أقصى مسافة موزونة لتصحيح عبر الهيكل غير المنقوط يغير أكثر من حرف: تبديلان رخيصان (همزة، تاء مربوطة،
+# ألف مقصورة) على الأكثر. تغيير نقط حرف واحد يُقبل بأي كلفة، فالهيكل المشترك هو الدليل عليه
+RASM_MAX_COST = 0.4
+
+# كراسي الهمزة على الألف، والياء والألف المقصورة في آخر الكلمة: كل صيغة منها قد تكون كلمة صحيحة
+# (أنه/إنه، أن/إن، علي/على)، فالهيكل المشترك وحده لا يكفي للتصحيح بينها
+_ALEF_SEATS = frozenset('اأإآ')
+_FINAL_YEH = frozenset('يى')
+
+
+def rasm_key(word: str) -> str:
+    """The dotless letter skeleton of a word"""
+    chars = [char for char in word if char not in _IGNORED]
+    if not chars:
+        return ''
+    skeleton = [_RASM.get(char, char) for char in chars[:-1]]
+    last = chars[-1]
+    skeleton.append(_FINAL_RASM.get(last, _RASM.get(last, last)))
+    return ''.join(skeleton)
+
+
+def is_seat_variant(word: str, other: str) -> bool:
+    """Whether two words differ only in alef hamza seats, or in a final ي/ى"""
+    if len(word) != len(other) or word == other:
+        return False
+    last = len(word) - 1
+    for index, (char, other_char) in enumerate(zip(word, other)):
+        if char == other_char:
+            continue
+        if char in _ALEF_SEATS and other_char in _ALEF_SEATS:
+            continue
+        if index == last and char in _FINAL_YEH and other_char in _FINAL_YEH:
+            continue
+        return False
+    return True
+
+
+def changes_one_letter(word: str, other: str) -> bool:
+    """Whether two words of the same length differ in exactly one position"""
+    if len(word) != len(other):
+        return False
+    return sum(char != other_char for char, other_char in zip(word, other)) == 1
+
+
+def moves_written_seat(word: str, other: str) -> bool:
+    """Whether `other` is a seat variant that changes a hamza seat or final ي/ى actually written in `word`.
+
+    Only a bare alef is taken as a missing hamza; a written seat is a plausible form.
+    """
+    return is_seat_variant(word, other) and any(
+        char != other_char and char != 'ا' for char, other_char in zip(word, other))
+
+
+def build_rasm_entries(words: Iterable[str]) -> Dict[str, str]:
+    """rasm key -> newline-joined words, the compiled-lexicon form of an index"""
+    buckets: Dict[str, List[str]] = {}
+    for word in words:
+        if word:
+            buckets.setdefault(rasm_key(word), []).append(word)
+    return {key: '\n'.join(sorted(set(bucket))) for key, bucket in buckets.items()}
+
+
+class RasmIndex:
+    """Map from rasm key to the valid words that share it.
+
+    A misspelling that only moves dots or hamza seats has the same key as
+    the intended word, so its candidates cost one dictionary probe.
+
+    `base` optionally holds the bulk of the index as a read-only mapping
+    from key to newline-joined words (a compiled lexicon from
+    `build_rasm_entries`, memory-mapped and shared between processes);
+    words added or removed afterwards are kept in small overlays.
+    """
+
+    def __init__(self, words: Iterable[str] = (), base: Optional[Mapping[str, str]] = None):
+        self._base = base
+        self._keys: Dict[str, List[str]] = {}
+        self._hidden: Set[str] = set()
+        self._size = 0
+        self._base_size = None
+
+        for word in words:
+            self.add(word)
+
+    def _base_words(self, key: str) -> List[str]:
+        if self._base is None:
+            return []
+        value = self._base.get(key)
+        if not value:
+            return []
+        words = value.split('\n')
+        if self._hidden:
+            words = [word for word in words if word not in self._hidden]
+        return words
+
+    def _in_base(self, word: str, key: str) -> bool:
+        return word not in self._hidden and word in self._base_words(key)
+
+    def add(self, word: str) -> bool:
+        """Index a word; returns False if it is already present"""
+        if not word:
+            return False
+        key = rasm_key(word)
+        if word in self._hidden:
+            self._hidden.discard(word)
+            self._size += 1
+            return True
+        if self._in_base(word, key):
+            return False
+        bucket = self._keys.setdefault(key, [])
+        if word in bucket:
+            return False
+        bucket.append(word)
+        self._size += 1
+        return True
+
+    def remove(self, word: str) -> bool:
+        """Drop a word from its key"""
+        key = rasm_key(word)
+        bucket = self._keys.get(key)
+        if bucket and word in bucket:
+            bucket.remove(word)
+            if not bucket:
+                del self._keys[key]
+            self._size -= 1
+            return True
+        if self._in_base(word, key):
+            self._hidden.add(word)
+            self._size -= 1
+            return True
+        return False
+
+    def updated(self, added: Iterable[str] = (), removed: Iterable[str] = ()) -> 'RasmIndex':
+        """A new index with words added and removed, leaving this one untouched.
+
+        The base and the overlay buckets of keys that do not change are
+        shared with this index, so the cost is one shallow copy of the
+        overlay plus the touched keys.
+        """
+        index = RasmIndex(base=self._base)
+        index._keys = dict(self._keys)
+        index._hidden = set(self._hidden)
+        index._size = self._size
+        index._base_size = self._base_size
+        copied = set()
+
+        def bucket_for(key: str) -> List[str]:
+            if key not in copied:
+                index._keys[key] = list(index._keys.get(key, ()))
+                copied.add(key)
+            return index._keys[key]
+
+        for word in removed:
+            key = rasm_key(word)
+            if word in index._keys.get(key, ()):
+                bucket = bucket_for(key)
+                bucket.remove(word)
+                index._size -= 1
+                if not bucket:
+                    del index._keys[key]
+                    copied.discard(key)
+            elif index._in_base(word, key):
+                index._hidden.add(word)
+                index._size -= 1
+        for word in added:
+            key = rasm_key(word)
+            if word in index._hidden:
+                index._hidden.discard(word)
+                index._size += 1
+            elif word and not index._in_base(word, key) and word not in index._keys.get(key, ()):
+                bucket_for(key).append(word)
+                index._size += 1
+        return index
+
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str):
+            return False
+        key = rasm_key(word)
+        return word in self._keys.get(key, ()) or self._in_base(word, key)
+
+    def __len__(self) -> int:
+        if self._base is not None and self._base_size is None:
+            # عدد كلمات الأساس يُحسب مرة واحدة عند أول طلب
+            self._base_size = sum(value.count('\n') + 1 for value in self._base.values())
+        return self._size + (self._base_size or 0)
+
+    def candidates(self, token: str) -> List[Tuple[str, float]]:
+        """Other words with the token's skeleton as (word, weighted distance), closest first"""
+        key = rasm_key(token)
+        words = self._base_words(key) + self._keys.get(key, [])
+        results = [(word, arabic_weighted_distance(token, word)) for word in words if word != token]
+        results.sort(key=lambda result: (result[1], result[0]))
+        return results
+
+    def best(self, token: str, max_cost: Optional[float] = None) -> Optional[str]:
+        """The single closest word with the token's skeleton, or None if absent or ambiguous"""
+        results = self.candidates(token)
+        if not results:
+            return None
+        if len(results) > 1 and results[0][1] == results[1][1]:
+            return None
+        word, cost = results[0]
+        if max_cost is not None and cost > max_cost:
+            return None
+        return word
+
+    def correction(self, token: str, max_cost: float = RASM_MAX_COST,
+                   log_prior: Optional[Callable[[str], float]] = None) -> Optional[str]:
+        """The unambiguous skeleton sibling that fixes the token's dots, or None.
+
+        A candidate qualifies if it changes a single letter (a dot error such
+        as جمبل → جميل) or costs at most `max_cost`. Hamza-seat and final
+        ي/ى alternatives never qualify: those are often both valid words, so a
+        shared skeleton is no evidence that the token is misspelled. With
+        `log_prior`, candidates are ranked by noisy-channel score instead of
+        cost alone.
+        """
+        found = best_candidate([(word, cost) for word, cost in self.candidates(token)
+                                if not is_seat_variant(token, word)
+                                and (changes_one_letter(token, word) or max_cost is None or cost <= max_cost)],
+                               log_prior)
+        return found[0] if found is not None else None
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Size of the index"""
+        return {
+            'words': len(self),
+            'keys': (len(self._keys) if self._base is None
+                     else len(self._base) + sum(1 for key in self._keys if key not in self._base)),
+            'overlay_words': self._size
+        }
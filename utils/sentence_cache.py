@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+# عدد المفاتيح في استعلام IN واحد (حد متغيرات SQLite)
+_QUERY_CHUNK = 500
+
+
+def normalize_sentence(sentence: str) -> str:
+    """The form a sentence is cached under: NFC, single spaces, no outer whitespace"""
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFC', sentence)).strip()
+
+
+class SentenceCache:
+    """Disk-backed cache of model corrections, one row per sentence.
+
+    Keys are sha256 hashes of the normalized sentence together with a
+    namespace naming the model and its generation parameters, so changing
+    either never serves stale output. The SQLite file survives restarts and
+    is shared by all worker processes. When the stored corrections exceed
+    `max_bytes`, the least recently used rows are evicted.
+    """
+
+    def __init__(self, db_path: str, model_name: str, params: Mapping[str, Any],
+                 max_bytes: int = 64 * 1024 * 1024):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.namespace = json.dumps([model_name, dict(params)], sort_keys=True, ensure_ascii=False)
+
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        with self._lock:
+            conn = self._connect()
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS sentence_cache (
+                    key TEXT PRIMARY KEY,
+                    corrected TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_sentence_cache_last_used ON sentence_cache (last_used)')
+            conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        """This process's connection, reopened after a fork (call with the lock held)"""
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            # WAL: قراءات العمليات الأخرى لا تنتظر الكتابة
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._pid = os.getpid()
+        return self._connection
+
+    def key(self, sentence: str) -> str:
+        """Cache key of a sentence for this model and these generation parameters"""
+        data = f'{self.namespace}\n{normalize_sentence(sentence)}'
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Cached corrections for the keys that are present (marks them as recently used)"""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, str] = {}
+        if not keys:
+            return found
+        with self._lock:
+            conn = self._connect()
+            for start in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[start:start + _QUERY_CHUNK]
+                marks = ','.join('?' * len(chunk))
+                found.update(conn.execute(
+                    f'SELECT key, corrected FROM sentence_cache WHERE key IN ({marks})', chunk
+                ).fetchall())
+            if found:
+                now = time.time()
+                hit_keys = list(found)
+                for start in range(0, len(hit_keys), _QUERY_CHUNK):
+                    chunk = hit_keys[start:start + _QUERY_CHUNK]
+                    marks = ','.join('?' * len(chunk))
+                    conn.execute(f'UPDATE sentence_cache SET last_used = ? WHERE key IN ({marks})', [now] + chunk)
+                conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, str]]) -> None:
+        """Store (key, corrected) pairs, then evict old rows if over max_bytes"""
+        now = time.time()
+        rows = [(key, corrected, len(corrected.encode('utf-8')), now) for key, corrected in items]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                'INSERT OR REPLACE INTO sentence_cache (key, corrected, size, last_used) VALUES (?, ?, ?, ?)', rows
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Delete least recently used rows until the total size is within max_bytes"""
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM sentence_cache').fetchone()[0]
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+        victims: List[str] = []
+        for key, size in conn.execute('SELECT key, size FROM sentence_cache ORDER BY last_used'):
+            victims.append(key)
+            excess -= size
+            if excess <= 0:
+                break
+        for start in range(0, len(victims), _QUERY_CHUNK):
+            chunk = victims[start:start + _QUERY_CHUNK]
+            conn.execute(f'DELETE FROM sentence_cache WHERE key IN ({",".join("?" * len(chunk))})', chunk)
+        self.evictions += len(victims)
+
+    def clear(self) -> None:
+        """Drop every cached sentence"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute('DELETE FROM sentence_cache')
+            conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Stored rows and bytes, plus this process's hit rate and evictions"""
+        with self._lock:
+            entries, size = self._connect().execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM sentence_cache'
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'entries': entries,
+            'bytes': size,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions
+        }
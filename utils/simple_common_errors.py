@@ -0,0 +1,638 @@
+# -*- coding: utf-8 -*-
+
+from typing import Dict
+
+# مصدر المعاجم المترجمة لـ SimpleArabicCorrector (انظر utils/lexicon.py)،
+# ولا يُستورد أثناء التشغيل إلا عند إعادة بناء المعاجم
+
+# أخطاء لا تفسرها قواعد التنويع، فتُخزَّن كأزواج صريحة
+common_errors: Dict[str, str] = {
+    # الأخطاء الشائعة المذكورة في المثال
+    'هاذا': 'هذا',
+    'هاذه': 'هذه',
+    'علئ': 'على',
+    'الاغلاط': 'الأخطاء',
+    'اغلاط': 'أخطاء',
+
+    # همزة الوصل والقطع
+    'ايضا': 'أيضاً',
+    'اخيرا': 'أخيراً',
+    'احيانا': 'أحياناً',
+
+    # أخطاء أخرى شائعة
+    'ادريه': 'إدارية',
+    'الاه': 'آلة',
+    'هاؤلاء': 'هؤلاء',
+    'لاكن': 'لكن',
+    'لاكنه': 'لكنه',
+    'لاكنها': 'لكنها',
+    'كلمات': 'كلمات'
+}
+
+# أزواج لا تصح إلا في سياق معين (الكلمة الأصلية صحيحة في أغلب المواضع)،
+# فلا تُطبق إلا إذا رجحها نموذج اللغة على الكلمة كما كُتبت
+contextual_errors: Dict[str, str] = {
+    'يحتوي': 'يحتوى',
+    'على': 'علاء',
+    'فيه': 'فيهي',
+    'إملائية': 'املاءيه',
+    'هو': 'هوا',
+}
+
+# الصيغ الأساسية مع أسماء قواعد التنويع التي تنطبق على كل منها
+# (انظر utils/variant_rules.py)؛ الأخطاء المشتقة منها لا تُكتب يدوياً
+variant_bases: Dict[str, str] = {
+    # التاء المربوطة المكتوبة هاءً (مدرسه → مدرسة)
+    'مدرسة': 'taa_marbuta',
+    'جامعة': 'taa_marbuta',
+    'حكومة': 'taa_marbuta',
+    'شركة': 'taa_marbuta',
+    'مؤسسة': 'taa_marbuta',
+    'خطة': 'taa_marbuta',
+    'فكرة': 'taa_marbuta',
+    'طريقة': 'taa_marbuta',
+    'عملية': 'taa_marbuta',
+    'تقنية': 'taa_marbuta',
+    'نظرية': 'taa_marbuta',
+    'حقيقة': 'taa_marbuta',
+    'طبيعة': 'taa_marbuta',
+    'صناعة': 'taa_marbuta',
+    'زراعة': 'taa_marbuta',
+    'تجارة': 'taa_marbuta',
+    'ثقافة': 'taa_marbuta',
+    'لغة': 'taa_marbuta',
+    'كتابة': 'taa_marbuta',
+    'قراءة': 'taa_marbuta',
+    'دراسة': 'taa_marbuta',
+    'محاولة': 'taa_marbuta',
+    'مساعدة': 'taa_marbuta',
+    'خدمة': 'taa_marbuta',
+    'صحة': 'taa_marbuta',
+    'قوة': 'taa_marbuta',
+    'سرعة': 'taa_marbuta',
+    'دقة': 'taa_marbuta',
+    'جودة': 'taa_marbuta',
+    'كمية': 'taa_marbuta',
+    'نوعية': 'taa_marbuta',
+    'صعوبة': 'taa_marbuta',
+    'سهولة': 'taa_marbuta',
+    'حرية': 'taa_marbuta',
+    'مسؤولية': 'taa_marbuta',
+    'احتمالية': 'taa_marbuta',
+    'ضرورية': 'taa_marbuta',
+    'اختيارية': 'taa_marbuta',
+    'طوعية': 'taa_marbuta',
+    'رسمية': 'taa_marbuta',
+    'شعبية': 'taa_marbuta',
+    'عامة': 'taa_marbuta',
+    'خاصة': 'taa_marbuta',
+    'محلية': 'taa_marbuta',
+    'دولية': 'taa_marbuta',
+    'عالمية': 'taa_marbuta',
+    'وطنية': 'taa_marbuta',
+    'قومية': 'taa_marbuta',
+    'شخصية': 'taa_marbuta',
+    'فردية': 'taa_marbuta',
+    'جماعية': 'taa_marbuta',
+    'اجتماعية': 'taa_marbuta',
+    'اقتصادية': 'taa_marbuta',
+    'سياسية': 'taa_marbuta',
+    'ثقافية': 'taa_marbuta',
+    'تعليمية': 'taa_marbuta',
+    'صحية': 'taa_marbuta',
+    'بيئية': 'taa_marbuta',
+    'تكنولوجية': 'taa_marbuta',
+    'علمية': 'taa_marbuta',
+    'تطبيقية': 'taa_marbuta',
+    'ثانوية': 'taa_marbuta',
+    'فرعية': 'taa_marbuta',
+    'رئيسية': 'taa_marbuta',
+    'مركزية': 'taa_marbuta',
+    'جانبية': 'taa_marbuta',
+    'داخلية': 'taa_marbuta',
+    'خارجية': 'taa_marbuta',
+    'عسكرية': 'taa_marbuta',
+    'مدنية': 'taa_marbuta',
+    'قانونية': 'taa_marbuta',
+    'قضائية': 'taa_marbuta',
+    'تنفيذية': 'taa_marbuta',
+    'تشريعية': 'taa_marbuta',
+    'تنظيمية': 'taa_marbuta',
+    'تنسيقية': 'taa_marbuta',
+    'رقابية': 'taa_marbuta',
+    'توجيهية': 'taa_marbuta',
+    'استشارية': 'taa_marbuta',
+    'تطويرية': 'taa_marbuta',
+    'تحسينية': 'taa_marbuta',
+    'تجديدية': 'taa_marbuta',
+    'ابتكارية': 'taa_marbuta',
+    'استهلاكية': 'taa_marbuta',
+    'توزيعية': 'taa_marbuta',
+    'تسويقية': 'taa_marbuta',
+    'صحفية': 'taa_marbuta',
+    'تلفزيونية': 'taa_marbuta',
+    'رقمية': 'taa_marbuta',
+    'معلوماتية': 'taa_marbuta',
+    'حاسوبية': 'taa_marbuta',
+    'برمجية': 'taa_marbuta',
+    'نظامية': 'taa_marbuta',
+    'شبكية': 'taa_marbuta',
+    'ويبية': 'taa_marbuta',
+    'موقعية': 'taa_marbuta',
+    'منصية': 'taa_marbuta',
+    'تفاعلية': 'taa_marbuta',
+    'ديناميكية': 'taa_marbuta',
+    'استاتيكية': 'taa_marbuta',
+    'متحركة': 'taa_marbuta',
+    'ثابتة': 'taa_marbuta',
+    'مرنة': 'taa_marbuta',
+    'صلبة': 'taa_marbuta',
+    'ناعمة': 'taa_marbuta',
+    'خشنة': 'taa_marbuta',
+    'نظيفة': 'taa_marbuta',
+    'قذرة': 'taa_marbuta',
+    'جافة': 'taa_marbuta',
+    'رطبة': 'taa_marbuta',
+    'ساخنة': 'taa_marbuta',
+    'باردة': 'taa_marbuta',
+    'دافئة': 'taa_marbuta',
+    'مثلجة': 'taa_marbuta',
+    'مجمدة': 'taa_marbuta',
+    'ذائبة': 'taa_marbuta',
+    'سائلة': 'taa_marbuta',
+    'غازية': 'taa_marbuta',
+    'بخارية': 'taa_marbuta',
+    'دخانية': 'taa_marbuta',
+    'ضبابية': 'taa_marbuta',
+    'غائمة': 'taa_marbuta',
+    'مشمسة': 'taa_marbuta',
+    'ممطرة': 'taa_marbuta',
+    'عاصفة': 'taa_marbuta',
+    'هادئة': 'taa_marbuta',
+    'مضطربة': 'taa_marbuta',
+    'مستقرة': 'taa_marbuta',
+    'متقلبة': 'taa_marbuta',
+    'متغيرة': 'taa_marbuta',
+    'مستمرة': 'taa_marbuta',
+    'منقطعة': 'taa_marbuta',
+    'متواصلة': 'taa_marbuta',
+    'متصلة': 'taa_marbuta',
+    'منفصلة': 'taa_marbuta',
+    'مترابطة': 'taa_marbuta',
+    'مستقلة': 'taa_marbuta',
+    'تابعة': 'taa_marbuta',
+    'رئيسة': 'taa_marbuta',
+    'طرفية': 'taa_marbuta',
+    'حدودية': 'taa_marbuta',
+    'علوية': 'taa_marbuta',
+    'سفلية': 'taa_marbuta',
+    'يمينية': 'taa_marbuta',
+    'يسارية': 'taa_marbuta',
+    'شمالية': 'taa_marbuta',
+    'جنوبية': 'taa_marbuta',
+    'شرقية': 'taa_marbuta',
+    'غربية': 'taa_marbuta',
+    'وسطية': 'taa_marbuta',
+    'متوسطة': 'taa_marbuta',
+    'قصيرة': 'taa_marbuta',
+    'طويلة': 'taa_marbuta',
+    'عريضة': 'taa_marbuta',
+    'ضيقة': 'taa_marbuta',
+    'واسعة': 'taa_marbuta',
+    'محدودة': 'taa_marbuta',
+    'لامحدودة': 'taa_marbuta',
+    'مفتوحة': 'taa_marbuta',
+    'مغلقة': 'taa_marbuta',
+    'مقفلة': 'taa_marbuta',
+    'مفكوكة': 'taa_marbuta',
+    'مربوطة': 'taa_marbuta',
+    'محلولة': 'taa_marbuta',
+    'معقودة': 'taa_marbuta',
+    'مشدودة': 'taa_marbuta',
+    'مرخية': 'taa_marbuta',
+    'مشددة': 'taa_marbuta',
+    'مخففة': 'taa_marbuta',
+    'مكثفة': 'taa_marbuta',
+    'مركزة': 'taa_marbuta',
+    'موزعة': 'taa_marbuta',
+    'منتشرة': 'taa_marbuta',
+    'مجمعة': 'taa_marbuta',
+    'متفرقة': 'taa_marbuta',
+    'متجمعة': 'taa_marbuta',
+    'متباعدة': 'taa_marbuta',
+    'متقاربة': 'taa_marbuta',
+    'متلاصقة': 'taa_marbuta',
+    'متماسكة': 'taa_marbuta',
+    'متفككة': 'taa_marbuta',
+    'مكسورة': 'taa_marbuta',
+    'سليمة': 'taa_marbuta',
+    'تالفة': 'taa_marbuta',
+    'معطوبة': 'taa_marbuta',
+    'صحيحة': 'taa_marbuta',
+    'خاطئة': 'taa_marbuta',
+    'صوابة': 'taa_marbuta',
+    'خطأة': 'taa_marbuta',
+    'دقيقة': 'taa_marbuta',
+    'تقريبية': 'taa_marbuta',
+    'تفصيلية': 'taa_marbuta',
+    'كلية': 'taa_marbuta',
+    'جزئية': 'taa_marbuta',
+    'شاملة': 'taa_marbuta',
+    'جمعية': 'taa_marbuta',
+    'فرقة': 'taa_marbuta',
+    'مجموعة': 'taa_marbuta',
+    'طائفة': 'taa_marbuta',
+    'فئة': 'taa_marbuta',
+    'شريحة': 'taa_marbuta',
+    'طبقة': 'taa_marbuta',
+    'درجة': 'taa_marbuta',
+    'مرتبة': 'taa_marbuta',
+    'منزلة': 'taa_marbuta',
+    'مكانة': 'taa_marbuta',
+    'قيمة': 'taa_marbuta',
+    'ضرورة': 'taa_marbuta',
+    'حاجة': 'taa_marbuta',
+    'رغبة': 'taa_marbuta',
+    'نية': 'taa_marbuta',
+    'قصدة': 'taa_marbuta',
+    'هدفة': 'taa_marbuta',
+    'غاية': 'taa_marbuta',
+    'مقصدة': 'taa_marbuta',
+    'وجهة': 'taa_marbuta',
+    'اتجاهة': 'taa_marbuta',
+    'ناحية': 'taa_marbuta',
+    'جهة': 'taa_marbuta',
+    'زاوية': 'taa_marbuta',
+    'نقطة': 'taa_marbuta',
+    'محطة': 'taa_marbuta',
+    'مرحلة': 'taa_marbuta',
+    'خطوة': 'taa_marbuta',
+    'وسيلة': 'taa_marbuta',
+    'جهازة': 'taa_marbuta',
+    'معدة': 'taa_marbuta',
+    'نحوية': 'taa_marbuta',
+    'لغوية': 'taa_marbuta',
+    'مفيدة': 'taa_marbuta',
+    'جميلة': 'taa_marbuta',
+    'ممتازة': 'taa_marbuta',
+    'جيدة': 'taa_marbuta',
+    'سيئة': 'taa_marbuta',
+    'ضعيفة': 'taa_marbuta',
+    'قوية': 'taa_marbuta',
+    'كبيرة': 'taa_marbuta',
+    'صغيرة': 'taa_marbuta',
+    'حديثة': 'taa_marbuta',
+    'قديمة': 'taa_marbuta',
+    'جديدة': 'taa_marbuta',
+    'مستعملة': 'taa_marbuta',
+    'فوضوية': 'taa_marbuta',
+    'منظمة': 'taa_marbuta',
+    'مبعثرة': 'taa_marbuta',
+    'متنوعة': 'taa_marbuta',
+    'موحدة': 'taa_marbuta',
+    'مختلفة': 'taa_marbuta',
+    'متشابهة': 'taa_marbuta',
+    'متطابقة': 'taa_marbuta',
+    'متناقضة': 'taa_marbuta',
+    'متوافقة': 'taa_marbuta',
+    'متضاربة': 'taa_marbuta',
+    'متكاملة': 'taa_marbuta',
+    'ناقصة': 'taa_marbuta',
+    'كاملة': 'taa_marbuta',
+    'تامة': 'taa_marbuta',
+    'مكتملة': 'taa_marbuta',
+    'مبتورة': 'taa_marbuta',
+    'مقطوعة': 'taa_marbuta',
+    'مهمة': 'taa_marbuta',
+    'حيوية': 'taa_marbuta',
+    'جوهرية': 'taa_marbuta',
+    'محورية': 'taa_marbuta',
+    'ابتدائية': 'taa_marbuta',
+    'تمهيدية': 'taa_marbuta',
+    'تحضيرية': 'taa_marbuta',
+    'متقدمة': 'taa_marbuta',
+    'متأخرة': 'taa_marbuta',
+    'عصرية': 'taa_marbuta',
+    'معاصرة': 'taa_marbuta',
+    'تقليدية': 'taa_marbuta',
+    'كلاسيكية': 'taa_marbuta',
+    'عتيقة': 'taa_marbuta',
+    'تاريخية': 'taa_marbuta',
+    'تراثية': 'taa_marbuta',
+    'فولكلورية': 'taa_marbuta',
+    'حضارية': 'taa_marbuta',
+    'بدوية': 'taa_marbuta',
+    'ريفية': 'taa_marbuta',
+    'حضرية': 'taa_marbuta',
+    'قروية': 'taa_marbuta',
+    'مدينية': 'taa_marbuta',
+    'كونية': 'taa_marbuta',
+    'شمولية': 'taa_marbuta',
+    'مجتمعية': 'taa_marbuta',
+    'بشرية': 'taa_marbuta',
+    'طبيعية': 'taa_marbuta',
+    'بيولوجية': 'taa_marbuta',
+    'كيميائية': 'taa_marbuta',
+    'فيزيائية': 'taa_marbuta',
+    'رياضية': 'taa_marbuta',
+    'هندسية': 'taa_marbuta',
+    'معمارية': 'taa_marbuta',
+    'تصميمية': 'taa_marbuta',
+    'فنية': 'taa_marbuta',
+    'جمالية': 'taa_marbuta',
+    'اختراعية': 'taa_marbuta',
+    'اكتشافية': 'taa_marbuta',
+    'استكشافية': 'taa_marbuta',
+    'بحثية': 'taa_marbuta',
+    'دراسية': 'taa_marbuta',
+    'تربوية': 'taa_marbuta',
+    'جامعية': 'taa_marbuta',
+    'مدرسية': 'taa_marbuta',
+    'تدريسية': 'taa_marbuta',
+    'تدريبية': 'taa_marbuta',
+    'تأهيلية': 'taa_marbuta',
+    'تحديثية': 'taa_marbuta',
+    'فكرية': 'taa_marbuta',
+    'ذهنية': 'taa_marbuta',
+    'عقلية': 'taa_marbuta',
+    'فلسفية': 'taa_marbuta',
+    'منطقية': 'taa_marbuta',
+    'عقلانية': 'taa_marbuta',
+    'منهجية': 'taa_marbuta',
+    'موضوعية': 'taa_marbuta',
+    'ذاتية': 'taa_marbuta',
+    'مشتركة': 'taa_marbuta',
+    'تعاونية': 'taa_marbuta',
+    'تشاركية': 'taa_marbuta',
+    'نشطة': 'taa_marbuta',
+    'فعالة': 'taa_marbuta',
+    'مؤثرة': 'taa_marbuta',
+    'معتدلة': 'taa_marbuta',
+    'متطرفة': 'taa_marbuta',
+    'متشددة': 'taa_marbuta',
+    'متساهلة': 'taa_marbuta',
+    'قاسية': 'taa_marbuta',
+    'لينة': 'taa_marbuta',
+    'طاهرة': 'taa_marbuta',
+    'نجسة': 'taa_marbuta',
+    'مقدسة': 'taa_marbuta',
+    'مباركة': 'taa_marbuta',
+    'شريفة': 'taa_marbuta',
+    'كريمة': 'taa_marbuta',
+    'نبيلة': 'taa_marbuta',
+    'عظيمة': 'taa_marbuta',
+    'جليلة': 'taa_marbuta',
+    'رفيعة': 'taa_marbuta',
+    'عالية': 'taa_marbuta',
+    'سامقة': 'taa_marbuta',
+    'شامخة': 'taa_marbuta',
+    'مرتفعة': 'taa_marbuta',
+    'منخفضة': 'taa_marbuta',
+    'عميقة': 'taa_marbuta',
+    'ضحلة': 'taa_marbuta',
+    'سطحية': 'taa_marbuta',
+    'عمقية': 'taa_marbuta',
+    'جذرية': 'taa_marbuta',
+    'حقيقية': 'taa_marbuta',
+    'واقعية': 'taa_marbuta',
+    'واقعة': 'taa_marbuta',
+    'حادثة': 'taa_marbuta',
+    'قصة': 'taa_marbuta',
+    'حكاية': 'taa_marbuta',
+    'رواية': 'taa_marbuta',
+    'خرافة': 'taa_marbuta',
+    'خيالية': 'taa_marbuta',
+    'وهمية': 'taa_marbuta',
+    'تخيلية': 'taa_marbuta',
+    'افتراضية': 'taa_marbuta',
+    'استخدامية': 'taa_marbuta',
+    'وظيفية': 'taa_marbuta',
+    'مالية': 'taa_marbuta',
+    'نقدية': 'taa_marbuta',
+    'مصرفية': 'taa_marbuta',
+    'بنكية': 'taa_marbuta',
+    'تجارية': 'taa_marbuta',
+    'صناعية': 'taa_marbuta',
+    'زراعية': 'taa_marbuta',
+    'خدمية': 'taa_marbuta',
+    'سياحية': 'taa_marbuta',
+    'فندقية': 'taa_marbuta',
+    'مطعمية': 'taa_marbuta',
+    'غذائية': 'taa_marbuta',
+    'طبية': 'taa_marbuta',
+    'علاجية': 'taa_marbuta',
+    'دوائية': 'taa_marbuta',
+    'عشبية': 'taa_marbuta',
+    'نباتية': 'taa_marbuta',
+    'حيوانية': 'taa_marbuta',
+    'بحرية': 'taa_marbuta',
+    'برية': 'taa_marbuta',
+    'جوية': 'taa_marbuta',
+    'فضائية': 'taa_marbuta',
+    'سماوية': 'taa_marbuta',
+    'شرطية': 'taa_marbuta',
+    'لطيفة': 'taa_marbuta',
+
+    # التاء المربوطة المكتوبة واواً (المدرسو → المدرسة)
+    'المدرسة': 'taa_marbuta_waw',
+    'المرأة': 'taa_marbuta_waw',
+    'الفئة': 'taa_marbuta_waw',
+    'الشريحة': 'taa_marbuta_waw',
+    'الطبقة': 'taa_marbuta_waw',
+    'الدرجة': 'taa_marbuta_waw',
+    'القيمة': 'taa_marbuta_waw',
+    'الضرورة': 'taa_marbuta_waw',
+    'الحاجة': 'taa_marbuta_waw',
+    'الرغبة': 'taa_marbuta_waw',
+    'النية': 'taa_marbuta_waw',
+    'الغاية': 'taa_marbuta_waw',
+    'الناحية': 'taa_marbuta_waw',
+    'الجهة': 'taa_marbuta_waw',
+    'الزاوية': 'taa_marbuta_waw',
+    'النقطة': 'taa_marbuta_waw',
+    'المحطة': 'taa_marbuta_waw',
+    'المرحلة': 'taa_marbuta_waw',
+    'الخطوة': 'taa_marbuta_waw',
+    'العملية': 'taa_marbuta_waw',
+    'الطريقة': 'taa_marbuta_waw',
+    'الوسيلة': 'taa_marbuta_waw',
+
+    # واو زائدة في آخر الكلمة (الكتابو → الكتاب)
+    'القمر': 'trailing_waw',
+    'الكتاب': 'trailing_waw',
+    'الطالب': 'trailing_waw',
+    'المعلم': 'trailing_waw',
+    'البيت': 'trailing_waw',
+    'الولد': 'trailing_waw',
+    'البنت': 'trailing_waw',
+    'الرجل': 'trailing_waw',
+    'الطفل': 'trailing_waw',
+    'الصديق': 'trailing_waw',
+    'الأستاذ': 'trailing_waw',
+    'الدكتور': 'trailing_waw',
+    'المهندس': 'trailing_waw',
+    'الطبيب': 'trailing_waw',
+    'المحامي': 'trailing_waw',
+    'التاجر': 'trailing_waw',
+    'العامل': 'trailing_waw',
+    'الموظف': 'trailing_waw',
+    'الطيار': 'trailing_waw',
+    'السائق': 'trailing_waw',
+    'الحارس': 'trailing_waw',
+    'البائع': 'trailing_waw',
+    'المشتري': 'trailing_waw',
+    'الزائر': 'trailing_waw',
+    'الضيف': 'trailing_waw',
+    'الجار': 'trailing_waw',
+    'القريب': 'trailing_waw',
+    'البعيد': 'trailing_waw',
+    'الجديد': 'trailing_waw',
+    'القديم': 'trailing_waw',
+    'الكبير': 'trailing_waw',
+    'الصغير': 'trailing_waw',
+    'الطويل': 'trailing_waw',
+    'القصير': 'trailing_waw',
+    'العريض': 'trailing_waw',
+    'الضيق': 'trailing_waw',
+    'الواسع': 'trailing_waw',
+    'المحدود': 'trailing_waw',
+    'المفتوح': 'trailing_waw',
+    'المغلق': 'trailing_waw',
+    'المقفل': 'trailing_waw',
+    'المفكوك': 'trailing_waw',
+    'المربوط': 'trailing_waw',
+    'المحلول': 'trailing_waw',
+    'المعقود': 'trailing_waw',
+    'المشدود': 'trailing_waw',
+    'المرخي': 'trailing_waw',
+    'المشدد': 'trailing_waw',
+    'المخفف': 'trailing_waw',
+    'المكثف': 'trailing_waw',
+    'المركز': 'trailing_waw',
+    'الموزع': 'trailing_waw',
+    'المنتشر': 'trailing_waw',
+    'المجمع': 'trailing_waw',
+    'المتفرق': 'trailing_waw',
+    'المتجمع': 'trailing_waw',
+    'المتباعد': 'trailing_waw',
+    'المتقارب': 'trailing_waw',
+    'المتلاصق': 'trailing_waw',
+    'المنفصل': 'trailing_waw',
+    'المتصل': 'trailing_waw',
+    'المترابط': 'trailing_waw',
+    'المتماسك': 'trailing_waw',
+    'المتفكك': 'trailing_waw',
+    'المكسور': 'trailing_waw',
+    'السليم': 'trailing_waw',
+    'التالف': 'trailing_waw',
+    'المعطوب': 'trailing_waw',
+    'الصحيح': 'trailing_waw',
+    'الخاطئ': 'trailing_waw',
+    'الصواب': 'trailing_waw',
+    'الخطأ': 'trailing_waw',
+    'الدقيق': 'trailing_waw',
+    'التقريبي': 'trailing_waw',
+    'التفصيلي': 'trailing_waw',
+    'الكلي': 'trailing_waw',
+    'الجزئي': 'trailing_waw',
+    'الشامل': 'trailing_waw',
+    'العام': 'trailing_waw',
+    'الخاص': 'trailing_waw',
+    'الشخصي': 'trailing_waw',
+    'الفردي': 'trailing_waw',
+    'الجماعي': 'trailing_waw',
+    'الجمعي': 'trailing_waw',
+    'الفرق': 'trailing_waw',
+    'المجموع': 'trailing_waw',
+    'الطائف': 'trailing_waw',
+    'المرتب': 'trailing_waw',
+    'المنزل': 'trailing_waw',
+    'المكان': 'trailing_waw',
+    'القصد': 'trailing_waw',
+    'الهدف': 'trailing_waw',
+    'المقصد': 'trailing_waw',
+    'الوجه': 'trailing_waw',
+    'الاتجاه': 'trailing_waw',
+    'الجهاز': 'trailing_waw',
+    'المعد': 'trailing_waw',
+
+    # حرف علة أو همزة زائدة في آخر الكلمة (رائعو، رائعه، رائعئ → رائع)
+    'الشمس': 'trailing_letter',
+    'رائع': 'trailing_letter',
+    'شمس': 'trailing_letter',
+    'الجو': 'trailing_letter',
+    'جو': 'trailing_letter',
+    'مشرق': 'trailing_letter',
+    'والجو': 'trailing_letter',
+
+    # همزة القطع أو المد المكتوبة ألفاً (اذا → إذا، الاجمالي → الإجمالي)
+    'أخطاء': 'hamza_alef',
+    'إذا': 'hamza_alef',
+    'إلى': 'hamza_alef',
+    'إنه': 'hamza_alef',
+    'إنها': 'hamza_alef',
+    'أنت': 'hamza_alef',
+    'أنا': 'hamza_alef',
+    'أين': 'hamza_alef',
+    'أكثر': 'hamza_alef',
+    'أفضل': 'hamza_alef',
+    'أول': 'hamza_alef',
+    'آخر': 'hamza_alef',
+    'أخرى': 'hamza_alef',
+    'أساسي': 'hamza_alef',
+    'أمام': 'hamza_alef',
+    'أثناء': 'hamza_alef',
+    'أحد': 'hamza_alef',
+    'أجل': 'hamza_alef',
+    'إذن': 'hamza_alef',
+    'إلا': 'hamza_alef',
+    'أن': 'hamza_alef',
+    'أو': 'hamza_alef',
+    'أم': 'hamza_alef',
+    'أي': 'hamza_alef',
+    'أيها': 'hamza_alef',
+    'أيتها': 'hamza_alef',
+    'أولئك': 'hamza_alef',
+
+    # همزة القطع مع التاء المربوطة المكتوبة هاءً
+    'الإملائية': 'taa_marbuta hamza_alef',
+    'إملائية': 'taa_marbuta hamza_alef',
+    'أساسية': 'taa_marbuta hamza_alef',
+    'أهمية': 'taa_marbuta hamza_alef',
+    'إمكانية': 'taa_marbuta hamza_alef',
+    'إجبارية': 'taa_marbuta hamza_alef',
+    'إقليمية': 'taa_marbuta hamza_alef',
+    'أمنية': 'taa_marbuta hamza_alef',
+    'إشرافية': 'taa_marbuta hamza_alef',
+    'إصلاحية': 'taa_marbuta hamza_alef',
+    'إبداعية': 'taa_marbuta hamza_alef',
+    'إنتاجية': 'taa_marbuta hamza_alef',
+    'إعلانية': 'taa_marbuta hamza_alef',
+    'إعلامية': 'taa_marbuta hamza_alef',
+    'إذاعية': 'taa_marbuta hamza_alef',
+    'إلكترونية': 'taa_marbuta hamza_alef',
+    'إنترنتية': 'taa_marbuta hamza_alef',
+    'إجمالية': 'taa_marbuta hamza_alef',
+    'إرادة': 'taa_marbuta hamza_alef',
+    'إجراءة': 'taa_marbuta hamza_alef',
+    'أداة': 'taa_marbuta hamza_alef',
+    'إضافية': 'taa_marbuta hamza_alef',
+    'أولية': 'taa_marbuta hamza_alef',
+    'إعدادية': 'taa_marbuta hamza_alef',
+    'أثرية': 'taa_marbuta hamza_alef',
+    'إنسانية': 'taa_marbuta hamza_alef',
+    'آدمية': 'taa_marbuta hamza_alef',
+    'أكاديمية': 'taa_marbuta hamza_alef',
+    'أسطورة': 'taa_marbuta hamza_alef',
+    'أرضية': 'taa_marbuta hamza_alef',
+
+    # همزة القطع مع التاء المربوطة المكتوبة واواً
+    'الأهمية': 'taa_marbuta_waw hamza_alef',
+    'الإرادة': 'taa_marbuta_waw hamza_alef',
+    'الأداة': 'taa_marbuta_waw hamza_alef',
+    'الآلة': 'taa_marbuta_waw hamza_alef',
+
+    # همزة القطع مع واو زائدة في آخر الكلمة
+    'الإجمالي': 'trailing_waw hamza_alef',
+    'الإجراء': 'trailing_waw hamza_alef'
+}
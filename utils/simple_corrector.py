@@ -1,1021 +1,296 @@
-import re
-from typing import List, Dict, Any, Tuple
+import itertools
+import os
+from collections import Counter
+from types import MappingProxyType
+from typing import List, Dict, Any, FrozenSet, Iterable, Iterator, Mapping, Optional
+
+from .affixes import AffixSegmenter, reattach
+from .confusion_sets import CONSERVATIVE_CONFUSION_SETS, ConfusionGenerator
+from .frequency_priors import FrequencyPriors
+from .lexicon import load_lexicon
+from .ngram_lm import HashedNgramModel, choose_in_context
+from .phrase_matcher import default_phrase_matcher
+from .rasm import RasmIndex, build_rasm_entries
+from .snapshot import SnapshotHolder
+from .token_cache import MISSING, TokenCache
+from .tokenizer import ARABIC, splice, tokenize
+from .variant_rules import VariantResolver
+
+_UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# المعجم المترجم يُبنى تلقائياً من utils/simple_common_errors.py عند غيابه أو تقادمه
+COMMON_ERRORS_SOURCE = os.path.join(_UTILS_DIR, 'simple_common_errors.py')
+COMMON_ERRORS_LEXICON = os.path.join(os.path.dirname(_UTILS_DIR), 'database', 'common_errors.lex')
+VARIANT_BASES_LEXICON = os.path.join(os.path.dirname(_UTILS_DIR), 'database', 'variant_bases.lex')
+VOCABULARY_LEXICON = os.path.join(os.path.dirname(_UTILS_DIR), 'database', 'vocabulary.lex')
+CONTEXTUAL_ERRORS_LEXICON = os.path.join(os.path.dirname(_UTILS_DIR), 'database', 'contextual_errors.lex')
+
+# فهرس الرسم للمفردات مترجم أيضاً (يُعاد بناؤه إذا تغيرت المفردات أو جدول الرسم في utils/rasm.py)
+RASM_SOURCE = os.path.join(_UTILS_DIR, 'rasm.py')
+RASM_LEXICON = os.path.join(os.path.dirname(_UTILS_DIR), 'database', 'rasm.lex')
+
+# نموذج اللغة اختياري، يُبنى من مدونة محلية: python -m utils.ngram_lm corpus.txt database/language_model.lm
+LANGUAGE_MODEL = os.path.join(os.path.dirname(_UTILS_DIR), 'database', 'language_model.lm')
+
+# أقصى عدد لقراءات عدادات نموذج اللغة لكل كلمة؛ عند تجاوزه تبقى الكلمة كما كُتبت
+LM_PROBE_BUDGET = 48
+
+
+def _load_common_errors_source() -> Dict[str, str]:
+    """Import the source table only when the compiled lexicon must be rebuilt"""
+    from .simple_common_errors import common_errors
+    return common_errors
+
+
+def _load_variant_bases_source() -> Dict[str, str]:
+    """Import the base forms only when the compiled lexicon must be rebuilt"""
+    from .simple_common_errors import variant_bases
+    return variant_bases
+
+
+def _load_contextual_errors_source() -> Dict[str, str]:
+    """Import the context-dependent pairs only when the compiled lexicon must be rebuilt"""
+    from .simple_common_errors import contextual_errors
+    return contextual_errors
+
+
+def _load_vocabulary_source() -> Dict[str, str]:
+    """Known-correct words: the single-word correction targets and the variant bases"""
+    from .simple_common_errors import common_errors, variant_bases
+    words = {target for target in common_errors.values() if ' ' not in target}
+    words.update(variant_bases)
+    return {word: '' for word in words}
+
+
+def _load_rasm_source() -> Dict[str, str]:
+    """rasm key -> known words sharing it, over the vocabulary"""
+    return build_rasm_entries(_load_vocabulary_source())
+
+
+class _WordSets:
+    """Membership in the compiled vocabulary or a set of database words"""
+
+    def __init__(self, vocabulary, known_words: FrozenSet[str]):
+        self._vocabulary = vocabulary
+        self._known_words = known_words
+
+    def __contains__(self, word: object) -> bool:
+        return word in self._vocabulary or word in self._known_words
+
+
+class DictionarySnapshot:
+    """The corrector's database-backed state at one version; never mutated once built"""
+
+    def __init__(self, version: int, vocabulary, custom_words: Mapping[str, str],
+                 known_words: FrozenSet[str], rasm_index: RasmIndex):
+        self.version = version
+        self.vocabulary = vocabulary
+        self.custom_words = custom_words
+        self.known_words = known_words
+        self.rasm_index = rasm_index
+        self.confusion_generator = ConfusionGenerator(_WordSets(vocabulary, known_words),
+                                                      CONSERVATIVE_CONFUSION_SETS)
+
+    def replace(self, version: int, **changes: Any) -> 'DictionarySnapshot':
+        """A new snapshot with some fields replaced and the rest shared"""
+        fields = {
+            'vocabulary': self.vocabulary,
+            'custom_words': self.custom_words,
+            'known_words': self.known_words,
+            'rasm_index': self.rasm_index
+        }
+        fields.update(changes)
+        return DictionarySnapshot(version, **fields)
+
 
 class SimpleArabicCorrector:
     """Advanced Arabic text corrector with enhanced functionality"""
     
-    def __init__(self):
-        # قاموس شامل للأخطاء الشائعة في اللغة العربية
-        self.common_errors = {
-            # الأخطاء الشائعة المذكورة في المثال
-            'هاذا': 'هذا',
-            'هاذه': 'هذه',
-            'علئ': 'على',
-            'الاغلاط': 'الأخطاء',
-            'الاملائيه': 'الإملائية',
-            'الاملائية': 'الإملائية',
-            'اغلاط': 'أخطاء',
-            'يحتوي': 'يحتوى',
-            'على': 'علاء',
-            'فيه': 'فيهي',
-            'إملائية': 'املاءيه',
-            'هو': 'هوا',
-            'املائيه': 'إملائية',
-            'املائية': 'إملائية',
-            'الشمسو': 'الشمس',
-            'القمرو': 'القمر',
-            'الكتابو': 'الكتاب',
-            'المدرسو': 'المدرسة',
-            'الطالبو': 'الطالب',
-            'المعلمو': 'المعلم',
-            'البيتو': 'البيت',
-            'الولدو': 'الولد',
-            'البنتو': 'البنت',
-            'الرجلو': 'الرجل',
-            'المرأو': 'المرأة',
-            'الطفلو': 'الطفل',
-            'الصديقو': 'الصديق',
-            'الأستاذو': 'الأستاذ',
-            'الدكتورو': 'الدكتور',
-            'المهندسو': 'المهندس',
-            'الطبيبو': 'الطبيب',
-            'المحاميو': 'المحامي',
-            'التاجرو': 'التاجر',
-            'العاملو': 'العامل',
-            'الموظفو': 'الموظف',
-            'الطيارو': 'الطيار',
-            'السائقو': 'السائق',
-            'الحارسو': 'الحارس',
-            'البائعو': 'البائع',
-            'المشتريو': 'المشتري',
-            'الزائرو': 'الزائر',
-            'الضيفو': 'الضيف',
-            'الجارو': 'الجار',
-            'القريبو': 'القريب',
-            'البعيدو': 'البعيد',
-            'الجديدو': 'الجديد',
-            'القديمو': 'القديم',
-            'الكبيرو': 'الكبير',
-            'الصغيرو': 'الصغير',
-            'الطويلو': 'الطويل',
-            'القصيرو': 'القصير',
-            'العريضو': 'العريض',
-            'الضيقو': 'الضيق',
-            'الواسعو': 'الواسع',
-            'المحدودو': 'المحدود',
-            'المفتوحو': 'المفتوح',
-            'المغلقو': 'المغلق',
-            'المقفلو': 'المقفل',
-            'المفكوكو': 'المفكوك',
-            'المربوطو': 'المربوط',
-            'المحلولو': 'المحلول',
-            'المعقودو': 'المعقود',
-            'المشدودو': 'المشدود',
-            'المرخيو': 'المرخي',
-            'المشددو': 'المشدد',
-            'المخففو': 'المخفف',
-            'المكثفو': 'المكثف',
-            'المركزو': 'المركز',
-            'الموزعو': 'الموزع',
-            'المنتشرو': 'المنتشر',
-            'المجمعو': 'المجمع',
-            'المتفرقو': 'المتفرق',
-            'المتجمعو': 'المتجمع',
-            'المتباعدو': 'المتباعد',
-            'المتقاربو': 'المتقارب',
-            'المتلاصقو': 'المتلاصق',
-            'المنفصلو': 'المنفصل',
-            'المتصلو': 'المتصل',
-            'المترابطو': 'المترابط',
-            'المتماسكو': 'المتماسك',
-            'المتفككو': 'المتفكك',
-            'المكسورو': 'المكسور',
-            'السليمو': 'السليم',
-            'التالفو': 'التالف',
-            'المعطوبو': 'المعطوب',
-            'الصحيحو': 'الصحيح',
-            'الخاطئو': 'الخاطئ',
-            'الصوابو': 'الصواب',
-            'الخطأو': 'الخطأ',
-            'الدقيقو': 'الدقيق',
-            'التقريبيو': 'التقريبي',
-            'التفصيليو': 'التفصيلي',
-            'الاجماليو': 'الإجمالي',
-            'الكليو': 'الكلي',
-            'الجزئيو': 'الجزئي',
-            'الشاملو': 'الشامل',
-            'المحدودو': 'المحدود',
-            'العامو': 'العام',
-            'الخاصو': 'الخاص',
-            'الشخصيو': 'الشخصي',
-            'الفرديو': 'الفردي',
-            'الجماعيو': 'الجماعي',
-            'الجمعيو': 'الجمعي',
-            'الفرقو': 'الفرق',
-            'المجموعو': 'المجموع',
-            'الطائفو': 'الطائف',
-            'الفئو': 'الفئة',
-            'الشريحو': 'الشريحة',
-            'الطبقو': 'الطبقة',
-            'الدرجو': 'الدرجة',
-            'المرتبو': 'المرتب',
-            'المنزلو': 'المنزل',
-            'المكانو': 'المكان',
-            'القيمو': 'القيمة',
-            'الاهميو': 'الأهمية',
-            'الضرورو': 'الضرورة',
-            'الحاجو': 'الحاجة',
-            'الرغبو': 'الرغبة',
-            'الارادو': 'الإرادة',
-            'النيو': 'النية',
-            'القصدو': 'القصد',
-            'الهدفو': 'الهدف',
-            'الغايو': 'الغاية',
-            'المقصدو': 'المقصد',
-            'الوجهو': 'الوجه',
-            'الاتجاهو': 'الاتجاه',
-            'الناحيو': 'الناحية',
-            'الجهو': 'الجهة',
-            'الزاويو': 'الزاوية',
-            'النقطو': 'النقطة',
-            'المحطو': 'المحطة',
-            'المرحلو': 'المرحلة',
-            'الخطوو': 'الخطوة',
-            'العمليو': 'العملية',
-            'الاجراءو': 'الإجراء',
-            'الطريقو': 'الطريقة',
-            'الوسيلو': 'الوسيلة',
-            'الاداو': 'الأداة',
-            'الالو': 'الآلة',
-            'الجهازو': 'الجهاز',
-            'المعدو': 'المعد',
-            
-            # همزة الوصل والقطع
-            'اذا': 'إذا',
-            'الى': 'إلى',
-            'انه': 'إنه',
-            'انها': 'إنها',
-            'انت': 'أنت',
-            'انا': 'أنا',
-            'اين': 'أين',
-            'ايضا': 'أيضاً',
-            'اكثر': 'أكثر',
-            'افضل': 'أفضل',
-            'اول': 'أول',
-            'اخر': 'آخر',
-            'اخرى': 'أخرى',
-            'اخيرا': 'أخيراً',
-            'اساسي': 'أساسي',
-            'اساسية': 'أساسية',
-            'امام': 'أمام',
-            'اثناء': 'أثناء',
-            'احد': 'أحد',
-            'احيانا': 'أحياناً',
-            'اجل': 'أجل',
-            'اذن': 'إذن',
-            'الا': 'إلا',
-            'ان': 'أن',
-            'او': 'أو',
-            'ام': 'أم',
-            'اي': 'أي',
-            'ايها': 'أيها',
-            'ايتها': 'أيتها',
-            
-            # التاء المربوطة والمفتوحة
-            'مدرسه': 'مدرسة',
-            'جامعه': 'جامعة',
-            'حكومه': 'حكومة',
-            'شركه': 'شركة',
-            'مؤسسه': 'مؤسسة',
-            'خطه': 'خطة',
-            'فكره': 'فكرة',
-            'طريقه': 'طريقة',
-            'عمليه': 'عملية',
-            'تقنيه': 'تقنية',
-            'نظريه': 'نظرية',
-            'حقيقه': 'حقيقة',
-            'طبيعه': 'طبيعة',
-            'صناعه': 'صناعة',
-            'زراعه': 'زراعة',
-            'تجاره': 'تجارة',
-            'ثقافه': 'ثقافة',
-            'لغه': 'لغة',
-            'كتابه': 'كتابة',
-            'قراءه': 'قراءة',
-            'دراسه': 'دراسة',
-            'محاوله': 'محاولة',
-            'مساعده': 'مساعدة',
-            'خدمه': 'خدمة',
-            'صحه': 'صحة',
-            'قوه': 'قوة',
-            'سرعه': 'سرعة',
-            'دقه': 'دقة',
-            'جوده': 'جودة',
-            'كميه': 'كمية',
-            'نوعيه': 'نوعية',
-            'اهميه': 'أهمية',
-            'صعوبه': 'صعوبة',
-            'سهوله': 'سهولة',
-            'حريه': 'حرية',
-            'مسؤوليه': 'مسؤولية',
-            'امكانيه': 'إمكانية',
-            'احتماليه': 'احتمالية',
-            'ضروريه': 'ضرورية',
-            'اختياريه': 'اختيارية',
-            'اجباريه': 'إجبارية',
-            'طوعيه': 'طوعية',
-            'رسميه': 'رسمية',
-            'شعبيه': 'شعبية',
-            'عامه': 'عامة',
-            'خاصه': 'خاصة',
-            'محليه': 'محلية',
-            'دوليه': 'دولية',
-            'عالميه': 'عالمية',
-            'اقليميه': 'إقليمية',
-            'وطنيه': 'وطنية',
-            'قوميه': 'قومية',
-            'شخصيه': 'شخصية',
-            'فرديه': 'فردية',
-            'جماعيه': 'جماعية',
-            'اجتماعيه': 'اجتماعية',
-            'اقتصاديه': 'اقتصادية',
-            'سياسيه': 'سياسية',
-            'ثقافيه': 'ثقافية',
-            'تعليميه': 'تعليمية',
-            'صحيه': 'صحية',
-            'بيئيه': 'بيئية',
-            'تكنولوجيه': 'تكنولوجية',
-            'علميه': 'علمية',
-            'عمليه': 'عملية',
-            'نظريه': 'نظرية',
-            'تطبيقيه': 'تطبيقية',
-            'اساسيه': 'أساسية',
-            'ثانويه': 'ثانوية',
-            'فرعيه': 'فرعية',
-            'رئيسيه': 'رئيسية',
-            'مركزيه': 'مركزية',
-            'جانبيه': 'جانبية',
-            'داخليه': 'داخلية',
-            'خارجيه': 'خارجية',
-            'امنيه': 'أمنية',
-            'عسكريه': 'عسكرية',
-            'مدنيه': 'مدنية',
-            'قانونيه': 'قانونية',
-            'قضائيه': 'قضائية',
-            'تنفيذيه': 'تنفيذية',
-            'تشريعيه': 'تشريعية',
-            'ادريه': 'إدارية',
-            'تنظيميه': 'تنظيمية',
-            'تنسيقيه': 'تنسيقية',
-            'اشرافيه': 'إشرافية',
-            'رقابيه': 'رقابية',
-            'توجيهيه': 'توجيهية',
-            'استشاريه': 'استشارية',
-            'تطويريه': 'تطويرية',
-            'تحسينيه': 'تحسينية',
-            'اصلاحيه': 'إصلاحية',
-            'تجديديه': 'تجديدية',
-            'ابداعيه': 'إبداعية',
-            'ابتكاريه': 'ابتكارية',
-            'انتاجيه': 'إنتاجية',
-            'استهلاكيه': 'استهلاكية',
-            'توزيعيه': 'توزيعية',
-            'تسويقيه': 'تسويقية',
-            'اعلانيه': 'إعلانية',
-            'اعلاميه': 'إعلامية',
-            'صحفيه': 'صحفية',
-            'اذاعيه': 'إذاعية',
-            'تلفزيونيه': 'تلفزيونية',
-            'الكترونيه': 'إلكترونية',
-            'رقميه': 'رقمية',
-            'تقنيه': 'تقنية',
-            'تكنولوجيه': 'تكنولوجية',
-            'معلوماتيه': 'معلوماتية',
-            'حاسوبيه': 'حاسوبية',
-            'برمجيه': 'برمجية',
-            'تطبيقيه': 'تطبيقية',
-            'نظاميه': 'نظامية',
-            'شبكيه': 'شبكية',
-            'انترنتيه': 'إنترنتية',
-            'ويبيه': 'ويبية',
-            'موقعيه': 'موقعية',
-            'منصيه': 'منصية',
-            'تفاعليه': 'تفاعلية',
-            'ديناميكيه': 'ديناميكية',
-            'استاتيكيه': 'استاتيكية',
-            'متحركه': 'متحركة',
-            'ثابته': 'ثابتة',
-            'مرنه': 'مرنة',
-            'صلبه': 'صلبة',
-            'ناعمه': 'ناعمة',
-            'خشنه': 'خشنة',
-            'نظيفه': 'نظيفة',
-            'قذره': 'قذرة',
-            'جافه': 'جافة',
-            'رطبه': 'رطبة',
-            'ساخنه': 'ساخنة',
-            'بارده': 'باردة',
-            'دافئه': 'دافئة',
-            'مثلجه': 'مثلجة',
-            'مجمده': 'مجمدة',
-            'ذائبه': 'ذائبة',
-            'صلبه': 'صلبة',
-            'سائله': 'سائلة',
-            'غازيه': 'غازية',
-            'بخاريه': 'بخارية',
-            'دخانيه': 'دخانية',
-            'ضبابيه': 'ضبابية',
-            'غائمه': 'غائمة',
-            'مشمسه': 'مشمسة',
-            'ممطره': 'ممطرة',
-            'عاصفه': 'عاصفة',
-            'هادئه': 'هادئة',
-            'مضطربه': 'مضطربة',
-            'مستقره': 'مستقرة',
-            'متقلبه': 'متقلبة',
-            'متغيره': 'متغيرة',
-            'ثابته': 'ثابتة',
-            'مستمره': 'مستمرة',
-            'منقطعه': 'منقطعة',
-            'متواصله': 'متواصلة',
-            'متصله': 'متصلة',
-            'منفصله': 'منفصلة',
-            'مترابطه': 'مترابطة',
-            'مستقله': 'مستقلة',
-            'تابعه': 'تابعة',
-            'رئيسه': 'رئيسة',
-            'فرعيه': 'فرعية',
-            'جانبيه': 'جانبية',
-            'مركزيه': 'مركزية',
-            'طرفيه': 'طرفية',
-            'حدوديه': 'حدودية',
-            'داخليه': 'داخلية',
-            'خارجيه': 'خارجية',
-            'علويه': 'علوية',
-            'سفليه': 'سفلية',
-            'يمينيه': 'يمينية',
-            'يساريه': 'يسارية',
-            'شماليه': 'شمالية',
-            'جنوبيه': 'جنوبية',
-            'شرقيه': 'شرقية',
-            'غربيه': 'غربية',
-            'وسطيه': 'وسطية',
-            'متوسطه': 'متوسطة',
-            'قصيره': 'قصيرة',
-            'طويله': 'طويلة',
-            'عريضه': 'عريضة',
-            'ضيقه': 'ضيقة',
-            'واسعه': 'واسعة',
-            'محدوده': 'محدودة',
-            'لامحدوده': 'لامحدودة',
-            'مفتوحه': 'مفتوحة',
-            'مغلقه': 'مغلقة',
-            'مقفله': 'مقفلة',
-            'مفكوكه': 'مفكوكة',
-            'مربوطه': 'مربوطة',
-            'محلوله': 'محلولة',
-            'معقوده': 'معقودة',
-            'مشدوده': 'مشدودة',
-            'مرخيه': 'مرخية',
-            'مشدده': 'مشددة',
-            'مخففه': 'مخففة',
-            'مكثفه': 'مكثفة',
-            'مركزه': 'مركزة',
-            'موزعه': 'موزعة',
-            'منتشره': 'منتشرة',
-            'مجمعه': 'مجمعة',
-            'متفرقه': 'متفرقة',
-            'متجمعه': 'متجمعة',
-            'متباعده': 'متباعدة',
-            'متقاربه': 'متقاربة',
-            'متلاصقه': 'متلاصقة',
-            'منفصله': 'منفصلة',
-            'متصله': 'متصلة',
-            'مترابطه': 'مترابطة',
-            'متماسكه': 'متماسكة',
-            'متفككه': 'متفككة',
-            'مكسوره': 'مكسورة',
-            'سليمه': 'سليمة',
-            'تالفه': 'تالفة',
-            'معطوبه': 'معطوبة',
-            'صحيحه': 'صحيحة',
-            'خاطئه': 'خاطئة',
-            'صوابه': 'صوابة',
-            'خطأه': 'خطأة',
-            'دقيقه': 'دقيقة',
-            'تقريبيه': 'تقريبية',
-            'تفصيليه': 'تفصيلية',
-            'اجماليه': 'إجمالية',
-            'كليه': 'كلية',
-            'جزئيه': 'جزئية',
-            'شامله': 'شاملة',
-            'محدوده': 'محدودة',
-            'عامه': 'عامة',
-            'خاصه': 'خاصة',
-            'شخصيه': 'شخصية',
-            'فرديه': 'فردية',
-            'جماعيه': 'جماعية',
-            'جمعيه': 'جمعية',
-            'فرقه': 'فرقة',
-            'مجموعه': 'مجموعة',
-            'طائفه': 'طائفة',
-            'فئه': 'فئة',
-            'شريحه': 'شريحة',
-            'طبقه': 'طبقة',
-            'درجه': 'درجة',
-            'مرتبه': 'مرتبة',
-            'منزله': 'منزلة',
-            'مكانه': 'مكانة',
-            'قيمه': 'قيمة',
-            'اهميه': 'أهمية',
-            'ضروره': 'ضرورة',
-            'حاجه': 'حاجة',
-            'رغبه': 'رغبة',
-            'اراده': 'إرادة',
-            'نيه': 'نية',
-            'قصده': 'قصدة',
-            'هدفه': 'هدفة',
-            'غايه': 'غاية',
-            'مقصده': 'مقصدة',
-            'وجهه': 'وجهة',
-            'اتجاهه': 'اتجاهة',
-            'ناحيه': 'ناحية',
-            'جهه': 'جهة',
-            'زاويه': 'زاوية',
-            'نقطه': 'نقطة',
-            'محطه': 'محطة',
-            'مرحله': 'مرحلة',
-            'خطوه': 'خطوة',
-            'عمليه': 'عملية',
-            'اجراءه': 'إجراءة',
-            'طريقه': 'طريقة',
-            'وسيله': 'وسيلة',
-            'اداه': 'أداة',
-            'الاه': 'آلة',
-            'جهازه': 'جهازة',
-            'معده': 'معدة',
-            'هاذا': 'هذا',
-            'هاذه': 'هذه',
-            'هاؤلاء': 'هؤلاء',
-            'اولئك': 'أولئك',
-            'لاكن': 'لكن',
-            'لاكنه': 'لكنه',
-            'لاكنها': 'لكنها',
-            'اخطاء': 'أخطاء',
-            'املائيه': 'إملائية',
-            'نحويه': 'نحوية',
-            'لغويه': 'لغوية',
-            'كلمات': 'كلمات',
-            'خاطئه': 'خاطئة',
-            'صحيحه': 'صحيحة',
-            'مفيده': 'مفيدة',
-            'جميله': 'جميلة',
-            'رائعه': 'رائعة',
-            'ممتازه': 'ممتازة',
-            'جيده': 'جيدة',
-            'سيئه': 'سيئة',
-            'ضعيفه': 'ضعيفة',
-            'قويه': 'قوية',
-            'كبيره': 'كبيرة',
-            'صغيره': 'صغيرة',
-            'متوسطه': 'متوسطة',
-            'حديثه': 'حديثة',
-            'قديمه': 'قديمة',
-            'جديده': 'جديدة',
-            'مستعمله': 'مستعملة',
-            'نظيفه': 'نظيفة',
-            'قذره': 'قذرة',
-            'مرتبه': 'مرتبة',
-            'فوضويه': 'فوضوية',
-            'منظمه': 'منظمة',
-            'مبعثره': 'مبعثرة',
-            'مجمعه': 'مجمعة',
-            'متفرقه': 'متفرقة',
-            'متنوعه': 'متنوعة',
-            'موحده': 'موحدة',
-            'مختلفه': 'مختلفة',
-            'متشابهه': 'متشابهة',
-            'متطابقه': 'متطابقة',
-            'متناقضه': 'متناقضة',
-            'متوافقه': 'متوافقة',
-            'متضاربه': 'متضاربة',
-            'متكامله': 'متكاملة',
-            'ناقصه': 'ناقصة',
-            'كامله': 'كاملة',
-            'تامه': 'تامة',
-            'مكتمله': 'مكتملة',
-            'مبتوره': 'مبتورة',
-            'مقطوعه': 'مقطوعة',
-            'متصله': 'متصلة',
-            'منفصله': 'منفصلة',
-            'مترابطه': 'مترابطة',
-            'مستقله': 'مستقلة',
-            'تابعه': 'تابعة',
-            'رئيسه': 'رئيسة',
-            'فرعيه': 'فرعية',
-            'اساسيه': 'أساسية',
-            'ثانويه': 'ثانوية',
-            'اضافيه': 'إضافية',
-            'اختياريه': 'اختيارية',
-            'اجباريه': 'إجبارية',
-            'ضروريه': 'ضرورية',
-            'مهمه': 'مهمة',
-            'حيويه': 'حيوية',
-            'اساسيه': 'أساسية',
-            'جوهريه': 'جوهرية',
-            'مركزيه': 'مركزية',
-            'محوريه': 'محورية',
-            'رئيسيه': 'رئيسية',
-            'اوليه': 'أولية',
-            'ابتدائيه': 'ابتدائية',
-            'تمهيديه': 'تمهيدية',
-            'تحضيريه': 'تحضيرية',
-            'اعداديه': 'إعدادية',
-            'متقدمه': 'متقدمة',
-            'متأخره': 'متأخرة',
-            'حديثه': 'حديثة',
-            'عصريه': 'عصرية',
-            'معاصره': 'معاصرة',
-            'تقليديه': 'تقليدية',
-            'كلاسيكيه': 'كلاسيكية',
-            'قديمه': 'قديمة',
-            'عتيقه': 'عتيقة',
-            'اثريه': 'أثرية',
-            'تاريخيه': 'تاريخية',
-            'تراثيه': 'تراثية',
-            'شعبيه': 'شعبية',
-            'فولكلوريه': 'فولكلورية',
-            'ثقافيه': 'ثقافية',
-            'حضاريه': 'حضارية',
-            'مدنيه': 'مدنية',
-            'بدويه': 'بدوية',
-            'ريفيه': 'ريفية',
-            'حضريه': 'حضرية',
-            'قرويه': 'قروية',
-            'مدينيه': 'مدينية',
-            'محليه': 'محلية',
-            'اقليميه': 'إقليمية',
-            'وطنيه': 'وطنية',
-            'قوميه': 'قومية',
-            'دوليه': 'دولية',
-            'عالميه': 'عالمية',
-            'كونيه': 'كونية',
-            'شموليه': 'شمولية',
-            'عامه': 'عامة',
-            'خاصه': 'خاصة',
-            'شخصيه': 'شخصية',
-            'فرديه': 'فردية',
-            'جماعيه': 'جماعية',
-            'اجتماعيه': 'اجتماعية',
-            'مجتمعيه': 'مجتمعية',
-            'انسانيه': 'إنسانية',
-            'بشريه': 'بشرية',
-            'ادميه': 'آدمية',
-            'طبيعيه': 'طبيعية',
-            'بيولوجيه': 'بيولوجية',
-            'كيميائيه': 'كيميائية',
-            'فيزيائيه': 'فيزيائية',
-            'رياضيه': 'رياضية',
-            'هندسيه': 'هندسية',
-            'معماريه': 'معمارية',
-            'تصميميه': 'تصميمية',
-            'فنيه': 'فنية',
-            'جماليه': 'جمالية',
-            'ابداعيه': 'إبداعية',
-            'ابتكاريه': 'ابتكارية',
-            'اختراعيه': 'اختراعية',
-            'اكتشافيه': 'اكتشافية',
-            'استكشافيه': 'استكشافية',
-            'بحثيه': 'بحثية',
-            'دراسيه': 'دراسية',
-            'تعليميه': 'تعليمية',
-            'تربويه': 'تربوية',
-            'اكاديميه': 'أكاديمية',
-            'جامعيه': 'جامعية',
-            'مدرسيه': 'مدرسية',
-            'تدريسيه': 'تدريسية',
-            'تدريبيه': 'تدريبية',
-            'تأهيليه': 'تأهيلية',
-            'تطويريه': 'تطويرية',
-            'تحسينيه': 'تحسينية',
-            'اصلاحيه': 'إصلاحية',
-            'تجديديه': 'تجديدية',
-            'تحديثيه': 'تحديثية',
-            'تطبيقيه': 'تطبيقية',
-            'عمليه': 'عملية',
-            'نظريه': 'نظرية',
-            'فكريه': 'فكرية',
-            'ذهنيه': 'ذهنية',
-            'عقليه': 'عقلية',
-            'فلسفيه': 'فلسفية',
-            'منطقيه': 'منطقية',
-            'عقلانيه': 'عقلانية',
-            'منهجيه': 'منهجية',
-            'علميه': 'علمية',
-            'موضوعيه': 'موضوعية',
-            'ذاتيه': 'ذاتية',
-            'شخصيه': 'شخصية',
-            'فرديه': 'فردية',
-            'خاصه': 'خاصة',
-            'عامه': 'عامة',
-            'مشتركه': 'مشتركة',
-            'جماعيه': 'جماعية',
-            'تعاونيه': 'تعاونية',
-            'تشاركيه': 'تشاركية',
-            'تفاعليه': 'تفاعلية',
-            'ديناميكيه': 'ديناميكية',
-            'حيويه': 'حيوية',
-            'نشطه': 'نشطة',
-            'فعاله': 'فعالة',
-            'مؤثره': 'مؤثرة',
-            'قويه': 'قوية',
-            'ضعيفه': 'ضعيفة',
-            'متوسطه': 'متوسطة',
-            'معتدله': 'معتدلة',
-            'متطرفه': 'متطرفة',
-            'متشدده': 'متشددة',
-            'متساهله': 'متساهلة',
-            'مرنه': 'مرنة',
-            'صلبه': 'صلبة',
-            'قاسيه': 'قاسية',
-            'لينه': 'لينة',
-            'ناعمه': 'ناعمة',
-            'خشنه': 'خشنة',
-            'نظيفه': 'نظيفة',
-            'قذره': 'قذرة',
-            'طاهره': 'طاهرة',
-            'نجسه': 'نجسة',
-            'مقدسه': 'مقدسة',
-            'مباركه': 'مباركة',
-            'شريفه': 'شريفة',
-            'كريمه': 'كريمة',
-            'نبيله': 'نبيلة',
-            'عظيمه': 'عظيمة',
-            'جليله': 'جليلة',
-            'رفيعه': 'رفيعة',
-            'عاليه': 'عالية',
-            'سامقه': 'سامقة',
-            'شامخه': 'شامخة',
-            'مرتفعه': 'مرتفعة',
-            'منخفضه': 'منخفضة',
-            'عميقه': 'عميقة',
-            'ضحله': 'ضحلة',
-            'سطحيه': 'سطحية',
-            'عمقيه': 'عمقية',
-            'جذريه': 'جذرية',
-            'اساسيه': 'أساسية',
-            'جوهريه': 'جوهرية',
-            'حقيقيه': 'حقيقية',
-            'واقعيه': 'واقعية',
-            'حقيقه': 'حقيقة',
-            'واقعه': 'واقعة',
-            'حادثه': 'حادثة',
-            'قصه': 'قصة',
-            'حكايه': 'حكاية',
-            'روايه': 'رواية',
-            'اسطوره': 'أسطورة',
-            'خرافه': 'خرافة',
-            'حقيقه': 'حقيقة',
-            'خياليه': 'خيالية',
-            'وهميه': 'وهمية',
-            'تخيليه': 'تخيلية',
-            'افتراضيه': 'افتراضية',
-            'نظريه': 'نظرية',
-            'عمليه': 'عملية',
-            'تطبيقيه': 'تطبيقية',
-            'استخداميه': 'استخدامية',
-            'وظيفيه': 'وظيفية',
-            'عمليه': 'عملية',
-            'انتاجيه': 'إنتاجية',
-            'استهلاكيه': 'استهلاكية',
-            'اقتصاديه': 'اقتصادية',
-            'ماليه': 'مالية',
-            'نقديه': 'نقدية',
-            'مصرفيه': 'مصرفية',
-            'بنكيه': 'بنكية',
-            'تجاريه': 'تجارية',
-            'صناعيه': 'صناعية',
-            'زراعيه': 'زراعية',
-            'خدميه': 'خدمية',
-            'سياحيه': 'سياحية',
-            'فندقيه': 'فندقية',
-            'مطعميه': 'مطعمية',
-            'غذائيه': 'غذائية',
-            'طبيه': 'طبية',
-            'صحيه': 'صحية',
-            'علاجيه': 'علاجية',
-            'دوائيه': 'دوائية',
-            'طبيعيه': 'طبيعية',
-            'كيميائيه': 'كيميائية',
-            'عشبيه': 'عشبية',
-            'نباتيه': 'نباتية',
-            'حيوانيه': 'حيوانية',
-            'بحريه': 'بحرية',
-            'بريه': 'برية',
-            'جويه': 'جوية',
-            'فضائيه': 'فضائية',
-            'ارضيه': 'أرضية',
-            'سماويه': 'سماوية',
-            'علويه': 'علوية',
-            'سفليه': 'سفلية',
-            'داخليه': 'داخلية',
-            'خارجيه': 'خارجية',
-            'امنيه': 'أمنية',
-            'عسكريه': 'عسكرية',
-            'مدنيه': 'مدنية',
-            'شرطيه': 'شرطية',
-            'قضائيه': 'قضائية',
-            'قانونيه': 'قانونية',
-            'تشريعيه': 'تشريعية',
-            'تنفيذيه': 'تنفيذية',
-            'ادريه': 'إدارية',
-            'تنظيميه': 'تنظيمية',
-            'تنسيقيه': 'تنسيقية',
-            'اشرافيه': 'إشرافية',
-            'رقابيه': 'رقابية',
-            'توجيهيه': 'توجيهية',
-            'استشاريه': 'استشارية',
-            'تطويريه': 'تطويرية',
-            'تحسينيه': 'تحسينية',
-            'اصلاحيه': 'إصلاحية',
-            'تجديديه': 'تجديدية',
-            'ابداعيه': 'إبداعية',
-            'ابتكاريه': 'ابتكارية',
-            'انتاجيه': 'إنتاجية',
-            'استهلاكيه': 'استهلاكية',
-            'توزيعيه': 'توزيعية',
-            'تسويقيه': 'تسويقية',
-            'اعلانيه': 'إعلانية',
-            'اعلاميه': 'إعلامية',
-            'صحفيه': 'صحفية',
-            'اذاعيه': 'إذاعية',
-            'تلفزيونيه': 'تلفزيونية',
-            'الكترونيه': 'إلكترونية',
-            'رقميه': 'رقمية',
-            'تقنيه': 'تقنية',
-            'تكنولوجيه': 'تكنولوجية',
-            'معلوماتيه': 'معلوماتية',
-            'حاسوبيه': 'حاسوبية',
-            'برمجيه': 'برمجية',
-            'تطبيقيه': 'تطبيقية',
-            'نظاميه': 'نظامية',
-            'شبكيه': 'شبكية',
-            'انترنتيه': 'إنترنتية',
-            'ويبيه': 'ويبية',
-            'موقعيه': 'موقعية',
-            'منصيه': 'منصية',
-            'تفاعليه': 'تفاعلية',
-            'ديناميكيه': 'ديناميكية',
-            'استاتيكيه': 'استاتيكية',
-            'متحركه': 'متحركة',
-            'ثابته': 'ثابتة',
-            'مرنه': 'مرنة',
-            'صلبه': 'صلبة',
-            'ناعمه': 'ناعمة',
-            'خشنه': 'خشنة',
-            'نظيفه': 'نظيفة',
-            'قذره': 'قذرة',
-            'جافه': 'جافة',
-            'رطبه': 'رطبة',
-            'ساخنه': 'ساخنة',
-            'بارده': 'باردة',
-            'دافئه': 'دافئة',
-            'مثلجه': 'مثلجة',
-            'مجمده': 'مجمدة',
-            'ذائبه': 'ذائبة',
-            'صلبه': 'صلبة',
-            'سائله': 'سائلة',
-            'غازيه': 'غازية',
-            'بخاريه': 'بخارية',
-            'دخانيه': 'دخانية',
-            'ضبابيه': 'ضبابية',
-            'غائمه': 'غائمة',
-            'مشمسه': 'مشمسة',
-            'ممطره': 'ممطرة',
-            'عاصفه': 'عاصفة',
-            'هادئه': 'هادئة',
-            'مضطربه': 'مضطربة',
-            'مستقره': 'مستقرة',
-            'متقلبه': 'متقلبة',
-            'متغيره': 'متغيرة',
-            'ثابته': 'ثابتة',
-            'مستمره': 'مستمرة',
-            'منقطعه': 'منقطعة',
-            'متواصله': 'متواصلة',
-            'متصله': 'متصلة',
-            'منفصله': 'منفصلة',
-            'مترابطه': 'مترابطة',
-            'مستقله': 'مستقلة',
-            'تابعه': 'تابعة',
-            'رئيسه': 'رئيسة',
-            'فرعيه': 'فرعية',
-            'جانبيه': 'جانبية',
-            'مركزيه': 'مركزية',
-            'طرفيه': 'طرفية',
-            'حدوديه': 'حدودية',
-            'داخليه': 'داخلية',
-            'خارجيه': 'خارجية',
-            'علويه': 'علوية',
-            'سفليه': 'سفلية',
-            'يمينيه': 'يمينية',
-            'يساريه': 'يسارية',
-            'شماليه': 'شمالية',
-            'جنوبيه': 'جنوبية',
-            'شرقيه': 'شرقية',
-            'غربيه': 'غربية',
-            'وسطيه': 'وسطية',
-            'متوسطه': 'متوسطة',
-            'قصيره': 'قصيرة',
-            'طويله': 'طويلة',
-            'عريضه': 'عريضة',
-            'ضيقه': 'ضيقة',
-            'واسعه': 'واسعة',
-            'محدوده': 'محدودة',
-            'لامحدوده': 'لامحدودة',
-            'مفتوحه': 'مفتوحة',
-            'مغلقه': 'مغلقة',
-            'مقفله': 'مقفلة',
-            'مفكوكه': 'مفكوكة',
-            'مربوطه': 'مربوطة',
-            'محلوله': 'محلولة',
-            'معقوده': 'معقودة',
-            'مشدوده': 'مشدودة',
-            'مرخيه': 'مرخية',
-            'مشدده': 'مشددة',
-            'مخففه': 'مخففة',
-            'مكثفه': 'مكثفة',
-            'مركزه': 'مركزة',
-            'موزعه': 'موزعة',
-            'منتشره': 'منتشرة',
-            'مجمعه': 'مجمعة',
-            'متفرقه': 'متفرقة',
-            'متجمعه': 'متجمعة',
-            'متباعده': 'متباعدة',
-            'متقاربه': 'متقاربة',
-            'متلاصقه': 'متلاصقة',
-            'منفصله': 'منفصلة',
-            'متصله': 'متصلة',
-            'مترابطه': 'مترابطة',
-            'متماسكه': 'متماسكة',
-            'متفككه': 'متفككة',
-            'مكسوره': 'مكسورة',
-            'سليمه': 'سليمة',
-            'تالفه': 'تالفة',
-            'معطوبه': 'معطوبة',
-            'صحيحه': 'صحيحة',
-            'خاطئه': 'خاطئة',
-            'صوابه': 'صوابة',
-            'خطأه': 'خطأة',
-            'دقيقه': 'دقيقة',
-            'تقريبيه': 'تقريبية',
-            'تفصيليه': 'تفصيلية',
-            'اجماليه': 'إجمالية',
-            'كليه': 'كلية',
-            'جزئيه': 'جزئية',
-            'شامله': 'شاملة',
-            'محدوده': 'محدودة',
-            'عامه': 'عامة',
-            'خاصه': 'خاصة',
-            'شخصيه': 'شخصية',
-            'فرديه': 'فردية',
-            'جماعيه': 'جماعية',
-            'جمعيه': 'جمعية',
-            'فرقه': 'فرقة',
-            'مجموعه': 'مجموعة',
-            'طائفه': 'طائفة',
-            'فئه': 'فئة',
-            'شريحه': 'شريحة',
-            'طبقه': 'طبقة',
-            'درجه': 'درجة',
-            'مرتبه': 'مرتبة',
-            'منزله': 'منزلة',
-            'مكانه': 'مكانة',
-            'قيمه': 'قيمة',
-            'اهميه': 'أهمية',
-            'ضروره': 'ضرورة',
-            'حاجه': 'حاجة',
-            'رغبه': 'رغبة',
-            'اراده': 'إرادة',
-            'نيه': 'نية',
-            'قصده': 'قصدة',
-            'هدفه': 'هدفة',
-            'غايه': 'غاية',
-            'مقصده': 'مقصدة',
-            'وجهه': 'وجهة',
-            'اتجاهه': 'اتجاهة',
-            'ناحيه': 'ناحية',
-            'جهه': 'جهة',
-            'زاويه': 'زاوية',
-            'نقطه': 'نقطة',
-            'محطه': 'محطة',
-            'مرحله': 'مرحلة',
-            'خطوه': 'خطوة',
-            'عمليه': 'عملية',
-            'اجراءه': 'إجراءة',
-            'طريقه': 'طريقة',
-            'وسيله': 'وسيلة',
-            'اداه': 'أداة',
-            'الاه': 'آلة',
-            'جهازه': 'جهازة',
-            'معده': 'معدة',
-            'لطيفه': 'لطيفة',
-            'الشمسو': 'الشمس',
-            'الشمسه': 'الشمس',
-            'الشمسي': 'الشمس',
-            'الشمسا': 'الشمس',
-            'الشمسة': 'الشمس',
-            'الشمسى': 'الشمس',
-            'الشمسئ': 'الشمس',
-            'الشمسؤ': 'الشمس',
-            'الشمسء': 'الشمس',
-            'الشمسآ': 'الشمس',
-            'الشمسأ': 'الشمس',
-            'الشمسإ': 'الشمس',
-            'الشمسئ': 'الشمس',
-            'الشمسؤ': 'الشمس',
-            'الشمسو': 'الشمس',
-            'شمسو': 'شمس',
-            'شمسه': 'شمس',
-            'شمسي': 'شمس',
-            'شمسا': 'شمس',
-            'شمسة': 'شمس',
-            'شمسى': 'شمس',
-            'شمسئ': 'شمس',
-            'شمسؤ': 'شمس',
-            'شمسء': 'شمس',
-            'شمسآ': 'شمس',
-            'شمسأ': 'شمس',
-            'شمسإ': 'شمس',
-            'شمسئ': 'شمس',
-            'شمسؤ': 'شمس',
-            'شمسو': 'شمس',
-            'الجوو': 'الجو',
-            'الجوه': 'الجو',
-            'الجوي': 'الجو',
-            'الجوا': 'الجو',
-            'الجوة': 'الجو',
-            'الجوى': 'الجو',
-            'الجوئ': 'الجو',
-            'الجوؤ': 'الجو',
-            'الجوء': 'الجو',
-            'الجوآ': 'الجو',
-            'الجوأ': 'الجو',
-            'الجوإ': 'الجو',
-            'جوو': 'جو',
-            'جوه': 'جو',
-            'جوي': 'جو',
-            'جوا': 'جو',
-            'جوة': 'جو',
-            'جوى': 'جو',
-            'جوئ': 'جو',
-            'جوؤ': 'جو',
-            'جوء': 'جو',
-            'جوآ': 'جو',
-            'جوأ': 'جو',
-            'جوإ': 'جو',
-            'مشرقو': 'مشرق',
-            'مشرقه': 'مشرق',
-            'مشرقي': 'مشرق',
-            'مشرقا': 'مشرق',
-            'مشرقة': 'مشرق',
-            'مشرقى': 'مشرق',
-            'مشرقئ': 'مشرق',
-            'مشرقؤ': 'مشرق',
-            'مشرقء': 'مشرق',
-            'مشرقآ': 'مشرق',
-            'مشرقأ': 'مشرق',
-            'مشرقإ': 'مشرق',
-            'والجوو': 'والجو',
-            'والجوه': 'والجو',
-            'والجوي': 'والجو',
-            'والجوا': 'والجو',
-            'والجوة': 'والجو',
-            'والجوى': 'والجو',
-            'والجوئ': 'والجو',
-            'والجوؤ': 'والجو',
-            'والجوء': 'والجو',
-            'والجوآ': 'والجو',
-            'والجوأ': 'والجو',
-            'والجوإ': 'والجو',
-            'رائعو': 'رائع',
-            'رائعه': 'رائع',
-            'رائعي': 'رائع',
-            'رائعا': 'رائع',
-            'رائعة': 'رائع',
-            'رائعى': 'رائع',
-            'رائعئ': 'رائع',
-            'رائعؤ': 'رائع',
-            'رائعء': 'رائع',
-            'رائعآ': 'رائع',
-            'رائعأ': 'رائع',
-            'رائعإ': 'رائع'
-        }
+    def __init__(self, lexicon_path: str = COMMON_ERRORS_LEXICON,
+                 variant_bases_path: str = VARIANT_BASES_LEXICON,
+                 vocabulary_path: str = VOCABULARY_LEXICON,
+                 contextual_errors_path: str = CONTEXTUAL_ERRORS_LEXICON,
+                 rasm_path: str = RASM_LEXICON,
+                 language_model_path: str = LANGUAGE_MODEL, lm_probe_budget: int = LM_PROBE_BUDGET,
+                 cache_entries: int = 100000, cache_bytes: int = 32 * 1024 * 1024,
+                 frequency_priors: FrequencyPriors = None):
+        # قاموس شامل للأخطاء الشائعة في اللغة العربية (معجم مترجم مقروء عبر mmap)
+        self.common_errors = load_lexicon(lexicon_path, COMMON_ERRORS_SOURCE,
+                                          _load_common_errors_source)
+        
+        # الصيغ الأساسية وقواعد التنويع بدلاً من تعداد كل صيغة خاطئة يدوياً
+        self.variant_bases = load_lexicon(variant_bases_path, COMMON_ERRORS_SOURCE,
+                                          _load_variant_bases_source)
+        self.variant_resolver = VariantResolver(self.variant_bases)
+        
+        # أزواج تعتمد على السياق: تُحسم بنموذج اللغة، ومن دونه تبقى الكلمة كما كُتبت.
+        # الجدول صغير ويُفحص مع كل كلمة، فيُحمل في قاموس بدلاً من البحث الثنائي في المعجم المترجم
+        self.contextual_errors = dict(load_lexicon(contextual_errors_path, COMMON_ERRORS_SOURCE,
+                                                   _load_contextual_errors_source))
+        self.language_model = (HashedNgramModel.load(language_model_path)
+                               if language_model_path and os.path.exists(language_model_path) else None)
+        self.lm_probe_budget = lm_probe_budget
+        
+        # مفردات الكلمات الصحيحة المعروفة، تُجرَّب عليها صيغ الخلط الإملائي (الهمزات والتاء المربوطة والألف المقصورة)
+        self.vocabulary = load_lexicon(vocabulary_path, COMMON_ERRORS_SOURCE, _load_vocabulary_source)
+        self.rasm_base = load_lexicon(rasm_path, (COMMON_ERRORS_SOURCE, RASM_SOURCE), _load_rasm_source)
+        
+        # حالة القاموس المتغيرة في لقطات ثابتة ذات إصدار: التصحيحات المخصصة، وكلمات قاعدة البيانات
+        # (صحيحة لا تُصحح وتنضم إلى المفردات)، وفهرس الهيكل غير المنقوط (الرسم) ومولد صيغ الخلط فوقها.
+        # كل تحديث يبني لقطة جديدة جانباً وينشرها بتبديل مرجع واحد، وكل طلب يثبّت لقطة واحدة دون أقفال
+        self.snapshots = SnapshotHolder(DictionarySnapshot(0, self.vocabulary, MappingProxyType({}), frozenset(),
+                                                           RasmIndex(base=self.rasm_base)))
+        
+        # عدد الكلمات التي حسمتها كل طبقة (تُحسب عند غياب الكلمة من الذاكرة المؤقتة فقط)
+        self.tier_counts = Counter()
+        
+        # تجزئة السوابق واللواحق للبحث عن جذع الكلمة
+        self.segmenter = AffixSegmenter()
         
-        # قاموس للكلمات المخصصة (يمكن إضافة كلمات جديدة إليه)
-        self.custom_words = {}
+        # مطابق العبارات (كلمة واحدة أو أكثر) المبني مرة واحدة لكل عملية
+        self.phrase_matcher = default_phrase_matcher()
+        
+        # تكرارات الكلمات (من custom_words) كاحتمالات مسبقة للمفاضلة بين مرشحي الرسم وصيغ الخلط
+        self.frequency_priors = frequency_priors if frequency_priors is not None else FrequencyPriors()
+        self._priors_version = self.frequency_priors.version
+        
+        # ذاكرة مؤقتة لنتائج الكلمات، مفاتيحها (إصدار اللقطة، الكلمة)، وتُفرغ عند نشر لقطة جديدة
+        self.cache = TokenCache(cache_entries, cache_bytes)
+
+    @property
+    def custom_words(self) -> Mapping[str, str]:
+        """Custom corrections of the current snapshot (read-only)"""
+        return self.snapshots.current().custom_words
+
+    @property
+    def known_words(self) -> FrozenSet[str]:
+        """Database words of the current snapshot"""
+        return self.snapshots.current().known_words
+
+    @property
+    def rasm_index(self) -> RasmIndex:
+        return self.snapshots.current().rasm_index
+
+    @property
+    def confusion_generator(self) -> ConfusionGenerator:
+        return self.snapshots.current().confusion_generator
 
     def correct_text(self, text: str) -> Dict[str, Any]:
         """Correct Arabic text and return detailed results"""
+        return self._correct(text, {}, self.snapshots.current())
+
+    def correct_texts(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Correct a batch of texts, resolving each distinct word once for the whole batch"""
+        resolutions = {}
+        snapshot = self.snapshots.current()
+        return [self._correct(text, resolutions, snapshot) for text in texts]
+
+    def correct_stream(self, chunks: Iterable[str], max_pending: int = 65536) -> Iterator[Dict[str, Any]]:
+        """Correct text arriving in chunks, yielding results incrementally.
+
+        Yields one 'segment' record per processed slice of the input, with
+        corrections carrying absolute positions and offsets, then a final
+        'statistics' record. Words split across chunks are held back until
+        complete, as are the last few words a multi-word phrase could still
+        extend into. An unfinished last word longer than `max_pending` is
+        processed as it is, so memory stays bounded by `max_pending` plus one
+        chunk and the few held-back words.
+        The whole stream is corrected against one dictionary snapshot.
+        """
+        snapshot = self.snapshots.current()
+        # عدد الكلمات التي تُؤجل حتى لا تنقطع عبارة متعددة الكلمات عند حد القطعة،
+        # ولا يُقطع السياق اللاحق الذي يحتاجه نموذج اللغة
+        lookahead = max(self.phrase_matcher.max_words - 1, 0)
+        context_size = self.language_model.order - 1 if self.language_model is not None else 0
+        lookahead = max(lookahead, context_size)
+        context_before = []
+        buffer = ''
+        offset = 0
+        position = 0
+        total_words = 0
+        total_errors = 0
+        
+        for chunk in itertools.chain(chunks, [None]):
+            final = chunk is None
+            if not final:
+                buffer += chunk
+            
+            spans = tokenize(buffer)
+            complete = len(spans)
+            if not final and spans and spans[-1][1] == len(buffer):
+                # آخر كلمة قد تكملها القطعة التالية
+                complete -= 1
+            # كلمة أخيرة طويلة بلا مسافات: تُعالج كما هي حتى لا تنمو الذاكرة.
+            # يُقاس طولها هي لا طول المخزن، فقطعة طويلة من كلمات قصيرة لا تقطع كلمتها الأخيرة
+            overflow = not final and bool(spans) and len(buffer) - spans[-1][0] > max_pending
+            if overflow:
+                complete = len(spans)
+            
+            committed = complete if final or overflow else complete - lookahead
+            if committed <= 0:
+                if final and buffer:
+                    # مسافات أو نص فارغ في النهاية
+                    yield {'type': 'segment', 'start': offset, 'end': offset + len(buffer),
+                           'corrected_text': buffer, 'corrections': []}
+                continue
+            
+            window = buffer[:spans[complete - 1][1]]
+            result = self._correct(window, {}, snapshot, context_before)
+            
+            segment_corrections = []
+            replacements = []
+            for correction in result['corrections']:
+                if correction['position'] >= committed:
+                    break
+                # عبارة تبدأ قبل الحد وتمتد بعده تُعتمد كاملة
+                while committed < complete and spans[committed][0] < correction['end']:
+                    committed += 1
+                replacements.append((correction['start'], correction['end'], correction['corrected']))
+                segment_corrections.append(dict(
+                    correction,
+                    position=correction['position'] + position,
+                    start=correction['start'] + offset,
+                    end=correction['end'] + offset
+                ))
+            
+            cut = spans[committed][0] if committed < len(spans) else len(buffer)
+            
+            yield {
+                'type': 'segment',
+                'start': offset,
+                'end': offset + cut,
+                'corrected_text': splice(buffer[:cut], replacements),
+                'corrections': segment_corrections
+            }
+            
+            if context_size:
+                committed_words = [buffer[span[2]:span[3]] for span in spans[:committed] if span[4] == ARABIC]
+                context_before = (context_before + committed_words)[-context_size:]
+
+            total_words += committed
+            total_errors += len(segment_corrections)
+            position += committed
+            offset += cut
+            buffer = buffer[cut:]
+        
+        accuracy_percentage = ((total_words - total_errors) / total_words * 100) if total_words > 0 else 100.0
+        yield {
+            'type': 'statistics',
+            'statistics': {
+                'total_words': total_words,
+                'total_errors': total_errors,
+                'corrections_made': total_errors,
+                'accuracy_percentage': round(accuracy_percentage, 2)
+            }
+        }
+
+    def _correct(self, text: str, resolutions: Dict[str, Optional[Dict[str, Any]]],
+                 snapshot: DictionarySnapshot, context_before: List[str] = ()) -> Dict[str, Any]:
+        """Correct one text against `snapshot`; `resolutions` memoizes word lookups across calls.
+
+        `context_before` holds the words preceding `text` (when it continues
+        a stream), for context-dependent decisions at its start.
+        """
         if not text or not text.strip():
             return {
                 'original_text': text,
@@ -1029,41 +304,67 @@ class SimpleArabicCorrector:
                 }
             }
         
-        # تنظيف النص وتقسيمه إلى كلمات
-        words = re.findall(r'\S+', text)
+        # تقسيم النص إلى مقاطع مع الاحتفاظ بمواضعها في النص الأصلي
+        spans = tokenize(text)
         corrections = []
-        corrected_words = []
+        replacements = []
+        
+        # البحث عن العبارات الخاطئة (بما فيها متعددة الكلمات) في مرور واحد
+        phrases = self.phrase_matcher.match_spans(text, spans)
+        skip_until = 0
+        arabic_words = arabic_positions = None
         
-        for i, word in enumerate(words):
-            # إزالة علامات الترقيم من بداية ونهاية الكلمة للتحقق
-            clean_word = re.sub(r'^[^\w\u0600-\u06FF]+|[^\w\u0600-\u06FF]+$', '', word)
+        for i, (start, end, core_start, core_end, kind) in enumerate(spans):
+            # الأرقام والروابط والكلمات اللاتينية وعلامات الترقيم لا تمر بالقاموس
+            if i < skip_until or kind != ARABIC:
+                continue
             
-            if clean_word in self.common_errors:
-                corrected_word = word.replace(clean_word, self.common_errors[clean_word])
-                corrections.append({
-                    'original': word,
-                    'corrected': corrected_word,
-                    'position': i,
-                    'type': 'spelling'
-                })
-                corrected_words.append(corrected_word)
-            elif clean_word in self.custom_words:
-                corrected_word = word.replace(clean_word, self.custom_words[clean_word])
-                corrections.append({
-                    'original': word,
-                    'corrected': corrected_word,
-                    'position': i,
-                    'type': 'custom'
-                })
-                corrected_words.append(corrected_word)
+            phrase = phrases.get(i)
+            if phrase is not None and phrase[1] - i > 1:
+                # عبارة متعددة الكلمات: يمتد التصحيح حتى آخر كلماتها
+                last_span = spans[phrase[1] - 1]
+                end, core_end = last_span[1], last_span[3]
+                resolution = {'correction': phrase[2], 'type': 'phrase'}
+                skip_until = phrase[1]
             else:
-                corrected_words.append(word)
+                # لب الكلمة بدون علامات الترقيم في بدايتها ونهايتها
+                clean_word = text[core_start:core_end]
+                if clean_word in self.contextual_errors:
+                    # لا تُحفظ في الذاكرة المؤقتة: القرار يتغير بتغير الكلمات المجاورة
+                    if arabic_words is None:
+                        arabic_positions = [j for j, span in enumerate(spans) if span[4] == ARABIC]
+                        arabic_words = [text[spans[j][2]:spans[j][3]] for j in arabic_positions]
+                        arabic_positions = {j: k for k, j in enumerate(arabic_positions)}
+                    resolution = self._resolve_in_context(clean_word, arabic_positions[i], arabic_words,
+                                                          context_before)
+                elif clean_word in resolutions:
+                    resolution = resolutions[clean_word]
+                else:
+                    resolution = resolutions[clean_word] = self._cached_resolve(clean_word, snapshot)
+            if resolution is None:
+                continue
+            
+            correction = resolution['correction']
+            correction_info = {
+                'original': text[start:end],
+                'corrected': text[start:core_start] + correction + text[core_end:end],
+                'position': i,
+                'start': start,
+                'end': end,
+                'type': resolution['type']
+            }
+            # القاعدة أو التجزئة التي أنتجت التصحيح
+            for key in ('rule', 'prefix', 'stem', 'suffix'):
+                if key in resolution:
+                    correction_info[key] = resolution[key]
+            corrections.append(correction_info)
+            replacements.append((core_start, core_end, correction))
         
-        # إنشاء النص المصحح
-        corrected_text = ' '.join(corrected_words)
+        # إنشاء النص المصحح مع الحفاظ على المسافات الأصلية
+        corrected_text = splice(text, replacements)
         
         # حساب الإحصائيات
-        total_words = len(words)
+        total_words = len(spans)
         total_errors = len(corrections)
         accuracy_percentage = ((total_words - total_errors) / total_words * 100) if total_words > 0 else 100.0
         
@@ -1079,31 +380,246 @@ class SimpleArabicCorrector:
             }
         }
 
+    def _resolve_in_context(self, word: str, position: int, arabic_words: List[str],
+                            context_before: List[str]) -> Optional[Dict[str, Any]]:
+        """Apply a context-dependent pair only if the language model prefers it here"""
+        if self.language_model is None:
+            return None
+        
+        # الكلمات العربية المجاورة (الموضع هنا بين الكلمات العربية وحدها)
+        order = self.language_model.order
+        before = list(context_before) + arabic_words[max(0, position - order + 1):position]
+        after = arabic_words[position + 1:position + order]
+        
+        candidate = self.contextual_errors[word]
+        choice = choose_in_context(self.language_model, [word, candidate], before, after, self.lm_probe_budget)
+        self.tier_counts['context' if choice == 1 else 'context_kept'] += 1
+        if choice == 1:
+            return {'correction': candidate, 'type': 'spelling', 'rule': 'context'}
+        return None
+
+    def _cached_resolve(self, word: str, snapshot: DictionarySnapshot) -> Optional[Dict[str, Any]]:
+        """Resolve a word through the bounded token cache"""
+        # نتيجة محسوبة على لقطة لا تُقدم لطلب يقرأ لقطة أخرى، ولا بعد تغير تكرارات الكلمات
+        self._sync_frequency_priors()
+        key = (snapshot.version, word)
+        resolution = self.cache.get(key)
+        if resolution is MISSING:
+            generation = self.cache.generation
+            resolution = self._resolve_word(word, snapshot)
+            self.cache.put(key, resolution, generation)
+        return resolution
+
+    def set_frequency_priors(self, frequency_priors: FrequencyPriors) -> None:
+        """Replace the word frequencies used to rank candidates, dropping cached results"""
+        self.frequency_priors = frequency_priors
+        self._priors_version = frequency_priors.version
+        self.cache.clear()
+
+    def _sync_frequency_priors(self) -> None:
+        """Drop cached results if the frequencies changed since they were computed"""
+        version = self.frequency_priors.version
+        if version != self._priors_version:
+            self._priors_version = version
+            self.cache.clear()
+
+    def _lookup_word(self, word: str, snapshot: DictionarySnapshot) -> Optional[Dict[str, Any]]:
+        """Look a bare word up in the dictionaries and variant rules"""
+        correction = self.common_errors.get(word)
+        if correction is not None:
+            return {'correction': correction, 'type': 'spelling'}
+        
+        correction = snapshot.custom_words.get(word)
+        if correction is not None:
+            return {'correction': correction, 'type': 'custom'}
+        
+        # كلمة أضافها المستخدم إلى قاعدة البيانات: صحيحة كما هي
+        if word in snapshot.known_words:
+            return None
+        
+        variant = self.variant_resolver.resolve(word)
+        if variant is not None:
+            return {'correction': variant[0], 'type': 'spelling', 'rule': variant[1]}
+        
+        correction = self.phrase_matcher.lookup(word)
+        if correction is not None:
+            return {'correction': correction, 'type': 'spelling'}
+        
+        correction = self._rasm_correction(word, snapshot)
+        if correction is not None:
+            return {'correction': correction, 'type': 'spelling', 'rule': 'rasm'}
+        
+        correction = snapshot.confusion_generator.correct(word, self.frequency_priors.log_prior)
+        if correction is not None:
+            return {'correction': correction, 'type': 'spelling', 'rule': 'confusion'}
+        
+        return None
+
+    def _rasm_correction(self, word: str, snapshot: DictionarySnapshot) -> Optional[str]:
+        """The known word sharing this word's dotless skeleton, if it is close and unambiguous"""
+        if word in self.vocabulary or word in snapshot.known_words:
+            return None
+        # كراسي الهمزة والياء الأخيرة وحدها لا تكفي: أنه/إنه وعلي/على كلها صحيحة
+        return snapshot.rasm_index.correction(word, log_prior=self.frequency_priors.log_prior)
+
+    def _resolve_word(self, word: str, snapshot: DictionarySnapshot) -> Optional[Dict[str, Any]]:
+        """Resolve a word directly, or through its stem once clitics are stripped"""
+        if word in snapshot.known_words and word not in snapshot.custom_words:
+            self.tier_counts['known'] += 1
+            return None
+        
+        resolution = self._lookup_word(word, snapshot)
+        if resolution is not None:
+            self.tier_counts[self._tier_of(resolution)] += 1
+            return resolution
+        
+        # كلمة صحيحة معروفة لا تُجزأ: "كانت" ليست ك + "انت"
+        if word in snapshot.vocabulary:
+            self.tier_counts['known'] += 1
+            return None
+        
+        # تجريد السوابق واللواحق (و، ف، ب، ل، ك، ال والضمائر) والبحث عن الجذع في الجداول وقواعد التنويع،
+        # فطبقتا الرسم والخلط على جذع مجرد تعيدان كتابة كلمات صحيحة
+        stem_resolutions = {}
+        
+        def lookup(stem: str) -> Optional[str]:
+            resolution = stem_resolutions[stem] = self._stem_resolution(stem, snapshot)
+            return resolution['correction'] if resolution is not None else None
+        
+        found = self.segmenter.find_correction(word, lookup)
+        if found is None:
+            self.tier_counts['unresolved'] += 1
+            return None
+        
+        prefix, stem, suffix, correction = found
+        resolution = dict(stem_resolutions[stem])
+        self.tier_counts[self._tier_of(resolution)] += 1
+        resolution.update({
+            'correction': reattach(prefix, correction, suffix),
+            'prefix': prefix,
+            'stem': stem,
+            'suffix': suffix
+        })
+        return resolution
+
+    def _stem_resolution(self, stem: str, snapshot: DictionarySnapshot) -> Optional[Dict[str, Any]]:
+        """Correction of a stripped stem from the error table, the custom words or the variant rules"""
+        correction = self.common_errors.get(stem)
+        if correction is not None:
+            return {'correction': correction, 'type': 'spelling'}
+        
+        correction = snapshot.custom_words.get(stem)
+        if correction is not None:
+            return {'correction': correction, 'type': 'custom'}
+        
+        variant = self.variant_resolver.resolve(stem)
+        if variant is not None:
+            return {'correction': variant[0], 'type': 'spelling', 'rule': variant[1]}
+        return None
+
+    @staticmethod
+    def _tier_of(resolution: Dict[str, Any]) -> str:
+        """Name of the lookup tier that produced a resolution"""
+        rule = resolution.get('rule')
+        if rule in ('rasm', 'confusion'):
+            return rule
+        if rule is not None:
+            return 'rules'
+        return 'tables'
+
+    def _publish(self, derive) -> bool:
+        """Publish the snapshot derive(current, version) builds, if any, and drop cached results"""
+        if self.snapshots.update(derive) is None:
+            return False
+        self.cache.clear()
+        return True
+
+    def load_database(self, words: Iterable[str], corrections: Dict[str, str]) -> None:
+        """Replace the database-backed words and corrections.
+
+        The new snapshot is built aside and swapped in, so requests in
+        flight keep reading the old one and never wait for the rebuild.
+        """
+        known_words = frozenset(word.strip() for word in words if word and word.strip())
+        custom_words = MappingProxyType({original: corrected for original, corrected in corrections.items()
+                                         if original and corrected})
+        rasm_index = RasmIndex(known_words, base=self.rasm_base)
+        self._publish(lambda current, version: current.replace(
+            version, custom_words=custom_words, known_words=known_words, rasm_index=rasm_index))
+
+    def add_known_word(self, word: str) -> bool:
+        """Add a database word (it is treated as correct)"""
+        word = word.strip()
+
+        def derive(current: DictionarySnapshot, version: int) -> Optional[DictionarySnapshot]:
+            if not word or word in current.known_words:
+                return None
+            return current.replace(version, known_words=current.known_words | {word},
+                                   rasm_index=current.rasm_index.updated(added=[word]))
+
+        return self._publish(derive)
+
+    def remove_known_word(self, word: str) -> bool:
+        """Forget a database word"""
+        def derive(current: DictionarySnapshot, version: int) -> Optional[DictionarySnapshot]:
+            if word not in current.known_words:
+                return None
+            rasm_index = current.rasm_index
+            if word not in self.vocabulary:
+                rasm_index = rasm_index.updated(removed=[word])
+            return current.replace(version, known_words=current.known_words - {word}, rasm_index=rasm_index)
+
+        return self._publish(derive)
+
     def add_custom_word(self, wrong_word: str, correct_word: str) -> bool:
         """Add a custom word correction"""
+        def derive(current: DictionarySnapshot, version: int) -> Optional[DictionarySnapshot]:
+            custom_words = dict(current.custom_words)
+            custom_words[wrong_word] = correct_word
+            return current.replace(version, custom_words=MappingProxyType(custom_words))
+
         try:
-            self.custom_words[wrong_word] = correct_word
-            return True
+            return self._publish(derive)
         except Exception:
             return False
 
     def remove_custom_word(self, word: str) -> bool:
         """Remove a custom word correction"""
+        def derive(current: DictionarySnapshot, version: int) -> Optional[DictionarySnapshot]:
+            if word not in current.custom_words:
+                return None
+            custom_words = dict(current.custom_words)
+            del custom_words[word]
+            return current.replace(version, custom_words=MappingProxyType(custom_words))
+
         try:
-            if word in self.custom_words:
-                del self.custom_words[word]
-                return True
-            return False
+            return self._publish(derive)
         except Exception:
             return False
 
     def get_custom_words(self) -> Dict[str, str]:
         """Get all custom word corrections"""
-        return self.custom_words.copy()
+        return dict(self.custom_words)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get token cache hit/miss/eviction statistics"""
+        return self.cache.get_statistics()
+
+    def get_tier_stats(self) -> Dict[str, Any]:
+        """How many looked-up words each tier resolved, and the share of the rasm tier"""
+        counts = dict(self.tier_counts)
+        total = sum(counts.values())
+        return {
+            'lookups': total,
+            'resolved_by': counts,
+            'rasm_rate': round(counts.get('rasm', 0) / total * 100, 2) if total else 0.0
+        }
 
     def suggest_word_addition(self, word: str) -> Dict[str, Any]:
         """Check if a word should be added to the dictionary"""
-        if word in self.common_errors or word in self.custom_words:
+        snapshot = self.snapshots.current()
+        if (word in self.common_errors or word in snapshot.custom_words or word in snapshot.known_words
+                or word in self.variant_bases or word in self.variant_resolver):
             return {
                 'suggest_addition': False,
                 'message': 'الكلمة موجودة بالفعل في القاموس.'
@@ -0,0 +1,47 @@
+import threading
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class SnapshotHolder(Generic[T]):
+    """Publish immutable dictionary snapshots with one reference swap.
+
+    A snapshot is any object with a `version` attribute that is never
+    mutated after publication. Readers call `current()` once per request
+    and use that snapshot throughout, without locking: reading an
+    attribute is atomic, so a request sees either the old state or the
+    new one, never a mixture. Writers are serialized, build the next
+    snapshot aside from the current one, then publish it.
+    """
+
+    def __init__(self, snapshot: T):
+        self._snapshot = snapshot
+        self._write_lock = threading.Lock()
+        self.swaps = 0
+
+    def current(self) -> T:
+        """The latest published snapshot"""
+        return self._snapshot
+
+    def update(self, derive: Callable[[T, int], Optional[T]]) -> Optional[T]:
+        """Publish derive(current, next_version), built while readers keep the current one.
+
+        `derive` returns None when there is nothing to change; nothing is
+        published then, and None is returned.
+        """
+        with self._write_lock:
+            current = self._snapshot
+            snapshot = derive(current, current.version + 1)
+            if snapshot is None:
+                return None
+            self._snapshot = snapshot
+            self.swaps += 1
+        return snapshot
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Published version and number of swaps"""
+        return {
+            'version': self._snapshot.version,
+            'swaps': self.swaps
+        }
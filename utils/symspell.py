@@ -0,0 +1,136 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .edit_distance import damerau_levenshtein
+
+
+class SymSpellIndex:
+    """Symmetric-delete candidate index for fuzzy word lookup.
+
+    Every word is indexed under all strings obtained by deleting up to
+    `max_distance` characters from its first `prefix_length` characters.
+    A query generates the same deletes, so candidates within the edit
+    distance are found with dictionary probes instead of a vocabulary scan,
+    then verified with the real distance.
+    """
+
+    def __init__(self, words: Iterable[str] = (), max_distance: int = 2, prefix_length: int = 7):
+        if prefix_length <= max_distance:
+            raise ValueError('prefix_length must be greater than max_distance')
+
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+
+        self._words: List[Optional[str]] = []
+        self._ids: Dict[str, int] = {}
+        self._deletes: Dict[str, List[int]] = {}
+
+        for word in words:
+            self.add(word)
+
+    def _generate_deletes(self, word: str, max_distance: int) -> Set[str]:
+        """All strings reachable from the word's prefix by up to max_distance deletions"""
+        prefix = word[:self.prefix_length]
+        deletes = {prefix}
+        frontier = {prefix}
+        for _ in range(max_distance):
+            next_frontier = set()
+            for item in frontier:
+                if len(item) <= 1:
+                    continue
+                for index in range(len(item)):
+                    next_frontier.add(item[:index] + item[index + 1:])
+            next_frontier -= deletes
+            deletes |= next_frontier
+            frontier = next_frontier
+        return deletes
+
+    def add(self, word: str) -> bool:
+        """Index a word; returns False if it is already present"""
+        if not word or word in self._ids:
+            return False
+
+        word_id = len(self._words)
+        self._words.append(word)
+        self._ids[word] = word_id
+        for delete in self._generate_deletes(word, self.max_distance):
+            self._deletes.setdefault(delete, []).append(word_id)
+        return True
+
+    def remove(self, word: str) -> bool:
+        """Drop a word; its delete entries are skipped until the next rebuild"""
+        word_id = self._ids.pop(word, None)
+        if word_id is None:
+            return False
+        self._words[word_id] = None
+        return True
+
+    def updated(self, added: Iterable[str] = (), removed: Iterable[str] = ()) -> 'SymSpellIndex':
+        """A new index with words added and removed, leaving this one untouched.
+
+        The delete map is copied shallowly and only the posting lists of the
+        added words' deletes are copied before being extended, so the cost is
+        one dict copy instead of regenerating every word's deletes. Once the
+        slots of removed words outnumber the live ones, the index is rebuilt.
+        """
+        index = SymSpellIndex(max_distance=self.max_distance, prefix_length=self.prefix_length)
+        index._words = list(self._words)
+        index._ids = dict(self._ids)
+        index._deletes = dict(self._deletes)
+        copied = set()
+
+        for word in removed:
+            word_id = index._ids.pop(word, None)
+            if word_id is not None:
+                index._words[word_id] = None
+        for word in added:
+            if not word or word in index._ids:
+                continue
+            word_id = len(index._words)
+            index._words.append(word)
+            index._ids[word] = word_id
+            for delete in self._generate_deletes(word, self.max_distance):
+                if delete not in copied:
+                    index._deletes[delete] = list(index._deletes.get(delete, ()))
+                    copied.add(delete)
+                index._deletes[delete].append(word_id)
+
+        if len(index._words) > 2 * len(index._ids) + 1024:
+            return SymSpellIndex(index._ids, max_distance=self.max_distance, prefix_length=self.prefix_length)
+        return index
+
+    def __contains__(self, word: object) -> bool:
+        return word in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def lookup(self, word: str, max_distance: Optional[int] = None, k: int = 3) -> List[Tuple[str, int]]:
+        """Return up to k (candidate, distance) pairs, closest first"""
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+
+        seen: Set[int] = set()
+        results = []
+        for delete in self._generate_deletes(word, max_distance):
+            for word_id in self._deletes.get(delete, ()):
+                if word_id in seen:
+                    continue
+                seen.add(word_id)
+
+                candidate = self._words[word_id]
+                if candidate is None or abs(len(candidate) - len(word)) > max_distance:
+                    continue
+                distance = damerau_levenshtein(word, candidate, max_distance)
+                if distance <= max_distance:
+                    results.append((candidate, distance))
+
+        results.sort(key=lambda result: (result[1], result[0]))
+        return results[:k]
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Size of the index"""
+        return {
+            'words': len(self._ids),
+            'delete_keys': len(self._deletes),
+            'postings': sum(len(ids) for ids in self._deletes.values())
+        }
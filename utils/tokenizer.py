@@ -0,0 +1,79 @@
+import re
+from typing import Iterator, List, Tuple
+
+# أنواع المقاطع
+ARABIC = 0
+LATIN = 1
+DIGIT = 2
+URL = 3
+PUNCT = 4
+
+KIND_NAMES = ('arabic', 'latin', 'digit', 'url', 'punct')
+
+# (start, end, core_start, core_end, kind)
+# start/end حدود المقطع كاملاً، وcore_start/core_end حدوده بعد تجريد علامات الترقيم
+Span = Tuple[int, int, int, int, int]
+
+# أحرف الكلمة: \w مع علامات التشكيل والعلامات القرآنية التي لا يعدّها \w حروفاً
+_WORD_CHARS = r'\w\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06DC\u06DF-\u06E8\u06EA-\u06ED'
+
+_ARABIC_LETTERS = r'\u0621-\u064A\u066E-\u06D3\u06D5\u06FA-\u06FC\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF'
+
+# مسح واحد للنص يصنف المقاطع أيضاً: كل مقطع غير فارغ ينقسم إلى ترقيم بادئ + لب + ترقيم لاحق،
+# واللب عربي إذا احتوى حرفاً عربياً، أو رقم إذا كان عدداً كاملاً، وإلا فهو لاتيني
+_TOKEN_RE = re.compile(
+    r'(?=\S)(?:'
+    r'(?P<url>(?:https?://|www\.)\S+)'
+    r'|(?P<lead>[^\s' + _WORD_CHARS + r']*)'
+    r'(?P<core>'
+    r'(?=\S*?[' + _ARABIC_LETTERS + r'])(?P<arabic>)[' + _WORD_CHARS + r'](?:\S*[' + _WORD_CHARS + r'])?'
+    r'|(?P<digit>\d+(?:[.,\u066B\u066C]\d+)*)(?=[^\s' + _WORD_CHARS + r']*(?!\S))'
+    r'|[' + _WORD_CHARS + r'](?:\S*[' + _WORD_CHARS + r'])?'
+    r')?'
+    r'[^\s' + _WORD_CHARS + r']*'
+    r')'
+)
+
+_URL_TAIL_RE = re.compile(r'[^\w/]+$')
+
+
+def iter_spans(text: str, start: int = 0, end: int = None) -> Iterator[Span]:
+    """Scan `text` once and yield one span per whitespace-delimited token"""
+    for match in _TOKEN_RE.finditer(text, start, len(text) if end is None else end):
+        token_start, token_end = match.span()
+        url, lead, core, arabic, digit = match.group('url', 'lead', 'core', 'arabic', 'digit')
+
+        if url is not None:
+            tail = _URL_TAIL_RE.search(text, token_start, token_end)
+            core_end = tail.start() if tail else token_end
+            yield (token_start, token_end, token_start, core_end, URL)
+        elif core is None:
+            yield (token_start, token_end, token_start, token_start, PUNCT)
+        else:
+            core_start = token_start + len(lead)
+            kind = ARABIC if arabic is not None else DIGIT if digit is not None else LATIN
+            yield (token_start, token_end, core_start, core_start + len(core), kind)
+
+
+def tokenize(text: str) -> List[Span]:
+    """Tokenize `text` into a list of spans"""
+    return list(iter_spans(text))
+
+
+def splice(text: str, replacements: List[Tuple[int, int, str]]) -> str:
+    """Rebuild `text` with (start, end, replacement) edits applied.
+
+    Edits must be sorted and non-overlapping; everything between them,
+    including the original whitespace, is copied unchanged.
+    """
+    if not replacements:
+        return text
+
+    parts = []
+    cursor = 0
+    for start, end, replacement in replacements:
+        parts.append(text[cursor:start])
+        parts.append(replacement)
+        cursor = end
+    parts.append(text[cursor:])
+    return ''.join(parts)
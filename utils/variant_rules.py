@@ -0,0 +1,114 @@
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# أحرف تُلحق خطأً بآخر الكلمة (حرف علة أو همزة أو تاء زائدة)
+_TRAILING_LETTERS = ('و', 'ه', 'ي', 'ا', 'ة', 'ى', 'ئ', 'ؤ', 'ء', 'آ', 'أ', 'إ')
+
+
+class VariantRule:
+    """A confusion rule: the misspelled affix and the affix it stands for"""
+
+    def __init__(self, name: str, position: str, pairs: Tuple[Tuple[str, str], ...]):
+        self.name = name
+        self.position = position
+        # أزواج (اللاحقة/السابقة الخاطئة، الصحيحة)
+        self.pairs = pairs
+
+    def invert(self, token: str) -> Iterator[str]:
+        """Yield the base forms `token` could be a variant of"""
+        for error, restore in self.pairs:
+            if self.position == 'suffix':
+                if token.endswith(error) and len(token) > len(error):
+                    yield token[:len(token) - len(error)] + restore
+            elif token.startswith(error) and len(token) > len(error):
+                yield restore + token[len(error):]
+
+    def apply(self, base: str) -> Iterator[str]:
+        """Yield the misspelled variants this rule produces from `base`"""
+        for error, restore in self.pairs:
+            if self.position == 'suffix':
+                if base.endswith(restore) and len(base) > len(restore):
+                    yield base[:len(base) - len(restore)] + error
+            elif base.startswith(restore) and len(base) > len(restore):
+                yield error + base[len(restore):]
+
+
+# قواعد التنويع بترتيب التجربة؛ كل صيغة أساسية تحدد القواعد التي تنطبق عليها
+VARIANT_RULES: Tuple[VariantRule, ...] = (
+    VariantRule('taa_marbuta', 'suffix', (('ه', 'ة'),)),
+    VariantRule('taa_marbuta_waw', 'suffix', (('و', 'ة'),)),
+    VariantRule('trailing_waw', 'suffix', (('و', ''),)),
+    VariantRule('trailing_letter', 'suffix', tuple((letter, '') for letter in _TRAILING_LETTERS)),
+    VariantRule('hamza_alef', 'prefix', (
+        ('الا', 'الأ'), ('الا', 'الإ'), ('الا', 'الآ'),
+        ('ا', 'أ'), ('ا', 'إ'), ('ا', 'آ'),
+    )),
+)
+
+_RULES_BY_POSITION = {
+    'prefix': [rule for rule in VARIANT_RULES if rule.position == 'prefix'],
+    'suffix': [rule for rule in VARIANT_RULES if rule.position == 'suffix'],
+}
+
+
+class VariantResolver:
+    """Resolve misspelled variants to base forms by inverting confusion rules.
+
+    `bases` maps each base form to the space-separated names of the rules
+    it accepts, so a rule only fires for words that opted into it. At most
+    one prefix rule and one suffix rule are combined per token.
+    """
+
+    def __init__(self, bases: Mapping):
+        self.bases = bases
+
+    def _accepts(self, candidate: str, rule_names: List[str]) -> bool:
+        declared = self.bases.get(candidate)
+        if declared is None:
+            return False
+        declared = declared.split()
+        return all(name in declared for name in rule_names)
+
+    def resolve(self, token: str) -> Optional[Tuple[str, str]]:
+        """Return (base form, fired rule name) or None"""
+        for rule in _RULES_BY_POSITION['suffix']:
+            for candidate in rule.invert(token):
+                if self._accepts(candidate, [rule.name]):
+                    return candidate, rule.name
+
+        for prefix_rule in _RULES_BY_POSITION['prefix']:
+            for stripped in prefix_rule.invert(token):
+                if self._accepts(stripped, [prefix_rule.name]):
+                    return stripped, prefix_rule.name
+
+                for suffix_rule in _RULES_BY_POSITION['suffix']:
+                    for candidate in suffix_rule.invert(stripped):
+                        if self._accepts(candidate, [prefix_rule.name, suffix_rule.name]):
+                            return candidate, f'{prefix_rule.name}+{suffix_rule.name}'
+
+        return None
+
+    def __contains__(self, token: object) -> bool:
+        return isinstance(token, str) and self.resolve(token) is not None
+
+
+def expand_variants(bases: Dict[str, str]) -> Dict[str, str]:
+    """Enumerate every variant -> base pair the rules generate (for auditing)"""
+    rules = {rule.name: rule for rule in VARIANT_RULES}
+    variants = {}
+
+    for base, names in bases.items():
+        declared = [rules[name] for name in names.split()]
+        prefixes = [rule for rule in declared if rule.position == 'prefix']
+        suffixes = [rule for rule in declared if rule.position == 'suffix']
+
+        for rule in declared:
+            for variant in rule.apply(base):
+                variants.setdefault(variant, base)
+        for prefix_rule in prefixes:
+            for suffix_rule in suffixes:
+                for partial in suffix_rule.apply(base):
+                    for variant in prefix_rule.apply(partial):
+                        variants.setdefault(variant, base)
+
+    return variants
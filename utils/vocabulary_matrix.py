@@ -0,0 +1,247 @@
+import heapq
+import itertools
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy اختياري: المدقق يعود إلى فهرس آخر من دونه
+    np = None
+
+from .edit_distance import damerau_levenshtein
+
+# 64 خانة: حروف الكتلة العربية (U+0621 إلى U+064A) تقع كل منها في خانة مستقلة
+HISTOGRAM_BUCKETS = 64
+
+if np is not None:
+    # عدد البتات في كل بايت، لحساب عدد البتات دفعة واحدة في إصدارات numpy التي تفتقد bitwise_count
+    _BYTE_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+def _popcount(values):
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    return _BYTE_POPCOUNT[values.view(np.uint8)].reshape(len(values), -1).sum(axis=1)
+
+
+class VocabularyMatrix:
+    """Packed NumPy vocabulary with vectorized lower-bound filtering.
+
+    Words are kept sorted by length in a fixed-width uint16 code-point
+    matrix, with a length vector and a letter-histogram signature per word
+    (code points folded into HISTOGRAM_BUCKETS bins, plus a uint64 bitmask
+    of the bins present). For a query, the length bound is a
+    `searchsorted` slice, the bitmask bound is one XOR/popcount pass over
+    that slice and the histogram bound (ceil(L1 / 2) edits at least) runs
+    on what is left; survivors are ordered by bound and shared-prefix
+    length. `lookup` computes exact distances in that order and stops once
+    the next bound exceeds the k-th best distance so far, so it returns what
+    a full scan would; `candidates` lists the first `max_candidates`.
+    Words added since the last pack are kept in a short pending list that
+    queries scan directly, so adding a word does not repack the matrix.
+    """
+
+    def __init__(self, words: Iterable[str] = (), width: int = 24, max_candidates: int = 500):
+        if np is None:
+            raise ImportError('VocabularyMatrix requires numpy')
+
+        self.width = width
+        self.max_candidates = max_candidates
+
+        self._words: List[str] = []
+        self._removed = set()
+        self._pending: List[str] = []
+        self._known = set()
+
+        for word in words:
+            self.add(word)
+        self._pack()
+
+    def _histogram(self, word: str):
+        histogram = np.zeros(HISTOGRAM_BUCKETS, dtype=np.int16)
+        for char in word:
+            histogram[ord(char) % HISTOGRAM_BUCKETS] += 1
+        return histogram
+
+    def _pack(self) -> None:
+        """(Re)build the matrices from the live words, sorted by length"""
+        words = [word for word in self._words if word not in self._removed] + self._pending
+        words.sort(key=len)
+        self._words = words
+        self._removed = set()
+        self._pending = []
+
+        count = len(words)
+        width = self.width
+        self._codes = np.array(
+            [[min(ord(char), 0xFFFF) for char in word[:width]] + [0] * (width - len(word[:width])) for word in words],
+            dtype=np.uint16,
+        ).reshape(count, width)
+        self._lengths = np.fromiter((len(word) for word in words), dtype=np.uint16, count=count)
+        # أول صف لكل طول، فشريحة الأطوال المقبولة تُقرأ مباشرة
+        longest = int(self._lengths[-1]) if count else 0
+        self._length_offsets = np.searchsorted(self._lengths, np.arange(longest + 2), side='left').tolist()
+
+        self._histograms = np.zeros((count, HISTOGRAM_BUCKETS), dtype=np.uint8)
+        rows = np.repeat(np.arange(count), self._lengths)
+        buckets = np.fromiter((ord(char) % HISTOGRAM_BUCKETS for word in words for char in word),
+                              dtype=np.intp, count=len(rows))
+        np.add.at(self._histograms, (rows, buckets), 1)
+        self._signatures = self._signature_of(self._histograms)
+
+    def _signature_of(self, histograms):
+        """Bitmask of the histogram bins that are non-zero"""
+        weights = np.left_shift(np.uint64(1), np.arange(HISTOGRAM_BUCKETS, dtype=np.uint64))
+        return ((histograms > 0) * weights).sum(axis=-1, dtype=np.uint64)
+
+    def add(self, word: str) -> bool:
+        """Queue a word; the matrix is repacked before the next query"""
+        if not word or word in self._known:
+            return False
+        self._known.add(word)
+        if word in self._removed:
+            self._removed.discard(word)
+        else:
+            self._pending.append(word)
+        return True
+
+    def remove(self, word: str) -> bool:
+        """Drop a word; its row is skipped until the next repack"""
+        if word not in self._known:
+            return False
+        self._known.discard(word)
+        if word in self._pending:
+            self._pending.remove(word)
+        else:
+            self._removed.add(word)
+        return True
+
+    def _needs_pack(self) -> bool:
+        """Whether the pending list or the removed rows have grown enough to repack"""
+        return (len(self._pending) > max(256, len(self._words) // 64)
+                or len(self._removed) > len(self._words) // 2)
+
+    def updated(self, added: Iterable[str] = (), removed: Iterable[str] = ()) -> 'VocabularyMatrix':
+        """A new matrix with words added and removed, leaving this one untouched.
+
+        The packed arrays are shared; the changes go to the new matrix's
+        pending list and removed set, and it is repacked only once those
+        grow past a fraction of the rows.
+        """
+        matrix = VocabularyMatrix(width=self.width, max_candidates=self.max_candidates)
+        for name in ('_words', '_codes', '_lengths', '_length_offsets', '_histograms', '_signatures'):
+            setattr(matrix, name, getattr(self, name))
+        matrix._removed = set(self._removed)
+        matrix._pending = list(self._pending)
+        matrix._known = set(self._known)
+
+        for word in removed:
+            matrix.remove(word)
+        for word in added:
+            matrix.add(word)
+        if matrix._needs_pack():
+            matrix._pack()
+        return matrix
+
+    def __contains__(self, word: object) -> bool:
+        return word in self._known
+
+    def __len__(self) -> int:
+        return len(self._known)
+
+    def candidates(self, word: str, max_distance: int = 2, limit: int = None) -> List[Tuple[str, int]]:
+        """Return up to `limit` (candidate, lower bound) pairs that pass every bound, lowest bound first"""
+        if limit is None:
+            limit = self.max_candidates
+        return list(itertools.islice(self._iter_candidates(word, max_distance), limit))
+
+    def _iter_candidates(self, word: str, max_distance: int) -> Iterator[Tuple[str, int]]:
+        """Every (candidate, lower bound) pair within max_distance, in ascending bound order"""
+        if self._needs_pack():
+            self._pack()
+
+        packed = self._packed_candidates(word, max_distance)
+        if not self._pending:
+            return packed
+
+        query_histogram = self._histogram(word)
+        pending = []
+        for candidate in self._pending:
+            l1 = int(np.abs(self._histogram(candidate) - query_histogram).sum())
+            bound = max((l1 + 1) // 2, abs(len(candidate) - len(word)))
+            if bound <= max_distance:
+                pending.append((candidate, bound))
+        pending.sort(key=lambda result: result[1])
+        return heapq.merge(packed, pending, key=lambda result: result[1])
+
+    def _packed_candidates(self, word: str, max_distance: int) -> Iterator[Tuple[str, int]]:
+        """Candidates from the packed rows in ascending bound order, skipping removed words"""
+        # الطول: الكلمات مرتبة حسب الطول فالمرشحون شريحة متصلة
+        offsets = self._length_offsets
+        low = offsets[min(max(0, len(word) - max_distance), len(offsets) - 1)]
+        high = offsets[min(len(word) + max_distance + 1, len(offsets) - 1)]
+        if low >= high:
+            return
+
+        # كل تعديل يغير وجود حرفين على الأكثر، ومجموع فروق المدرج التكراري بحرفين على الأكثر
+        query_histogram = self._histogram(word)
+        query_signature = self._signature_of(query_histogram)
+        differing = _popcount(self._signatures[low:high] ^ query_signature)
+        survivors = np.nonzero((differing.astype(np.int16) + 1) // 2 <= max_distance)[0] + low
+        if not len(survivors):
+            return
+
+        l1 = np.abs(self._histograms[survivors].astype(np.int16) - query_histogram).sum(axis=1)
+        bounds = np.maximum((l1 + 1) // 2, np.abs(self._lengths[survivors].astype(np.int16) - len(word)))
+        kept = bounds <= max_distance
+        survivors = survivors[kept]
+        bounds = bounds[kept]
+        if not len(survivors):
+            return
+
+        # البادئة المشتركة: لترتيب الناجين فقط، فهي ليست حداً أدنى للمسافة
+        prefix_length = min(len(word), self.width)
+        if prefix_length:
+            query_codes = np.array([min(ord(char), 0xFFFF) for char in word[:prefix_length]], dtype=np.uint16)
+            matches = self._codes[survivors, :prefix_length] == query_codes
+            shared_prefix = np.logical_and.accumulate(matches, axis=1).sum(axis=1)
+        else:
+            shared_prefix = np.zeros(len(survivors), dtype=np.int64)
+
+        # الترتيب كله متجه، أما تحويل الصفوف إلى كلمات فبالقدر الذي يستهلكه المستدعي
+        order = np.lexsort((-shared_prefix, bounds))
+        for row, bound in zip(survivors[order].tolist(), bounds[order].tolist()):
+            candidate = self._words[row]
+            if candidate not in self._removed:
+                yield candidate, bound
+
+    def lookup(self, word: str, max_distance: Optional[int] = 2, k: int = 3) -> List[Tuple[str, int]]:
+        """Return up to k (candidate, distance) pairs, closest first (the same as a full scan)"""
+        if max_distance is None:
+            max_distance = 2
+
+        # حين يجتمع k نتائج، لا يُفحص إلا مرشح حده الأدنى لا يتجاوز أبعدها
+        # (المساوي يُفحص أيضاً لأن التعادل يُحسم بترتيب الكلمات)
+        results = []
+        cutoff = max_distance
+        for candidate, bound in self._iter_candidates(word, max_distance):
+            if bound > cutoff:
+                break
+            distance = damerau_levenshtein(word, candidate, cutoff)
+            if distance <= cutoff:
+                results.append((candidate, distance))
+                if 0 < k <= len(results):
+                    results.sort(key=lambda result: (result[1], result[0]))
+                    del results[k:]
+                    cutoff = results[-1][1]
+
+        results.sort(key=lambda result: (result[1], result[0]))
+        return results[:k]
+
+    def get_statistics(self):
+        """Size of the packed arrays"""
+        return {
+            'words': len(self._known),
+            'rows': len(self._words),
+            'bytes': int(self._codes.nbytes + self._lengths.nbytes
+                         + self._histograms.nbytes + self._signatures.nbytes)
+        }